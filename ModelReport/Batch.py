@@ -0,0 +1,98 @@
+import os
+import shutil
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from itertools import repeat
+from .Pdf import htmlFileToPdf
+
+
+def renderReportHtml(report, workingDirectory, renderProfile="print", chartCache=None):
+    """
+    Writes the html of a report and its charts into workingDirectory.
+
+    Returns
+    -------
+    tuple
+        (path of the html file, seconds spent)
+    """
+    start = time.perf_counter()
+    htmlFile = os.path.join(workingDirectory, "Report.html")
+    with open(htmlFile, "w") as out:
+        out.write(report.createHtml(workingDirectory, renderProfile=renderProfile, chartCache=chartCache))
+    return htmlFile, time.perf_counter() - start
+
+
+def createRaports(
+    reports, fileName="ModelRaports", fileNames=None, workers=None, renderProfile="print", chartCache=None
+):
+    """
+    Creates the reports of many models. The html of the reports is rendered in a process pool and
+    all reports are converted with a single wkhtmltopdf run into one pdf with a section per model.
+
+    Parameters
+    ----------
+    reports : list
+        the ModelReport objects.
+    fileName : str
+        the name of the combined pdf.
+    fileNames : list
+        one pdf name per report. Creates separate pdfs instead of the combined one,
+        which needs one wkhtmltopdf run per report.
+    workers : int
+        number of processes rendering the html, None uses one per cpu, 1 renders in the calling process.
+    renderProfile : str or dict
+        the render profile of the charts, see ModelReport.createRaport.
+    chartCache : str or Charts.ChartCache
+        the cache of rendered charts shared by all reports, see ModelReport.createRaport.
+
+    Returns
+    -------
+    dict
+        'reports' : list with a dict {'html': seconds, 'pdf': seconds} per report. 'pdf' is None
+        if the reports were converted together.
+        'pdf' : seconds spent in wkhtmltopdf.
+        'total' : seconds spent in total.
+    """
+    start = time.perf_counter()
+    if fileNames is not None and not len(fileNames) == len(reports):
+        raise ValueError("fileNames needs one name per report")
+    workingDirectories = [tempfile.mkdtemp(prefix="ModelReport") for _ in reports]
+    try:
+        arguments = (reports, workingDirectories, repeat(renderProfile), repeat(chartCache))
+        if workers == 1:
+            renderedReports = list(map(renderReportHtml, *arguments))
+        else:
+            with ProcessPoolExecutor(max_workers=workers) as executor:
+                renderedReports = list(executor.map(renderReportHtml, *arguments))
+        htmlFiles = [htmlFile for htmlFile, _ in renderedReports]
+
+        pdfStart = time.perf_counter()
+        if fileNames is None:
+            htmlFileToPdf(htmlFiles, fileName + ".pdf")
+            pdfTimes = [None] * len(reports)
+        else:
+            with ThreadPoolExecutor(max_workers=workers) as executor:
+                pdfTimes = list(executor.map(convertHtmlFile, htmlFiles, fileNames))
+        pdfTime = time.perf_counter() - pdfStart
+    finally:
+        for workingDirectory in workingDirectories:
+            shutil.rmtree(workingDirectory, ignore_errors=True)
+
+    return {
+        "reports": [
+            {"html": htmlTime, "pdf": reportPdfTime}
+            for (_, htmlTime), reportPdfTime in zip(renderedReports, pdfTimes)
+        ],
+        "pdf": pdfTime,
+        "total": time.perf_counter() - start,
+    }
+
+
+def convertHtmlFile(htmlFile, fileName):
+    """
+    Converts a html file into fileName.pdf and returns the seconds spent.
+    """
+    start = time.perf_counter()
+    htmlFileToPdf(htmlFile, fileName + ".pdf")
+    return time.perf_counter() - start
@@ -0,0 +1,353 @@
+import base64
+import hashlib
+import io
+import mimetypes
+import os
+import pickle
+import tempfile
+from concurrent.futures import ProcessPoolExecutor
+from itertools import repeat
+import numpy as np
+from .Profiler import Profile
+
+
+classColors = [
+    "#F06060",
+    "#F2DD64",
+    "#F3B562",
+    "#F2EBBF",
+    "#8CBEB2",
+    "#586473",
+    "#5C4B51",
+    "#4A89AA",
+]
+
+# color of the bucket that pools the classes not shown individually
+otherColor = "#BBBBBB"
+
+
+defaultFigureSize = (6.4, 4.8)
+
+renderProfiles = {
+    "draft": {"dpi": 72, "vector": False, "figureScale": 0.8},
+    "screen": {"dpi": 150, "vector": True, "figureScale": 1.0},
+    "print": {"dpi": 600, "vector": True, "figureScale": 1.0},
+}
+
+
+def resolveRenderProfile(renderProfile):
+    """
+    Returns the settings of a render profile.
+
+    Parameters
+    ----------
+    renderProfile : str or dict
+        name of a profile in renderProfiles, or a dict overriding some of the settings of the 'print' profile:
+        'dpi' the resolution of raster images, 'vector' whether charts that support it are saved as svg,
+        'figureScale' the factor applied to all figure sizes.
+    """
+    if isinstance(renderProfile, dict):
+        return {**renderProfiles["print"], **renderProfile}
+    if renderProfile not in renderProfiles:
+        raise ValueError(f"Unknown render profile '{renderProfile}', use one of {list(renderProfiles)}")
+    return renderProfiles[renderProfile]
+
+
+class Chart:
+    def __init__(self, name, drawFunction, figureSize=None, vector=False, **data):
+        """
+        Describes one figure of the report. Only holds plain data so it can be sent to a worker process.
+
+        Parameters
+        ----------
+        name : str
+            the name of the figure, used as file name without extension.
+        drawFunction : function
+            module level function drawFunction(axes, **data) that draws the figure.
+        figureSize : tuple
+            (width, height) of the figure in inches, None for the matplotlib default.
+        vector : bool
+            the figure is saved as svg if the render profile allows it, as png otherwise.
+        """
+        self.name = name
+        self.drawFunction = drawFunction
+        self.baseFigureSize = figureSize
+        self.figureSize = figureSize
+        self.vector = vector
+        self.format = "svg" if vector else "png"
+        self.dpi = "figure"
+        self.data = data
+
+    @property
+    def fileName(self):
+        return f"{self.name}.{self.format}"
+
+    @property
+    def cacheKey(self):
+        """
+        Hash of everything that determines the rendered figure: the draw function, its data and the format,
+        resolution and size set by the render profile. The name is not part of it.
+        """
+        content = (
+            self.drawFunction.__module__,
+            self.drawFunction.__qualname__,
+            self.format,
+            self.dpi,
+            self.figureSize,
+            sorted(self.data.items()),
+        )
+        return hashlib.sha256(pickle.dumps(content, protocol=4)).hexdigest()
+
+    def applyRenderProfile(self, renderProfile):
+        """
+        Sets the format, resolution and size of the figure from a resolved render profile.
+        """
+        self.format = "svg" if self.vector and renderProfile["vector"] else "png"
+        self.dpi = renderProfile["dpi"] if self.format == "png" else "figure"
+        self.figureSize = self.baseFigureSize
+        if not renderProfile["figureScale"] == 1:
+            width, height = self.baseFigureSize or defaultFigureSize
+            self.figureSize = (width * renderProfile["figureScale"], height * renderProfile["figureScale"])
+
+
+class ChartCache:
+    def __init__(self, directory, maxBytes=256 * 1024 * 1024):
+        """
+        Stores rendered charts in a folder under their Chart.cacheKey so unchanged charts are not rendered again.
+        When the folder grows beyond maxBytes the least recently used charts are removed.
+
+        Parameters
+        ----------
+        directory : str
+            the cache folder, created if needed. Can be shared by several reports and processes.
+        maxBytes : int
+            the size limit of the folder.
+        """
+        self.directory = directory
+        self.maxBytes = maxBytes
+        os.makedirs(directory, exist_ok=True)
+
+    def __path(self, key):
+        return os.path.join(self.directory, key)
+
+    def get(self, key):
+        """
+        Returns the cached content of a chart, None if it is not in the cache.
+        """
+        try:
+            with open(self.__path(key), "rb") as file:
+                content = file.read()
+            os.utime(self.__path(key))
+        except FileNotFoundError:
+            return None
+        return content
+
+    def put(self, key, content):
+        """
+        Adds the content of a chart and evicts the least recently used charts above maxBytes.
+        """
+        # written under a temporary name first so concurrent readers never see half a file
+        handle, temporaryPath = tempfile.mkstemp(dir=self.directory, prefix=".")
+        with os.fdopen(handle, "wb") as file:
+            file.write(content)
+        os.replace(temporaryPath, self.__path(key))
+        self.evict()
+
+    def evict(self):
+        entries = []
+        for entry in os.scandir(self.directory):
+            if entry.is_file() and not entry.name.startswith("."):
+                stat = entry.stat()
+                entries.append((stat.st_mtime, stat.st_size, entry.path))
+        size = sum(entrySize for _, entrySize, _ in entries)
+        for _, entrySize, path in sorted(entries):
+            if size <= self.maxBytes:
+                break
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass
+            size -= entrySize
+
+
+def drawPieChart(axes, sizes, labels, colors):
+    axes.pie(
+        sizes,
+        explode=[0] * len(sizes),
+        labels=labels,
+        autopct="%1.1f%%",
+        shadow=False,
+        startangle=0,
+        colors=colors,
+    )
+
+
+def drawBoxPlot(axes, data, labels, colors, yLabel):
+    for i, (values, color) in enumerate(zip(data, colors)):
+        axes.boxplot(values, positions=[i + 1], patch_artist=True, boxprops=dict(facecolor=color))
+    axes.set_xticks(np.arange(len(labels) + 1), [""] + list(labels), rotation=90)
+    axes.figure.subplots_adjust(bottom=0.3, top=0.99)
+    axes.set_ylabel(yLabel)
+
+
+def drawStackedFoldBarChart(axes, samplesPerFold, labels, colors):
+    folds = list(range(len(samplesPerFold[0])))
+    bottom = None
+    for samples, color in zip(samplesPerFold, colors):
+        axes.bar(folds, samples, bottom=bottom, color=color)
+        bottom = np.array(samples) if bottom is None else bottom + samples
+    axes.legend(labels)
+
+
+def drawConfusionMatrix(axes, matrix, labels):
+    import seaborn as sn
+
+    sn.heatmap(
+        matrix,
+        # the numbers are unreadable and slow to draw for large matrices
+        annot=len(labels) <= 30,
+        xticklabels=[f"{i} (act)" for i in labels],
+        yticklabels=[f"{i} (pre)" for i in labels],
+        ax=axes,
+    )
+    axes.figure.subplots_adjust(bottom=0.3, top=0.99, left=0.2, right=0.99)
+
+
+def drawFScoreBySplit(axes, foldFScore, labels, colors):
+    for fScores, color in zip(foldFScore, colors):
+        axes.plot(list(range(len(fScores))), np.array(fScores) * 100, color=color)
+    axes.set_ylabel("F1Score (%)")
+    axes.set_xlabel("Splits")
+    axes.grid(which='minor', color='#EEEEEE', linestyle=':', linewidth=1)
+    axes.grid(which='major', color='#DDDDDD', linewidth=1.2)
+    axes.minorticks_on()
+    axes.legend(labels)
+
+
+def drawCurves(axes, x, y, labels, colors, xLabel, yLabel, diagonal=False):
+    for xValues, yValues, color in zip(x, y, colors):
+        axes.plot(xValues, yValues, color=color)
+    if diagonal:
+        axes.plot([0, 1], [0, 1], color="#DDDDDD", linestyle="--")
+    axes.set_xlim(0, 1)
+    axes.set_ylim(0, 1.02)
+    axes.set_xlabel(xLabel)
+    axes.set_ylabel(yLabel)
+    axes.grid(which='major', color='#DDDDDD', linewidth=1.2)
+    # a legend of many classes covers the curves
+    if len(labels) <= 20:
+        axes.legend(labels, fontsize="small", loc="lower right" if diagonal else "lower left")
+
+
+def renderChart(chart, directory=None):
+    """
+    Draws a chart and saves it to directory/chart.fileName.
+    Without a directory the figure is rendered in memory and the file content is returned.
+    """
+    # A Figure that is not registered with pyplot keeps charts rendered by
+    # concurrent reports in different threads independent of each other.
+    import matplotlib
+    from matplotlib.figure import Figure
+
+    output = io.BytesIO() if directory is None else os.path.join(directory, chart.fileName)
+    figure = Figure(figsize=chart.figureSize)
+    chart.drawFunction(figure.add_subplot(), **chart.data)
+    # without the date and with a fixed salt of the element ids the same chart gives the same svg file
+    metadata = {"Date": None} if chart.format == "svg" else None
+    with matplotlib.rc_context({"svg.hashsalt": "ModelReport"}):
+        figure.savefig(output, dpi=chart.dpi, format=chart.format, metadata=metadata)
+    if directory is None:
+        return output.getvalue()
+
+
+def toDataUri(chart, content):
+    """
+    Returns the rendered content of a chart as data URI that can be used as src of an img tag.
+    """
+    mimeType = "image/svg+xml" if chart.format == "svg" else "image/png"
+    return f"data:{mimeType};base64,{base64.b64encode(content).decode('ascii')}"
+
+
+def fileToDataUri(fileName):
+    """
+    Returns an image file as data URI, so that a self-contained html does not reference local files.
+    Paths that are no file, like urls or an empty path, are returned unchanged.
+    """
+    if not fileName or not os.path.isfile(fileName):
+        return fileName
+    mimeType = mimetypes.guess_type(fileName)[0] or "application/octet-stream"
+    with open(fileName, "rb") as image:
+        return f"data:{mimeType};base64,{base64.b64encode(image.read()).decode('ascii')}"
+
+
+def renderCharts(charts, directory, workers=None, renderProfile="print", cache=None, profile=None):
+    """
+    Renders all charts, in a process pool if more than one worker is requested.
+
+    Parameters
+    ----------
+    charts : list
+        the Chart objects to render.
+    directory : str
+        the folder the figures are saved to, None renders them in memory.
+    workers : int
+        number of worker processes, None or 1 renders in the calling process.
+    renderProfile : str or dict
+        the render profile applied to all charts, see resolveRenderProfile.
+    cache : ChartCache
+        charts found in the cache are taken from it, the others are rendered and added to it.
+    profile : Profiler.Profile
+        records a stage for every rendered chart.
+
+    Returns
+    -------
+    list
+        the file content of each chart if directory is None, otherwise a list of None.
+    """
+    renderProfile = resolveRenderProfile(renderProfile)
+    for chart in charts:
+        chart.applyRenderProfile(renderProfile)
+    if cache is None:
+        return renderChartList(charts, directory, workers, profile)
+
+    keys = [chart.cacheKey for chart in charts]
+    contents = [cache.get(key) for key in keys]
+    missing = [i for i, content in enumerate(contents) if content is None]
+    for i, content in zip(missing, renderChartList([charts[i] for i in missing], None, workers, profile)):
+        cache.put(keys[i], content)
+        contents[i] = content
+    if directory is None:
+        return contents
+    for chart, content in zip(charts, contents):
+        with open(os.path.join(directory, chart.fileName), "wb") as file:
+            file.write(content)
+    return [None] * len(charts)
+
+
+def renderChartList(charts, directory, workers, profile=None):
+    inProcess = workers is None or workers <= 1 or len(charts) <= 1
+    if profile is None and inProcess:
+        return [renderChart(chart, directory) for chart in charts]
+    if inProcess:
+        contents = []
+        for chart in charts:
+            with profile.stage(f"chart {chart.name}"):
+                contents.append(renderChart(chart, directory))
+        return contents
+    with ProcessPoolExecutor(max_workers=min(workers, len(charts))) as executor:
+        if profile is None:
+            return list(executor.map(renderChart, charts, repeat(directory)))
+        results = list(executor.map(profileRenderChart, charts, repeat(directory), repeat(profile.traceMemory)))
+    for chart, (_, stage) in zip(charts, results):
+        profile.record(f"chart {chart.name}", stage["wall"], stage["cpu"], stage["peakMemory"])
+    return [content for content, _ in results]
+
+
+def profileRenderChart(chart, directory, traceMemory):
+    """
+    renderChart in a worker process, returns the content and the measured stage.
+    """
+    profile = Profile(traceMemory=traceMemory)
+    with profile.stage(chart.name):
+        content = renderChart(chart, directory)
+    return content, profile.stages[0]
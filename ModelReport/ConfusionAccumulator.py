@@ -0,0 +1,550 @@
+import numpy as np
+
+
+class ConfusionAccumulator:
+    def __init__(self, labelEncoder):
+        """
+        Keeps one integer confusion matrix per fold instead of the raw [act,pred] pairs.
+        The rows of a matrix are the predicted classes, the columns the actual classes.
+        The pooled matrix and the per class counts of each fold are updated with every change,
+        so reading them does not go over all matrices again.
+
+        Parameters
+        ----------
+        labelEncoder : LabelEncoder
+            maps the class names to the row/column index of the matrices.
+        """
+        self.__labelEncoder = labelEncoder
+        self.__folds = []
+        self.__summaries = []
+        self.__total = np.zeros((0, 0), dtype=np.int64)
+
+    def __len__(self):
+        return len(self.__folds)
+
+    def addFold(self, actual, predicted):
+        """
+        Counts the encoded results of one fold into a new confusion matrix.
+
+        Parameters
+        ----------
+        actual : np.ndarray
+            class ids of the actual classes.
+        predicted : np.ndarray
+            class ids of the predicted classes.
+        """
+        self.__appendEmptyFold()
+        self.addToFold(len(self.__folds) - 1, actual, predicted)
+
+    def __appendEmptyFold(self):
+        empty = np.zeros(0, dtype=np.int64)
+        self.__folds.append(np.zeros((0, 0), dtype=np.int64))
+        self.__summaries.append((empty, empty, empty))
+
+    def __setFold(self, fold, matrix):
+        # O(classes**2) update of the pooled matrix and the summary of the changed fold
+        previous = self.__folds[fold]
+        total = np.zeros(matrix.shape, dtype=np.int64)
+        total[: self.__total.shape[0], : self.__total.shape[1]] = self.__total
+        total[: previous.shape[0], : previous.shape[1]] -= previous
+        self.__total = total + matrix
+        self.__folds[fold] = matrix
+        self.__summaries[fold] = (np.diagonal(matrix).copy(), matrix.sum(axis=1), matrix.sum(axis=0))
+
+    def addToFold(self, fold, actual, predicted):
+        """
+        Counts more encoded results into the matrix of an existing fold, e.g. the next chunk of a large file.
+
+        Parameters
+        ----------
+        fold : int
+            index of the fold.
+        actual : np.ndarray
+            class ids of the actual classes.
+        predicted : np.ndarray
+            class ids of the predicted classes.
+        """
+        numberOfClasses = len(self.__labelEncoder)
+        counts = np.bincount(
+            predicted * numberOfClasses + actual, minlength=numberOfClasses**2
+        ).reshape(numberOfClasses, numberOfClasses)
+        matrix = self.__folds[fold]
+        counts[: matrix.shape[0], : matrix.shape[1]] += matrix
+        self.__setFold(fold, counts)
+
+    def addFoldPairs(self, predicted, actual, counts):
+        """
+        Adds one fold given as the non zero cells of its confusion matrix.
+
+        Parameters
+        ----------
+        predicted, actual : np.ndarray
+            class ids of the cells.
+        counts : np.ndarray
+            number of results of each cell.
+        """
+        self.__appendEmptyFold()
+        self.addPairsToFold(len(self.__folds) - 1, predicted, actual, counts)
+
+    def addPairsToFold(self, fold, predicted, actual, counts):
+        """
+        Adds the non zero cells of a confusion matrix to an existing fold.
+
+        Parameters
+        ----------
+        fold : int
+            index of the fold.
+        predicted, actual : np.ndarray
+            class ids of the cells, every cell at most once.
+        counts : np.ndarray
+            number of results of each cell.
+        """
+        numberOfClasses = len(self.__labelEncoder)
+        matrix = np.zeros((numberOfClasses, numberOfClasses), dtype=np.int64)
+        previous = self.__folds[fold]
+        matrix[: previous.shape[0], : previous.shape[1]] = previous
+        # the cells are unique, so the fancy index does not drop repeated ones
+        matrix[predicted, actual] += counts
+        self.__setFold(fold, matrix)
+
+    def foldMatrices(self):
+        """
+        Returns
+        -------
+        np.ndarray
+            (folds, classes, classes) array with all fold matrices. Folds added before
+            a class was known are padded with zeros.
+        """
+        numberOfClasses = len(self.__labelEncoder)
+        matrices = np.zeros(
+            (len(self.__folds), numberOfClasses, numberOfClasses), dtype=np.int64
+        )
+        for matrix, fold in zip(matrices, self.__folds):
+            matrix[: fold.shape[0], : fold.shape[1]] = fold
+        return matrices
+
+    def foldPairs(self):
+        """
+        Returns
+        -------
+        tuple
+            (fold, predicted, actual, count) arrays with one entry per non zero cell of each fold.
+        """
+        matrices = self.foldMatrices()
+        folds, predicted, actual = np.nonzero(matrices)
+        return folds, predicted, actual, matrices[folds, predicted, actual]
+
+    def foldSummaries(self):
+        """
+        Returns
+        -------
+        tuple
+            (truePositives, predictedPerClass, actualPerClass), each a (folds, classes) array.
+        """
+        return stackSummaries(self.__summaries, len(self.__labelEncoder))
+
+    def total(self):
+        """
+        Returns
+        -------
+        np.ndarray
+            (classes, classes) confusion matrix pooled over all folds.
+        """
+        numberOfClasses = len(self.__labelEncoder)
+        total = np.zeros((numberOfClasses, numberOfClasses), dtype=np.int64)
+        total[: self.__total.shape[0], : self.__total.shape[1]] = self.__total
+        return total
+
+    def pairs(self):
+        """
+        Returns
+        -------
+        tuple
+            (predicted, actual, count) arrays with the non zero cells of the matrix pooled over all folds.
+        """
+        matrix = self.total()
+        predicted, actual = np.nonzero(matrix)
+        return predicted, actual, matrix[predicted, actual]
+
+
+class ClassCountAccumulator:
+    def __init__(self, labelEncoder):
+        """
+        Keeps the number of samples per class of each fold instead of the samples themselves.
+
+        Parameters
+        ----------
+        labelEncoder : LabelEncoder
+            maps the class names to the index of the count vectors.
+        """
+        self.__labelEncoder = labelEncoder
+        self.__folds = []
+
+    def __len__(self):
+        return len(self.__folds)
+
+    def addFoldCounts(self, counts):
+        """
+        Adds the already counted classes of one fold, indexed by the ids of the label encoder.
+        """
+        self.__folds.append(np.asarray(counts, dtype=np.int64))
+
+    def addCountsToFold(self, fold, counts):
+        """
+        Adds already counted classes to an existing fold.
+
+        Parameters
+        ----------
+        fold : int
+            index of the fold.
+        counts : np.ndarray
+            number of samples per class id.
+        """
+        previous = self.__folds[fold]
+        counts = np.asarray(counts, dtype=np.int64).copy()
+        if len(counts) < len(previous):
+            counts = np.pad(counts, (0, len(previous) - len(counts)))
+        counts[: len(previous)] += previous
+        self.__folds[fold] = counts
+
+    def foldCounts(self):
+        """
+        Returns
+        -------
+        np.ndarray
+            (folds, classes) array with the number of samples per class.
+        """
+        counts = np.zeros((len(self.__folds), len(self.__labelEncoder)), dtype=np.int64)
+        for count, fold in zip(counts, self.__folds):
+            count[: len(fold)] = fold
+        return counts
+
+
+def countPairs(predicted, actual, numberOfClasses):
+    """
+    Counts encoded results without a confusion matrix of the final number of classes.
+
+    Parameters
+    ----------
+    predicted, actual : np.ndarray
+        class ids below numberOfClasses.
+    numberOfClasses : int
+        number of known classes.
+
+    Returns
+    -------
+    tuple
+        (predicted, actual, count) arrays with the non zero cells.
+    """
+    predicted, actual = np.asarray(predicted, dtype=np.int64), np.asarray(actual, dtype=np.int64)
+    if numberOfClasses**2 <= 4 * len(predicted) + 1024:
+        counts = np.bincount(predicted * numberOfClasses + actual, minlength=numberOfClasses**2)
+        cells = np.flatnonzero(counts)
+        return cells // numberOfClasses, cells % numberOfClasses, counts[cells]
+    shift = SparseConfusionAccumulator.keyShift
+    keys, counts = np.unique((predicted << shift) | actual, return_counts=True)
+    return keys >> shift, keys & ((1 << shift) - 1), counts
+
+
+def countFoldPairs(folds, predicted, actual, numberOfClasses):
+    """
+    Counts the encoded results of several folds in one pass, see countPairs.
+
+    Parameters
+    ----------
+    folds : np.ndarray
+        index of the fold of each result.
+    predicted, actual : np.ndarray
+        class ids below numberOfClasses.
+    numberOfClasses : int
+        number of known classes.
+
+    Returns
+    -------
+    tuple
+        (fold, predicted, actual, count) arrays with the non zero cells, sorted by fold.
+    """
+    folds, predicted, actual = (np.asarray(ids, dtype=np.int64) for ids in (folds, predicted, actual))
+    numberOfClasses = int(numberOfClasses)
+    cellsPerFold = numberOfClasses**2
+    numberOfCells = (int(folds.max(initial=-1)) + 1) * cellsPerFold
+    if numberOfCells >= 2**63:
+        # more cells than one int64 key can number
+        order = np.lexsort((actual, predicted, folds))
+        folds, predicted, actual = folds[order], predicted[order], actual[order]
+        starts = np.flatnonzero(
+            np.r_[True, (folds[1:] != folds[:-1]) | (predicted[1:] != predicted[:-1]) | (actual[1:] != actual[:-1])]
+        )
+        return folds[starts], predicted[starts], actual[starts], np.diff(np.r_[starts, len(folds)])
+    keys = (folds * numberOfClasses + predicted) * numberOfClasses + actual
+    if numberOfCells <= 4 * len(keys) + 1024:
+        counts = np.bincount(keys, minlength=numberOfCells)
+        keys = np.flatnonzero(counts)
+        counts = counts[keys]
+    else:
+        keys, counts = np.unique(keys, return_counts=True)
+    return keys // cellsPerFold, keys // numberOfClasses % numberOfClasses, keys % numberOfClasses, counts
+
+
+def stackSummaries(summaries, numberOfClasses):
+    """
+    Stacks the (truePositives, predictedPerClass, actualPerClass) vectors of each fold into three
+    (folds, classes) arrays, vectors of folds added before a class was known are padded with zeros.
+    """
+    stacked = tuple(np.zeros((len(summaries), numberOfClasses), dtype=np.int64) for _ in range(3))
+    for fold, summary in enumerate(summaries):
+        for array, counts in zip(stacked, summary):
+            array[fold, : len(counts)] = counts
+    return stacked
+
+
+def sumCounts(keys, counts):
+    """
+    Adds up the counts of equal keys.
+
+    Returns
+    -------
+    tuple
+        (sorted unique keys, summed counts)
+    """
+    if len(keys) == 0:
+        return keys.astype(np.int64), counts.astype(np.int64)
+    order = np.argsort(keys, kind="stable")
+    keys, counts = keys[order], counts[order]
+    starts = np.flatnonzero(np.r_[True, keys[1:] != keys[:-1]])
+    return keys[starts], np.add.reduceat(counts, starts)
+
+
+class SparseConfusionAccumulator:
+    # predicted and actual id are packed into one int64 key that does not depend on the number of classes
+    keyShift = 32
+
+    def __init__(self, labelEncoder):
+        """
+        Keeps only the non zero cells of the confusion matrix of each fold, for reports with a large
+        number of classes where dense (classes, classes) matrices per fold do not fit into memory.
+        Has the interface of ConfusionAccumulator.
+
+        Parameters
+        ----------
+        labelEncoder : LabelEncoder
+            maps the class names to the class ids.
+        """
+        self.__labelEncoder = labelEncoder
+        self.__folds = []
+        self.__summaries = []
+
+    def __len__(self):
+        return len(self.__folds)
+
+    def addFold(self, actual, predicted):
+        """
+        Counts the encoded results of one fold, see ConfusionAccumulator.addFold.
+        """
+        self.__appendEmptyFold()
+        self.addToFold(len(self.__folds) - 1, actual, predicted)
+
+    def __appendEmptyFold(self):
+        empty = np.zeros(0, dtype=np.int64)
+        self.__folds.append((empty, empty))
+        self.__summaries.append((empty, empty, empty))
+
+    def __setFold(self, fold, keys, counts):
+        # the per class counts of the changed fold are kept, so foldSummaries does not go over all cells
+        self.__folds[fold] = (keys, counts)
+        predicted, actual = keys >> self.keyShift, keys & ((1 << self.keyShift) - 1)
+        numberOfClasses = int(max(predicted.max(initial=-1), actual.max(initial=-1))) + 1
+        correct = predicted == actual
+        self.__summaries[fold] = tuple(
+            # bincount with weights returns float64, which is exact for counts below 2**53
+            np.bincount(classIds, weights=weights, minlength=numberOfClasses).astype(np.int64)
+            for classIds, weights in [(actual[correct], counts[correct]), (predicted, counts), (actual, counts)]
+        )
+
+    def addToFold(self, fold, actual, predicted):
+        """
+        Counts more encoded results into an existing fold, see ConfusionAccumulator.addToFold.
+        """
+        keys = (np.asarray(predicted, dtype=np.int64) << self.keyShift) | np.asarray(actual, dtype=np.int64)
+        keys, counts = np.unique(keys, return_counts=True)
+        foldKeys, foldCounts = self.__folds[fold]
+        self.__setFold(fold, *sumCounts(np.concatenate([foldKeys, keys]), np.concatenate([foldCounts, counts])))
+
+    def addFoldPairs(self, predicted, actual, counts):
+        """
+        Adds one fold given as the non zero cells of its confusion matrix.
+
+        Parameters
+        ----------
+        predicted, actual : np.ndarray
+            class ids of the cells.
+        counts : np.ndarray
+            number of results of each cell.
+        """
+        self.__appendEmptyFold()
+        self.addPairsToFold(len(self.__folds) - 1, predicted, actual, counts)
+
+    def addPairsToFold(self, fold, predicted, actual, counts):
+        """
+        Adds the non zero cells of a confusion matrix to an existing fold, see ConfusionAccumulator.addPairsToFold.
+        """
+        keys = (np.asarray(predicted, dtype=np.int64) << self.keyShift) | np.asarray(actual, dtype=np.int64)
+        foldKeys, foldCounts = self.__folds[fold]
+        self.__setFold(
+            fold,
+            *sumCounts(np.concatenate([foldKeys, keys]), np.concatenate([foldCounts, np.asarray(counts, dtype=np.int64)])),
+        )
+
+    def foldPairs(self):
+        """
+        Returns
+        -------
+        tuple
+            (fold, predicted, actual, count) arrays with one entry per non zero cell of each fold.
+        """
+        folds = np.repeat(np.arange(len(self.__folds)), [len(keys) for keys, _ in self.__folds])
+        keys = np.concatenate([keys for keys, _ in self.__folds] + [np.zeros(0, dtype=np.int64)])
+        counts = np.concatenate([counts for _, counts in self.__folds] + [np.zeros(0, dtype=np.int64)])
+        return folds, keys >> self.keyShift, keys & ((1 << self.keyShift) - 1), counts
+
+    def pairs(self):
+        """
+        Returns
+        -------
+        tuple
+            (predicted, actual, count) arrays with the non zero cells of the matrix pooled over all folds.
+        """
+        _, predicted, actual, counts = self.foldPairs()
+        keys, counts = sumCounts((predicted << self.keyShift) | actual, counts)
+        return keys >> self.keyShift, keys & ((1 << self.keyShift) - 1), counts
+
+    def foldSummaries(self):
+        """
+        Returns
+        -------
+        tuple
+            (truePositives, predictedPerClass, actualPerClass), each a (folds, classes) array.
+        """
+        return stackSummaries(self.__summaries, len(self.__labelEncoder))
+
+    def foldMatrices(self):
+        """
+        Returns the dense (folds, classes, classes) matrices, see ConfusionAccumulator.foldMatrices.
+        """
+        numberOfClasses = len(self.__labelEncoder)
+        folds, predicted, actual, counts = self.foldPairs()
+        matrices = np.zeros((len(self.__folds), numberOfClasses, numberOfClasses), dtype=np.int64)
+        matrices[folds, predicted, actual] = counts
+        return matrices
+
+
+def countScores(scores, positive):
+    """
+    Counts the scores of one class by distinct value, sorting them once.
+
+    Parameters
+    ----------
+    scores : np.ndarray
+        the scores of the class for each sample.
+    positive : np.ndarray
+        bool, whether a sample belongs to the class.
+
+    Returns
+    -------
+    tuple
+        (sorted distinct scores, (scores, 2) number of positive and negative samples with each score)
+    """
+    values, inverse = np.unique(np.asarray(scores, dtype=np.float64), return_inverse=True)
+    inverse = inverse.reshape(-1)
+    total = np.bincount(inverse, minlength=len(values))
+    positives = np.bincount(inverse[positive], minlength=len(values))
+    return values, np.column_stack([positives, total - positives])
+
+
+class ScoreAccumulator:
+    def __init__(self):
+        """
+        Keeps the scores of the one-vs-rest curves of each class as the number of positive and negative
+        samples per distinct score instead of the score matrices. Rounded scores keep the number of
+        distinct values, and so the memory, bounded whatever the number of samples.
+        The classes are the ids of a LabelEncoder.
+        """
+        self.__classes = {}
+        self.__pending = {}
+
+    def __len__(self):
+        return len(self.__classes)
+
+    def addScores(self, classIds, scores, counts):
+        """
+        Adds counted scores.
+
+        Parameters
+        ----------
+        classIds : np.ndarray
+            the class whose curve a score belongs to.
+        scores : np.ndarray
+            the score values, sorted and distinct within each class as returned by countScores.
+        counts : np.ndarray
+            (scores, 2) number of positive and negative samples with the score.
+        """
+        classIds = np.asarray(classIds, dtype=np.int64)
+        scores = np.asarray(scores, dtype=np.float64)
+        counts = np.asarray(counts, dtype=np.int64).reshape(-1, 2)
+        if np.any(classIds[1:] < classIds[:-1]):
+            order = np.argsort(classIds, kind="stable")
+            classIds, scores, counts = classIds[order], scores[order], counts[order]
+        starts = np.flatnonzero(np.r_[True, classIds[1:] != classIds[:-1]]) if len(classIds) else []
+        for start, end in zip(starts, list(starts[1:]) + [len(classIds)]):
+            classId = int(classIds[start])
+            self.__classes.setdefault(classId, (np.zeros(0), np.zeros((0, 2), dtype=np.int64)))
+            pending = self.__pending.setdefault(classId, [])
+            pending.append((scores[start:end], counts[start:end]))
+            # the added scores are merged once they are as many as the merged ones, so every score
+            # is merged O(log(scores)) times instead of once per call
+            if sum(len(part) for part, _ in pending) >= len(self.__classes[classId][0]):
+                self.__merge(classId)
+
+    def __merge(self, classId):
+        parts = [part for part in [self.__classes[classId]] + self.__pending.pop(classId, []) if len(part[0])]
+        if len(parts) == 1:
+            self.__classes[classId] = parts[0]
+            return
+        self.__classes[classId] = sumCounts(
+            np.concatenate([scores for scores, _ in parts]), np.concatenate([counts for _, counts in parts])
+        )
+
+    def classIds(self):
+        """
+        Returns
+        -------
+        list
+            the ids of the classes with scores.
+        """
+        return sorted(self.__classes)
+
+    def classScores(self, classId):
+        """
+        Returns
+        -------
+        tuple
+            (sorted distinct scores, (scores, 2) number of positive and negative samples) of a class.
+        """
+        if classId in self.__pending:
+            self.__merge(classId)
+        return self.__classes[classId]
+
+    def scorePairs(self):
+        """
+        Returns
+        -------
+        tuple
+            (classIds, scores, counts) arrays of all classes, the input of addScores.
+        """
+        classIds = self.classIds()
+        classes = [self.classScores(classId) for classId in classIds]
+        return (
+            np.repeat(np.array(classIds, dtype=np.int64), [len(scores) for scores, _ in classes]),
+            np.concatenate([scores for scores, _ in classes] + [np.zeros(0)]),
+            np.concatenate([counts for _, counts in classes] + [np.zeros((0, 2), dtype=np.int64)]),
+        )
@@ -0,0 +1,131 @@
+import json
+import math
+import numpy as np
+
+
+def toJsonCompatible(value):
+    """
+    Converts numpy arrays and scalars inside dicts and lists into plain python types.
+    """
+    if isinstance(value, dict):
+        return {str(key): toJsonCompatible(item) for key, item in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [toJsonCompatible(item) for item in value]
+    if isinstance(value, (np.ndarray, np.generic)):
+        return value.tolist()
+    return value
+
+
+def undefinedToNone(value):
+    """
+    Replaces the undefined floats (nan and infinite) inside json compatible dicts and lists with None,
+    which json writes as null.
+    """
+    if isinstance(value, dict):
+        return {key: undefinedToNone(item) for key, item in value.items()}
+    if isinstance(value, list):
+        return [undefinedToNone(item) for item in value]
+    if isinstance(value, float) and not math.isfinite(value):
+        return None
+    return value
+
+
+def saveJson(fileName, metrics, reportInfo):
+    """
+    Writes the metrics and the report information into a json file. Undefined values, like the areas
+    of a class without positive samples, are written as null.
+
+    Parameters
+    ----------
+    fileName : str
+        path of the json file.
+    metrics : dict
+        the result of ModelReport.computeMetrics.
+    reportInfo : dict
+        the descriptive fields of the report.
+    """
+    with open(fileName, "w") as out:
+        json.dump(
+            undefinedToNone(toJsonCompatible({"report": reportInfo, "metrics": metrics})),
+            out,
+            separators=(",", ":"),
+            default=str,
+            allow_nan=False,
+        )
+
+
+def saveNpz(fileName, metrics, reportInfo):
+    """
+    Writes the metrics into a compressed npz file. Nested dicts are flattened into keys joined with '.',
+    the report information and all scalar values are stored as json in the 'report' entry.
+
+    Parameters
+    ----------
+    fileName : str
+        path of the npz file.
+    metrics : dict
+        the result of ModelReport.computeMetrics.
+    reportInfo : dict
+        the descriptive fields of the report.
+    """
+    arrays = {}
+    scalars = {}
+
+    def flatten(prefix, value):
+        if isinstance(value, dict):
+            for key, item in value.items():
+                flatten(f"{prefix}{key}.", item)
+        elif isinstance(value, np.ndarray):
+            arrays[prefix[:-1]] = value
+        elif isinstance(value, list):
+            # class names are stored as strings so the file loads without allow_pickle
+            arrays[prefix[:-1]] = np.asarray(value, dtype=str)
+        else:
+            scalars[prefix[:-1]] = value
+
+    flatten("", metrics)
+    report = json.dumps(toJsonCompatible({"report": reportInfo, "metrics": scalars}), default=str)
+    np.savez_compressed(fileName, report=np.asarray(report), **arrays)
+
+
+stateArrays = [
+    "testMatrices", "testPairs", "trainingCounts", "trainingResults", "scoreClasses", "scoreValues", "scoreCounts"
+]
+
+
+def saveState(file, state):
+    """
+    Writes the accumulated state of a report into a compressed npz file. The labels and the
+    training metadata are stored as json so integer class names keep their type.
+
+    Parameters
+    ----------
+    file : str or file
+        path or binary file object the state is written to.
+    state : dict
+        the result of ModelReport.getState.
+    """
+    info = json.dumps(
+        toJsonCompatible({key: value for key, value in state.items() if key not in stateArrays}), default=str
+    )
+    np.savez_compressed(file, info=np.asarray(info), **{key: state[key] for key in stateArrays if key in state})
+
+
+def loadState(file):
+    """
+    Reads a state written by saveState.
+
+    Parameters
+    ----------
+    file : str or file
+        path or binary file object.
+
+    Returns
+    -------
+    dict
+        the state in the format of ModelReport.getState.
+    """
+    with np.load(file) as npz:
+        state = json.loads(str(npz["info"]))
+        state.update({key: npz[key] for key in stateArrays if key in npz.files})
+    return state
@@ -0,0 +1,90 @@
+import os
+import numpy as np
+
+
+def iterChunks(source, columns, chunkSize=1_000_000):
+    """
+    Reads the given columns of a prediction log in chunks of at most chunkSize rows.
+
+    Parameters
+    ----------
+    source : str or array_like
+        path of a .npy, .csv or .parquet file, or an array such as a np.memmap. The .npy file is
+        memory-mapped, csv needs pandas and parquet needs pyarrow.
+    columns : list
+        the columns to read, as index or name. Names are the field names of structured arrays
+        or the column names of csv and parquet files.
+    chunkSize : int
+        number of rows per chunk.
+
+    Yields
+    ------
+    list
+        one np.ndarray per column.
+    """
+    if not isinstance(source, (str, os.PathLike)):
+        yield from iterArrayChunks(source, columns, chunkSize)
+        return
+    extension = os.path.splitext(source)[1].lower()
+    if extension == ".npy":
+        yield from iterArrayChunks(np.load(source, mmap_mode="r"), columns, chunkSize)
+    elif extension == ".csv":
+        import pandas as pd
+
+        with pd.read_csv(source, chunksize=chunkSize) as reader:
+            for chunk in reader:
+                yield [
+                    (chunk.iloc[:, column] if isinstance(column, int) else chunk[column]).to_numpy()
+                    for column in columns
+                ]
+    elif extension == ".parquet":
+        import pyarrow.parquet as pq
+
+        file = pq.ParquetFile(source)
+        names = [file.schema_arrow.names[column] if isinstance(column, int) else column for column in columns]
+        for batch in file.iter_batches(batch_size=chunkSize, columns=list(dict.fromkeys(names))):
+            yield [batch.column(name).to_numpy(zero_copy_only=False) for name in names]
+    else:
+        raise ValueError(f"Unknown file type '{extension}', use .npy, .csv or .parquet")
+
+
+def iterArrayChunks(array, columns, chunkSize):
+    array = np.asarray(array) if not isinstance(array, np.ndarray) else array
+    for start in range(0, len(array), chunkSize):
+        # slicing a memmap only maps the rows of this chunk
+        chunk = array[start : start + chunkSize]
+        if array.dtype.names is None:
+            yield [np.asarray(chunk[:, column]) for column in columns]
+        else:
+            yield [np.asarray(chunk[column]) for column in columns]
+
+
+def groupFolds(values):
+    """
+    Groups the rows of a chunk by the value of its fold column.
+
+    Parameters
+    ----------
+    values : np.ndarray
+        the fold of each row.
+
+    Returns
+    -------
+    tuple
+        (list of the distinct values, index of the first row of each value, index of the value of each row)
+    """
+    values = np.asarray(values).reshape(-1)
+    if values.dtype.kind in "iu" and len(values):
+        # integer folds of a small range are grouped through a table over the range instead of a sort
+        minValue = int(values.min())
+        valueRange = int(values.max()) - minValue + 1
+        if valueRange <= 4 * values.size + 1024:
+            offsets = (values - minValue).astype(np.intp)
+            firstRows = np.full(valueRange, len(values), dtype=np.int64)
+            np.minimum.at(firstRows, offsets, np.arange(len(values), dtype=np.int64))
+            present = np.flatnonzero(firstRows < len(values))
+            lookup = np.zeros(valueRange, dtype=np.int64)
+            lookup[present] = np.arange(len(present))
+            return (present + minValue).tolist(), firstRows[present], lookup[offsets]
+    foldValues, firstRows, foldIds = np.unique(values, return_index=True, return_inverse=True)
+    return foldValues.tolist(), firstRows, foldIds.reshape(-1)
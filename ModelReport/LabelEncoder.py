@@ -0,0 +1,83 @@
+import numpy as np
+
+
+class LabelEncoder:
+    def __init__(self, labels=None):
+        """
+        Maps class names to dense integer ids. Ids are handed out to new names call
+        by call, within one call in sorted order of the names, or in order of appearance
+        if they cannot be sorted together. Ids never change, so arrays indexed by them
+        stay valid while new classes are added.
+
+        Parameters
+        ----------
+        labels : list
+            class names known up front, they get the ids 0 to len(labels)-1.
+        """
+        self.__labels = []
+        self.__labelToId = {}
+        for label in labels or []:
+            self.__getId(label)
+
+    def __len__(self):
+        return len(self.__labels)
+
+    @property
+    def labels(self):
+        """
+        list of all known class names, the position is the id of the class.
+        """
+        return list(self.__labels)
+
+    def encode(self, values):
+        """
+        Converts class names to ids. Unknown class names get a new id.
+
+        Parameters
+        ----------
+        values : array_like
+            class names of any shape.
+
+        Returns
+        -------
+        np.ndarray
+            int64 array of the same shape containing the ids.
+        """
+        values = np.asarray(values)
+        if values.size == 0:
+            return np.zeros(values.shape, dtype=np.int64)
+        if values.dtype.kind in "iu":
+            return self.__encodeIntegers(values)
+        try:
+            uniques, inverse = np.unique(values, return_inverse=True)
+        except TypeError:
+            # names of types that cannot be sorted together, e.g. int and str, are looked up one by one
+            ids = [self.__getId(label) for label in values.ravel().tolist()]
+            return np.array(ids, dtype=np.int64).reshape(values.shape)
+        ids = np.fromiter(
+            (self.__getId(label) for label in uniques.tolist()),
+            dtype=np.int64,
+            count=len(uniques),
+        )
+        return ids[inverse].reshape(values.shape)
+
+    def __encodeIntegers(self, values):
+        # Integer class names are looked up through a table over their value range,
+        # which avoids the sort of np.unique for the common case of small codes.
+        minValue = int(values.min())
+        valueRange = int(values.max()) - minValue + 1
+        if valueRange > 4 * values.size + 1024:
+            uniques, inverse = np.unique(values, return_inverse=True)
+            ids = np.array([self.__getId(label) for label in uniques.tolist()], dtype=np.int64)
+            return ids[inverse].reshape(values.shape)
+        offsets = (values - minValue).astype(np.intp)
+        present = np.flatnonzero(np.bincount(offsets.ravel(), minlength=valueRange))
+        lookup = np.zeros(valueRange, dtype=np.int64)
+        lookup[present] = [self.__getId(int(offset) + minValue) for offset in present]
+        return lookup[offsets]
+
+    def __getId(self, label):
+        if label not in self.__labelToId:
+            self.__labelToId[label] = len(self.__labels)
+            self.__labels.append(label)
+        return self.__labelToId[label]
@@ -0,0 +1,145 @@
+import html
+import os
+import tempfile
+import threading
+import time
+from .Charts import renderCharts, resolveRenderProfile
+
+# the charts of the snapshot, the ones that show how the folds develop
+liveCharts = ["PlotFScore", "ConfusionMatrixPerformanceData", "RegConfusionMatrixPerformanceData"]
+
+
+class LiveReport:
+    def __init__(self, fileName="LiveReport", interval=30.0, renderProfile="draft"):
+        """
+        Keeps a lightweight html snapshot of a report up to date while the folds are added.
+        The charts are written to the folder fileName_files and only rendered again when their data changed.
+
+        Parameters
+        ----------
+        fileName : str
+            the name of the snapshot, '.html' is appended.
+        interval : float
+            minimum number of seconds between two snapshots, the page reloads itself at the same interval.
+        renderProfile : str or dict
+            the render profile of the charts, see Charts.renderProfiles.
+        """
+        self.fileName = fileName + ".html"
+        self.directory = fileName + "_files"
+        self.interval = interval
+        self.renderProfile = resolveRenderProfile(renderProfile)
+        self.snapshots = 0
+        self.renderedCharts = 0
+        self.__lastSnapshot = None
+        self.__chartKeys = {}
+        self.__lock = threading.Lock()
+
+    def due(self):
+        """
+        Returns whether interval seconds have passed since the last snapshot.
+        """
+        return self.__lastSnapshot is None or time.monotonic() - self.__lastSnapshot >= self.interval
+
+    def update(self, snapshot, force=False):
+        """
+        Writes a snapshot if one is due. If another thread is writing one right now nothing is done.
+
+        Parameters
+        ----------
+        snapshot : function
+            returns (title, metrics, charts): the title of the page, the metrics in the form of
+            ModelReport.computeMetrics and the Chart objects of the report, or None if there is nothing
+            to show yet. Only called if a snapshot is due.
+        force : bool
+            writes the snapshot even if the interval has not passed yet; waits for a running one.
+
+        Returns
+        -------
+        bool
+            whether a snapshot was written.
+        """
+        if not (force or self.due()):
+            return False
+        if not self.__lock.acquire(blocking=force):
+            return False
+        try:
+            content = snapshot()
+            if content is None:
+                return False
+            self.__write(*content)
+            self.__lastSnapshot = time.monotonic()
+            self.snapshots += 1
+            return True
+        finally:
+            self.__lock.release()
+
+    def __write(self, title, metrics, charts):
+        os.makedirs(self.directory, exist_ok=True)
+        charts = [chart for chart in charts if chart.name in liveCharts]
+        for chart in charts:
+            chart.applyRenderProfile(self.renderProfile)
+        keys = {chart.name: chart.cacheKey for chart in charts}
+        changed = [chart for chart in charts if not self.__chartKeys.get(chart.name) == keys[chart.name]]
+        renderCharts(changed, self.directory, renderProfile=self.renderProfile)
+        self.__chartKeys.update({chart.name: keys[chart.name] for chart in changed})
+        self.renderedCharts += len(changed)
+
+        # the key in the query makes the browser load a chart again once it changed
+        folder = os.path.basename(self.directory)
+        images = {chart.name: f"{folder}/{chart.fileName}?{keys[chart.name][:12]}" for chart in charts}
+        # written under a temporary name first so the browser never loads half a page
+        handle, temporaryPath = tempfile.mkstemp(dir=os.path.dirname(os.path.abspath(self.fileName)), prefix=".")
+        with os.fdopen(handle, "w") as out:
+            out.write(liveHtml(title, metrics, images, self.interval))
+        os.replace(temporaryPath, self.fileName)
+
+
+def liveHtml(title, metrics, images, interval):
+    """
+    Returns the html of a snapshot: the pooled metrics, a table per class, a table per fold and the charts.
+    """
+    classRows = ""
+    for label, precision, recall, fScore, support in zip(
+        metrics["labels"], metrics["precision"], metrics["recall"], metrics["fScore"], metrics["support"]
+    ):
+        classRows += f"""<tr><th>{html.escape(str(label))}</th><td>{precision*100:.2f}%</td>
+            <td>{recall*100:.2f}%</td><td>{fScore*100:.2f}%</td><td>{support}</td></tr>\n"""
+
+    foldRows = ""
+    for fold, (accuracy, fScores) in enumerate(zip(metrics["foldAccuracy"], metrics["foldFScore"])):
+        macroFScore = fScores.mean() if fScores.size else 0.0
+        foldRows += f"""<tr><th>Fold:{fold + 1}</th><td>{accuracy*100:.2f}%</td><td>{macroFScore*100:.2f}%</td></tr>\n"""
+
+    charts = "".join(
+        f"""<div><h4>{name}:</h4><img src="{image}" alt="{name}"></div>\n""" for name, image in images.items()
+    )
+    return f"""<html>
+    <head>
+        <meta http-equiv="refresh" content="{max(int(interval), 1)}">
+        <style type="text/css">
+            body {{ font-family: sans-serif; font-size: 80%; }}
+            table {{ border-collapse: collapse; margin-bottom: 20px; }}
+            th, td {{ padding: 2px 10px; text-align: right; }}
+            img {{ max-width: 100%; }}
+        </style>
+    </head>
+    <body>
+        <h2>{html.escape(str(title))}</h2>
+        <p>Snapshot of {time.strftime("%d/%m/%Y %H:%M:%S")}, {len(metrics["foldAccuracy"])} folds</p>
+        <table>
+            <tr><th>Accuracy</th><td>{metrics["accuracy"]*100:.2f}%</td></tr>
+            <tr><th>Macro F1-Score</th><td>{metrics["macroAverage"]["fScore"]*100:.2f}%</td></tr>
+            <tr><th>Weighted F1-Score</th><td>{metrics["weightedAverage"]["fScore"]*100:.2f}%</td></tr>
+            <tr><th>Training accuracy</th><td>{metrics["trainingAccuracy"]*100:.2f}%</td></tr>
+        </table>
+        <table>
+            <tr><th>Fold</th><th>Accuracy</th><th>Macro F1-Score</th></tr>
+            {foldRows}
+        </table>
+        <table>
+            <tr><th>Class</th><th>Precision</th><th>Recall</th><th>F1-Score</th><th>Support</th></tr>
+            {classRows}
+        </table>
+        {charts}
+    </body>
+</html>"""
@@ -0,0 +1,313 @@
+import numpy as np
+
+
+def safeDivide(numerator, denominator):
+    """
+    Element wise division that returns 0 where the denominator is 0.
+    """
+    numerator = np.asarray(numerator, dtype=np.float64)
+    denominator = np.asarray(denominator, dtype=np.float64)
+    return np.divide(
+        numerator,
+        denominator,
+        out=np.zeros(np.broadcast(numerator, denominator).shape),
+        where=denominator != 0,
+    )
+
+
+def computeClassificationMetricsFromCounts(truePositives, predictedPerClass, actualPerClass):
+    """
+    Computes the classification metrics from the per class counts of each fold, which is all
+    that is needed of the confusion matrices.
+
+    Parameters
+    ----------
+    truePositives, predictedPerClass, actualPerClass : np.ndarray
+        (folds, classes) number of correct results, of predictions and of samples of each class.
+
+    Returns
+    -------
+    dict
+        'precision', 'recall', 'fScore', 'support' : (classes,) pooled per class metrics.
+        'accuracy' : pooled accuracy.
+        'macroAverage', 'weightedAverage' : dicts with 'precision', 'recall' and 'fScore'.
+        'foldPrecision', 'foldRecall', 'foldFScore' : (folds, classes) per fold metrics.
+        'foldAccuracy' : (folds,) accuracy of each fold.
+    """
+    # The pooled counts are treated as one extra fold so that a single set of
+    # reductions yields the per fold and the pooled metrics.
+    truePositives, predictedPerClass, actualPerClass = (
+        np.concatenate([counts, counts.sum(axis=0, keepdims=True)])
+        for counts in (np.asarray(truePositives), np.asarray(predictedPerClass), np.asarray(actualPerClass))
+    )
+
+    precision = safeDivide(truePositives, predictedPerClass)
+    recall = safeDivide(truePositives, actualPerClass)
+    fScore = safeDivide(2 * precision * recall, precision + recall)
+    accuracy = safeDivide(truePositives.sum(axis=1), actualPerClass.sum(axis=1))
+
+    support = actualPerClass[-1]
+    pooled = {"precision": precision[-1], "recall": recall[-1], "fScore": fScore[-1]}
+    return {
+        "precision": pooled["precision"],
+        "recall": pooled["recall"],
+        "fScore": pooled["fScore"],
+        "support": support,
+        "accuracy": float(accuracy[-1]),
+        "macroAverage": {key: float(value.mean()) if value.size else 0.0 for key, value in pooled.items()},
+        "weightedAverage": {
+            key: float(safeDivide((value * support).sum(), support.sum())) for key, value in pooled.items()
+        },
+        "foldPrecision": precision[:-1],
+        "foldRecall": recall[:-1],
+        "foldFScore": fScore[:-1],
+        "foldAccuracy": accuracy[:-1],
+    }
+
+
+def topClassIndices(support, topClasses):
+    """
+    Returns the indices of the topClasses classes with the largest support, in ascending order.
+    """
+    return np.sort(np.argsort(-np.asarray(support), kind="stable")[:topClasses])
+
+
+def topConfusionMatrix(predicted, actual, counts, shownClasses, numberOfClasses):
+    """
+    Builds the confusion matrix of some classes from the non zero cells of the full matrix.
+    All other classes are pooled into a last 'other' row and column.
+
+    Parameters
+    ----------
+    predicted, actual, counts : np.ndarray
+        the non zero cells of the full matrix, predicted and actual are class indices.
+    shownClasses : np.ndarray
+        indices of the classes that keep their own row and column.
+    numberOfClasses : int
+        number of classes of the full matrix.
+
+    Returns
+    -------
+    np.ndarray
+        (shown + 1, shown + 1) matrix, the other bucket is dropped if all classes are shown.
+    """
+    size = len(shownClasses) + 1
+    bucket = np.full(numberOfClasses, len(shownClasses), dtype=np.int64)
+    bucket[shownClasses] = np.arange(len(shownClasses))
+    matrix = np.bincount(bucket[predicted] * size + bucket[actual], weights=counts, minlength=size**2)
+    matrix = matrix.astype(np.int64).reshape(size, size)
+    return matrix[:-1, :-1] if len(shownClasses) == numberOfClasses else matrix
+
+
+def topConfusions(predicted, actual, counts, numberOfPairs):
+    """
+    Returns the numberOfPairs most frequent confusions as (predicted, actual, count) arrays.
+    """
+    wrong = np.flatnonzero(predicted != actual)
+    order = wrong[np.argsort(-counts[wrong], kind="stable")[:numberOfPairs]]
+    return predicted[order], actual[order], counts[order]
+
+
+def sumByClass(draws, classIds, numberOfClasses):
+    """
+    Adds up the columns of draws that belong to the same class.
+
+    Parameters
+    ----------
+    draws : np.ndarray
+        (replicates, cells) counts.
+    classIds : np.ndarray
+        (cells,) class of each column.
+    numberOfClasses : int
+        number of classes.
+
+    Returns
+    -------
+    np.ndarray
+        (replicates, classes) counts.
+    """
+    sums = np.zeros((len(draws), numberOfClasses), dtype=np.int64)
+    if len(classIds) == 0:
+        return sums
+    order = np.argsort(classIds, kind="stable")
+    classIds = classIds[order]
+    starts = np.flatnonzero(np.r_[True, classIds[1:] != classIds[:-1]])
+    sums[:, classIds[starts]] = np.add.reduceat(draws[:, order], starts, axis=1)
+    return sums
+
+
+def bootstrapSamples(predicted, actual, counts, numberOfClasses, replicates=1000, random=None, blockSize=2**22):
+    """
+    Resamples the pooled test results with replacement. Every replicate is one multinomial draw of all
+    results over the cells of the confusion matrix, so no single result is looked at. The replicates are
+    drawn in blocks that are reduced to per class counts right away.
+
+    Parameters
+    ----------
+    predicted, actual, counts : np.ndarray
+        the non zero cells of the pooled confusion matrix.
+    numberOfClasses : int
+        number of classes.
+    replicates : int
+        number of bootstrap replicates.
+    random : int or np.random.Generator
+        seed or generator of the draws.
+    blockSize : int
+        number of drawn cell counts held in memory at once, which bounds the memory for many cells.
+
+    Returns
+    -------
+    tuple
+        (truePositives, predictedPerClass, actualPerClass), each a (replicates, classes) array.
+    """
+    random = np.random.default_rng(random)
+    counts = np.asarray(counts, dtype=np.int64)
+    total = int(counts.sum())
+    replicateCounts = tuple(np.zeros((replicates, numberOfClasses), dtype=np.int64) for _ in range(3))
+    if total == 0:
+        return replicateCounts
+    correct = np.flatnonzero(predicted == actual)
+    block = max(1, blockSize // len(counts))
+    for start in range(0, replicates, block):
+        draws = random.multinomial(total, counts / total, size=min(block, replicates - start))
+        rows = slice(start, start + len(draws))
+        replicateCounts[0][rows] = sumByClass(draws[:, correct], actual[correct], numberOfClasses)
+        replicateCounts[1][rows] = sumByClass(draws, predicted, numberOfClasses)
+        replicateCounts[2][rows] = sumByClass(draws, actual, numberOfClasses)
+    return replicateCounts
+
+
+def bootstrapFolds(truePositives, predictedPerClass, actualPerClass, replicates=1000, random=None):
+    """
+    Resamples whole folds with replacement, which keeps the variation between the folds.
+
+    Parameters
+    ----------
+    truePositives, predictedPerClass, actualPerClass : np.ndarray
+        (folds, classes) counts of each fold.
+    replicates : int
+        number of bootstrap replicates.
+    random : int or np.random.Generator
+        seed or generator of the draws.
+
+    Returns
+    -------
+    tuple
+        (truePositives, predictedPerClass, actualPerClass), each a (replicates, classes) array.
+    """
+    random = np.random.default_rng(random)
+    folds = len(truePositives)
+    if folds == 0:
+        return tuple(np.zeros((replicates, np.shape(counts)[1]), dtype=np.int64) for counts in (truePositives,) * 3)
+    # how often each fold is drawn in each replicate
+    weights = random.multinomial(folds, np.full(folds, 1 / folds), size=replicates)
+    return tuple(weights @ np.asarray(counts, dtype=np.int64) for counts in (truePositives, predictedPerClass, actualPerClass))
+
+
+def bootstrapConfidenceIntervals(truePositives, predictedPerClass, actualPerClass, confidence=0.95):
+    """
+    Computes percentile confidence intervals from the counts of bootstrap replicates.
+
+    Parameters
+    ----------
+    truePositives, predictedPerClass, actualPerClass : np.ndarray
+        (replicates, classes) counts, see bootstrapSamples and bootstrapFolds.
+    confidence : float
+        the confidence level of the intervals.
+
+    Returns
+    -------
+    dict
+        'precision', 'recall', 'fScore' : (2, classes) lower and upper bound of each class.
+        'accuracy' : (2,) lower and upper bound.
+        'macroAverage', 'weightedAverage' : dicts with the (2,) bounds of 'precision', 'recall' and 'fScore'.
+    """
+    replicates = computeClassificationMetricsFromCounts(truePositives, predictedPerClass, actualPerClass)
+    support = np.asarray(actualPerClass, dtype=np.float64)
+    weights = safeDivide(support, support.sum(axis=1, keepdims=True))
+    bounds = [50 * (1 - confidence), 50 * (1 + confidence)]
+
+    def interval(values):
+        return np.percentile(values, bounds, axis=0)
+
+    perClass = {
+        "precision": replicates["foldPrecision"],
+        "recall": replicates["foldRecall"],
+        "fScore": replicates["foldFScore"],
+    }
+    numberOfClasses = support.shape[1]
+    return {
+        **{key: interval(values) for key, values in perClass.items()},
+        "accuracy": interval(replicates["foldAccuracy"]),
+        "macroAverage": {
+            key: interval(values.mean(axis=1)) if numberOfClasses else np.zeros(2) for key, values in perClass.items()
+        },
+        "weightedAverage": {key: interval((values * weights).sum(axis=1)) for key, values in perClass.items()},
+    }
+
+
+def formatPercentage(value, interval=None):
+    """
+    Formats a metric as percentage, followed by its confidence interval if one is given.
+    """
+    if interval is None:
+        return f"{value*100:.2f}%"
+    return f"{value*100:.2f}% ({interval[0]*100:.1f}-{interval[1]*100:.1f})"
+
+
+def scoreCurves(scores, counts, points=200):
+    """
+    Computes the one-vs-rest ROC and precision-recall curve of a class. The scores are already sorted
+    and counted, so every threshold is one step of a cumulative sum from the highest score downwards.
+
+    Parameters
+    ----------
+    scores : np.ndarray
+        the sorted distinct scores of the class.
+    counts : np.ndarray
+        (scores, 2) number of positive and negative samples with each score.
+    points : int
+        number of points the curves are reduced to, the areas are computed from all thresholds.
+
+    Returns
+    -------
+    dict
+        'rocAuc' : area under the ROC curve, nan without positive or without negative samples.
+        'averagePrecision' : the area under the precision-recall curve as sum of the precision at each
+        threshold weighted by the increase of the recall, nan without positive samples.
+        'falsePositiveRate', 'truePositiveRate' : (points,) the ROC curve from (0, 0) to (1, 1).
+        'recall', 'precision' : (points,) the precision-recall curve starting at (0, 1).
+    """
+    # a sample is predicted as the class if its score is at least the threshold
+    truePositives = np.cumsum(np.asarray(counts, dtype=np.int64)[::-1, 0])
+    falsePositives = np.cumsum(np.asarray(counts, dtype=np.int64)[::-1, 1])
+    positives = truePositives[-1] if len(truePositives) else 0
+    negatives = falsePositives[-1] if len(falsePositives) else 0
+    truePositiveRate = safeDivide(np.r_[0, truePositives], positives)
+    falsePositiveRate = safeDivide(np.r_[0, falsePositives], negatives)
+    recall = safeDivide(truePositives, positives)
+    precision = safeDivide(truePositives, truePositives + falsePositives)
+
+    rocAuc = np.nan
+    if positives and negatives:
+        rocAuc = float(np.sum(np.diff(falsePositiveRate) * (truePositiveRate[1:] + truePositiveRate[:-1]) / 2))
+    averagePrecision = float(np.sum(np.diff(np.r_[0, recall]) * precision)) if positives else np.nan
+
+    recall, precision = np.r_[0, recall], np.r_[1, precision]
+    rocPoints = np.linspace(0, len(truePositiveRate) - 1, points).round().astype(np.int64)
+    prPoints = np.linspace(0, len(recall) - 1, points).round().astype(np.int64)
+    return {
+        "rocAuc": rocAuc,
+        "averagePrecision": averagePrecision,
+        "falsePositiveRate": falsePositiveRate[rocPoints],
+        "truePositiveRate": truePositiveRate[rocPoints],
+        "recall": recall[prPoints],
+        "precision": precision[prPoints],
+    }
+
+
+def formatArea(value):
+    """
+    Formats the area under a curve, '-' if it is not defined.
+    """
+    return "-" if np.isnan(value) else f"{value:.3f}"
@@ -1,12 +1,56 @@
+import functools
 import numpy as np
-import matplotlib.pyplot as plt
-from matplotlib.ticker import (MultipleLocator, AutoMinorLocator)
 from datetime import datetime
-import pdfkit
 import os
-import seaborn as sn
-import pandas as pd
 import platform
+import shutil
+import tempfile
+import threading
+from .LabelEncoder import LabelEncoder
+from .ConfusionAccumulator import (
+    ConfusionAccumulator,
+    ClassCountAccumulator,
+    ScoreAccumulator,
+    SparseConfusionAccumulator,
+    countFoldPairs,
+    countPairs,
+    countScores,
+)
+from .Metrics import (
+    bootstrapConfidenceIntervals,
+    bootstrapFolds,
+    bootstrapSamples,
+    computeClassificationMetricsFromCounts,
+    formatArea,
+    formatPercentage,
+    safeDivide,
+    scoreCurves,
+    topClassIndices,
+    topConfusionMatrix,
+    topConfusions,
+)
+from .Pdf import htmlFileToPdf, htmlFileToPdfAsync, htmlToPdf, htmlToPdfAsync
+from .Ingest import groupFolds, iterChunks
+from .Shards import ShardedIngestion
+from .LiveReport import LiveReport
+from .Profiler import CumulativeTimer, Profile, profileStage
+from .Export import loadState, saveJson, saveNpz, saveState
+from .NativePdf import writeReportPdf
+from .Charts import (
+    Chart,
+    ChartCache,
+    classColors,
+    otherColor,
+    drawBoxPlot,
+    drawConfusionMatrix,
+    drawCurves,
+    drawFScoreBySplit,
+    drawPieChart,
+    drawStackedFoldBarChart,
+    fileToDataUri,
+    renderCharts,
+    toDataUri,
+)
 
 
 class ModelReport:
@@ -20,7 +64,10 @@ class ModelReport:
         descriptionGraphicPath="",
         graphicDescription="",
         datafile = None,
-        randomSplitSeed = None
+        randomSplitSeed = None,
+        keepTrainingSet = False,
+        classes = None,
+        topClasses = None
     ):
         """
         Creates a ModelReport object. Defines the Overview section of the model report.
@@ -41,6 +88,18 @@ class ModelReport:
             absolute file path to a img. Gets placed next to the algoDescription.
         graphicDescription: str
             short string describing the img.
+        keepTrainingSet: bool
+            keeps the rows passed to addTrainingSet instead of only counting the classes.
+        classes: list
+            the class names known up front. They are shown in this order, also if a class has no samples,
+            classes that only show up in the results are appended.
+        topClasses: int
+            mode for a large number of classes. The test results are stored as sparse confusion counts
+            and the report only shows the topClasses classes with the most test samples, the remaining
+            classes are pooled into an 'Other' bucket. The topClasses most frequent confusions are listed.
+
+        The add methods can be called from several threads at once. Every thread counts its results
+        into its own shard, the shards are combined when the report is read.
         """
         self.__modelName = modelName
         self.__date = datetime.now().strftime("%d/%m/%Y %H:%M:%S")
@@ -50,195 +109,889 @@ class ModelReport:
         self.__algoDescription = algoDescription
         self.__descriptionGraphicPath = descriptionGraphicPath
         self.__graphicDescription = graphicDescription
-        self.__trainingSet = []
-        self.__testResults = []
+        self.__classes = list(classes or [])
+        self.__labelEncoder = LabelEncoder(self.__classes)
+        self.__trainingSet = ClassCountAccumulator(self.__labelEncoder)
+        self.__trainingSetRows = [] if keepTrainingSet else None
+        self.__topClasses = topClasses
+        if topClasses is None:
+            self.__testResults = ConfusionAccumulator(self.__labelEncoder)
+        else:
+            self.__testResults = SparseConfusionAccumulator(self.__labelEncoder)
+        self.__testScores = ScoreAccumulator()
         self.__trainingResults = []
         self.__trainingMetaData = []
         self.__randomSplitSeed = None
         self.__datafile = datafile
         self.__randomSplitSeed = randomSplitSeed
         self.__classToColor = {}
-
-
-    def addTrainingSet(self, trainingSet):
+        self.__metrics = None
+        self.__ingestion = CumulativeTimer()
+        self.__shards = ShardedIngestion(self.__classes)
+        self.__foldIndices = {}
+        self.__lock = threading.RLock()
+        self.__live = None
+
+
+    def __getstate__(self):
+        # a pickled report, e.g. sent to a worker process, takes the results of the thread shards along
+        # but not the locks, the shards and the live report, they belong to the threads of this process
+        with self.__lock:
+            self.__collect()
+            state = dict(self.__dict__)
+        for name in ["lock", "shards", "live"]:
+            del state[f"_ModelReport__{name}"]
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self.__lock = threading.RLock()
+        self.__shards = ShardedIngestion(self.__classes)
+        self.__live = None
+
+    def addTrainingSet(self, trainingSet, classes=None, labels=None, fold=None):
         """
         Adds the training set. This is used to visualise the training data used to train the model.
 
         Parameters
         ----------
-        trainingSet : list
-            a list containing all training data [['sen','class']]
+        trainingSet : list or array_like
+            a list containing all training data [['sen','class']], or the sentences if classes is given.
+        classes : array_like
+            the class of each sentence, either class names or integer codes.
+        labels : list
+            the class names of integer coded classes, labels[code] is the name of code.
+        fold : int or str
+            id of the fold, see addTestResults.
+        """
+        with self.__ingestion:
+            rows = None
+            if self.__trainingSetRows is not None:
+                if classes is None:
+                    rows = trainingSet
+                else:
+                    rows = list(zip(trainingSet, np.asarray(classes).tolist()))
+            shard = self.__shards.shard()
+            labelEncoder = shard.labelEncoder
+            if classes is None:
+                classIds = labelEncoder.encode([sample[1] for sample in trainingSet])
+            elif labels is None:
+                classIds = labelEncoder.encode(classes)
+            else:
+                classIds = labelEncoder.encode(np.asarray(labels, dtype=object))[checkClassCodes(classes, labels)]
+            counts = np.bincount(np.asarray(classIds, dtype=np.int64), minlength=len(labelEncoder))
+            self.__shards.add(shard, "trainingSet", fold, (counts, rows))
+        self.__updateLiveReport()
+
+    @property
+    def trainingSets(self):
+        """
+        list of the rows passed to addTrainingSet, None if the report was created without keepTrainingSet.
         """
-        self.__trainingSet.append(trainingSet)
+        self.__collect()
+        return self.__trainingSetRows
 
 
-    def addTestResults(self, testResults):
+    def addTestResults(self, testResults, predicted=None, labels=None, fold=None):
         """
-        Adds the test results. This is used to visualise the classification performance.
+        Adds the test results of one fold. This is used to visualise the classification performance.
+        The results are counted into a confusion matrix right away, the list itself is not kept.
 
         Parameters
         ----------
-        testResults : list
-            a list containing all test results [[act,pred]]
+        testResults : list or array_like
+            a list containing all test results [[act,pred]], or the actual classes if predicted is given.
+        predicted : array_like
+            the predicted classes, same length as testResults.
+        labels : list
+            the class names of integer coded classes, labels[code] is the name of code.
+        fold : int or str
+            id of the fold. The test results, training set and training results with the same id are
+            one fold, whichever thread adds them and also if the report is read in between, results added
+            twice to a fold are added up. Folds with an id are ordered by it, int ids before str ids. The folds
+            without id follow thread by thread in the order each thread added them, so a thread has to add all
+            parts of its folds. The order holds for the folds added before the report is read, later folds are
+            appended. Use ids for all parts of the folds or for none.
+        """
+        with self.__ingestion:
+            shard = self.__shards.shard()
+            actual, predicted = self.__encodeResults(testResults, predicted, labels, shard.labelEncoder)
+            cells = countPairs(predicted, actual, len(shard.labelEncoder))
+            self.__shards.add(shard, "test", fold, cells)
+        self.__updateLiveReport()
+
+    def addTestResultsFromFile(
+        self, source, actualColumn=0, predictedColumn=1, foldColumn=None, labels=None, chunkSize=1_000_000
+    ):
         """
-        self.__testResults.append(testResults)
+        Adds test results from a file that can be larger than the memory. The file is read in chunks
+        that are counted into the confusion matrices right away, so the memory used only depends on chunkSize.
 
-    def addTrainingResults(self, trainingResults, trainingMetaData = None):
+        Parameters
+        ----------
+        source : str or array_like
+            path of a .npy, .csv or .parquet file, or an array such as a np.memmap, see Ingest.iterChunks.
+        actualColumn, predictedColumn : int or str
+            index or name of the columns with the actual and the predicted classes.
+        foldColumn : int or str
+            index or name of the column with the fold of each row. Every distinct value becomes a fold,
+            in order of first appearance. None adds the whole file as one fold.
+        labels : list
+            the class names of integer coded classes, labels[code] is the name of code.
+        chunkSize : int
+            number of rows read at once.
+        """
+        with self.__ingestion:
+            columns = [actualColumn, predictedColumn] + ([] if foldColumn is None else [foldColumn])
+            shard = self.__shards.shard()
+            if self.__topClasses is None:
+                testResults = ConfusionAccumulator(shard.labelEncoder)
+            else:
+                testResults = SparseConfusionAccumulator(shard.labelEncoder)
+            folds = {}
+            for chunk in iterChunks(source, columns, chunkSize):
+                actual, predicted = self.__encodeResults(chunk[0], chunk[1], labels, shard.labelEncoder)
+                if foldColumn is None:
+                    foldValues, firstRows, foldIds = [None], [0], np.zeros(len(actual), dtype=np.int64)
+                else:
+                    foldValues, firstRows, foldIds = groupFolds(chunk[2])
+                for index in np.argsort(firstRows, kind="stable"):
+                    if foldValues[index] not in folds:
+                        folds[foldValues[index]] = len(testResults)
+                        testResults.addFold(actual[:0], predicted[:0])
+                # all folds of the chunk are counted in one pass, the cells are then split by fold
+                foldIndices = np.array([folds[foldValue] for foldValue in foldValues], dtype=np.int64)
+                cellFolds, cellPredicted, cellActual, counts = countFoldPairs(
+                    foldIndices[foldIds], predicted, actual, len(shard.labelEncoder)
+                )
+                bounds = np.searchsorted(cellFolds, np.arange(len(folds) + 1))
+                for fold in np.flatnonzero(np.diff(bounds)):
+                    cells = slice(bounds[fold], bounds[fold + 1])
+                    testResults.addPairsToFold(fold, cellPredicted[cells], cellActual[cells], counts[cells])
+            foldIds, predicted, actual, counts = testResults.foldPairs()
+            for fold in range(len(testResults)):
+                inFold = foldIds == fold
+                self.__shards.add(shard, "test", None, (predicted[inFold], actual[inFold], counts[inFold]))
+        self.__updateLiveReport()
+
+    def addTestScores(self, actual, scores, labels=None, fold=None, decimals=None, chunkSize=100_000):
+        """
+        Adds the test results of one fold as class scores, e.g. the probabilities of a classifier.
+        The class with the highest score is counted as the prediction, and the scores give the one-vs-rest
+        ROC and precision-recall curves of each class. The scores are counted per distinct value chunk by
+        chunk, the score matrix itself is not kept.
+
+        Parameters
+        ----------
+        actual : array_like
+            the actual classes, class names or integer codes of labels.
+        scores : array_like
+            (samples, classes) scores, column i belongs to the class labels[i]. Can be a np.memmap,
+            it is read chunkSize rows at a time.
+        labels : list
+            the classes of the score columns, the declared classes of the report if None.
+        fold : int or str
+            id of the fold, see addTestResults.
+        decimals : int
+            the scores are rounded to this number of decimals for the curves, which limits the memory to
+            10**decimals + 1 distinct scores per class for probabilities. None keeps the exact scores.
+        chunkSize : int
+            number of rows counted at once.
+        """
+        labels = self.__classes if labels is None else list(labels)
+        if not len(labels) == np.shape(scores)[1]:
+            raise ValueError("scores must have one column for each of the labels")
+        with self.__ingestion:
+            shard = self.__shards.shard()
+            labelEncoder = shard.labelEncoder
+            columnIds = labelEncoder.encode(np.asarray(labels, dtype=object))
+            actual = np.asarray(actual)
+            if not len(actual) == len(scores):
+                raise ValueError("actual and scores must have the same length")
+            if np.issubdtype(actual.dtype, np.integer):
+                actual = columnIds[checkClassCodes(actual, labels)]
+            else:
+                actual = labelEncoder.encode(actual)
+            predicted = np.zeros(len(actual), dtype=np.int64)
+            testScores = ScoreAccumulator()
+            for start in range(0, len(actual), chunkSize):
+                chunk = np.asarray(scores[start : start + chunkSize], dtype=np.float64)
+                predicted[start : start + chunkSize] = columnIds[chunk.argmax(axis=1)]
+                if decimals is not None:
+                    chunk = chunk.round(decimals)
+                chunkActual = actual[start : start + chunkSize]
+                for column, classId in enumerate(columnIds):
+                    values, counts = countScores(chunk[:, column], chunkActual == classId)
+                    testScores.addScores(np.full(len(values), classId), values, counts)
+            self.__shards.add(shard, "test", fold, countPairs(predicted, actual, len(labelEncoder)))
+            self.__shards.add(shard, "scores", fold, testScores.scorePairs())
+        self.__updateLiveReport()
+
+    def addTrainingResults(self, trainingResults, trainingMetaData = None, predicted=None, fold=None):
         """
         Adds the training results. This is used to visualise the classification performance.
 
         Parameters
         ----------
-        trainingResults : list
-            a list containing all training results [[act,pred]]
+        trainingResults : list or array_like
+            a list containing all training results [[act,pred]], or the actual classes if predicted is given.
         trainingMetaData : dict
             a string to show training metadata
+        predicted : array_like
+            the predicted classes, same length as trainingResults.
+        fold : int or str
+            id of the fold, see addTestResults. The training metadata stays with the results of its fold.
         """
+        with self.__ingestion:
+            if predicted is None:
+                results = np.asarray(trainingResults).reshape(-1, 2)
+                actual, predicted = results[:, 0], results[:, 1]
+            else:
+                actual, predicted = np.asarray(trainingResults), np.asarray(predicted)
+                if not actual.shape == predicted.shape:
+                    raise ValueError("trainingResults and predicted must have the same length")
+            results = (int(np.count_nonzero(actual == predicted)), actual.size, trainingMetaData)
+            self.__shards.add(self.__shards.shard(), "trainingResults", fold, results)
+        self.__updateLiveReport()
+
+    def __encodeResults(self, results, predicted, labels, labelEncoder):
+        if predicted is None:
+            results = labelEncoder.encode(results).reshape(-1, 2)
+            return results[:, 0], results[:, 1]
+        actual, predicted = np.asarray(results), np.asarray(predicted)
+        if not actual.shape == predicted.shape:
+            raise ValueError("the actual and predicted classes must have the same length")
+        if labels is None:
+            return labelEncoder.encode(actual), labelEncoder.encode(predicted)
+        actual, predicted = checkClassCodes(actual, labels), checkClassCodes(predicted, labels)
+        classIds = labelEncoder.encode(np.asarray(labels, dtype=object))
+        if np.array_equal(classIds, np.arange(len(classIds))):
+            return actual, predicted
+        return classIds[actual], classIds[predicted]
+
+
+    def __collect(self):
+        # moves the results of the thread shards into the accumulators, returns whether there were any
+        with self.__lock:
+            records, taken = self.__shards.pending()
+            # the class names of the shards are encoded before anything is merged, so if that fails
+            # the records stay in the shards and the accumulators are unchanged
+            classIds = {}
+            for _, _, labelEncoder, _ in records:
+                if id(labelEncoder) not in classIds:
+                    classIds[id(labelEncoder)] = self.__labelEncoder.encode(
+                        np.asarray(labelEncoder.labels, dtype=object)
+                    )
+            for kind, fold, labelEncoder, data in records:
+                shardClassIds = classIds[id(labelEncoder)]
+                if kind == "scores":
+                    # the curves are computed over all folds, the scores are not kept per fold
+                    scoreClasses, scores, counts = data
+                    self.__testScores.addScores(shardClassIds[scoreClasses], scores, counts)
+                    continue
+                if fold is None:
+                    index = self.__foldCount(kind)
+                elif fold in self.__foldIndices:
+                    index = self.__foldIndices[fold]
+                else:
+                    # a fold id gets one index for all kinds, the kinds whose part has not arrived yet
+                    # are padded with empty folds when it does
+                    index = max(
+                        [self.__foldCount(name) for name in ["test", "trainingSet", "trainingResults"]]
+                        + [max(self.__foldIndices.values(), default=-1) + 1]
+                    )
+                    self.__foldIndices[fold] = index
+                self.__padFolds(kind, index + 1)
+                if kind == "test":
+                    predicted, actual, counts = data
+                    self.__testResults.addPairsToFold(index, shardClassIds[predicted], shardClassIds[actual], counts)
+                elif kind == "trainingSet":
+                    shardCounts, rows = data
+                    counts = np.zeros(len(self.__labelEncoder), dtype=np.int64)
+                    counts[shardClassIds[: len(shardCounts)]] = shardCounts
+                    self.__trainingSet.addCountsToFold(index, counts)
+                    if rows is not None:
+                        self.__trainingSetRows.append(rows)
+                else:
+                    correct, total, trainingMetaData = data
+                    self.__trainingResults[index][0] += correct
+                    self.__trainingResults[index][1] += total
+                    if trainingMetaData is not None:
+                        self.__trainingMetaData[index] = trainingMetaData
+            self.__shards.remove(taken)
+            if records:
+                self.__metrics = None
+            return bool(records)
+
+    def __foldCount(self, kind):
+        results = {"test": self.__testResults, "trainingSet": self.__trainingSet, "trainingResults": self.__trainingResults}
+        return len(results[kind])
+
+    def __padFolds(self, kind, folds):
+        # appends empty folds to the results of one kind until it has the given number of folds
+        empty = np.zeros(0, dtype=np.int64)
+        while self.__foldCount(kind) < folds:
+            if kind == "test":
+                self.__testResults.addFoldPairs(empty, empty, empty)
+            elif kind == "trainingSet":
+                self.__trainingSet.addFoldCounts(empty)
+            else:
+                self.__trainingResults.append([0, 0])
+                self.__trainingMetaData.append(None)
 
-        for case in trainingResults:
-            self.__trainingResults.append(case)
-        self.__trainingMetaData.append(trainingMetaData)
+    def getState(self):
+        """
+        Returns the accumulated results in a compact form that can be pickled, sent to another process
+        or written with saveState, and combined into another report with merge. The rows kept by
+        keepTrainingSet are not part of it.
+
+        Returns
+        -------
+        dict
+            'labels' : the class names, the position is the index used by the arrays.
+            'testMatrices' : (folds, classes, classes) confusion matrices of the test results, or with topClasses
+            'testPairs' : (cells, 4) fold, predicted class, actual class and count of the non zero cells and
+            'testFolds' : the number of folds.
+            'trainingCounts' : (folds, classes) number of samples per class of the training sets.
+            'trainingResults' : (folds, 2) number of correct and of all training results.
+            'trainingMetaData' : the training metadata of each fold.
+            'scoreClasses', 'scoreValues', 'scoreCounts' : only with addTestScores, the class, the score and the
+            number of positive and negative test samples of each distinct score, see ConfusionAccumulator.ScoreAccumulator.
+        """
+        with self.__lock:
+            self.__collect()
+            if self.__topClasses is None:
+                testResults = {"testMatrices": self.__testResults.foldMatrices()}
+            else:
+                testResults = {
+                    "testPairs": np.stack(self.__testResults.foldPairs(), axis=1),
+                    "testFolds": len(self.__testResults),
+                }
+            if len(self.__testScores):
+                scoreClasses, scores, counts = self.__testScores.scorePairs()
+                testResults.update({"scoreClasses": scoreClasses, "scoreValues": scores, "scoreCounts": counts})
+            return {
+                "labels": self.__labelEncoder.labels,
+                **testResults,
+                "trainingCounts": self.__trainingSet.foldCounts(),
+                "trainingResults": np.array(self.__trainingResults, dtype=np.int64).reshape(-1, 2),
+                "trainingMetaData": list(self.__trainingMetaData),
+            }
 
+    def saveState(self, file):
+        """
+        Writes the result of getState into a compressed npz file.
 
-    def __createMetrics(self, filepath,MetricsName):
+        Parameters
+        ----------
+        file : str or file
+            path or binary file object.
+        """
+        saveState(file, self.getState())
 
-        labels = []
+    def merge(self, *others):
+        """
+        Adds the folds of other reports, e.g. the partial reports of cross validation workers.
+        The folds are appended in the given order, all totals and averages are independent of it.
 
-        classesInData =""""""
-        dictOfDataSets = {}
-        fullDataSet =  {}
-        numberOfElements = 0
-        boxPlotData = []
-        if MetricsName == "Test":
-            for metric in self.__testResults:
-                labels = list({sample[0] for sample in metric})
-            numberOfElements = len(self.__testResults)
-            for metric in self.__testResults:
-                for sample in metric:
-                    if not sample[0] in fullDataSet.keys():
-                        fullDataSet[sample[0]] = []
-
-                    if not sample[0] in dictOfDataSets.keys():
-                        dictOfDataSets[sample[0]] = 1
-                    else:
-                        dictOfDataSets[sample[0]] += 1
-
-                for key in labels:
-                    if key in dictOfDataSets.keys():
-                        fullDataSet[key].append(dictOfDataSets[key])
-                    else:
-                        fullDataSet[key].append(0)
-                dictOfDataSets = {}
+        Parameters
+        ----------
+        others : ModelReport, dict, str or file
+            reports, results of getState, or files written by saveState.
 
-        else:
-            for metric in self.__trainingSet:
-                labels = list({sample[1] for sample in metric})
-            numberOfElements = len(self.__trainingSet)
-            for metric in self.__trainingSet:
-                for sample in metric:
-                    if not sample[1] in fullDataSet.keys():
-                        fullDataSet[sample[1]] = []
+        Returns
+        -------
+        ModelReport
+            this report.
+        """
+        with self.__ingestion, self.__lock:
+            self.__collect()
+            for other in others:
+                if isinstance(other, ModelReport):
+                    state = other.getState()
+                elif isinstance(other, dict):
+                    state = other
+                else:
+                    state = loadState(other)
+                classIds = self.__labelEncoder.encode(np.asarray(state["labels"], dtype=object))
+                numberOfClasses = len(self.__labelEncoder)
+                if "testPairs" in state:
+                    folds, predicted, actual, counts = np.asarray(state["testPairs"], dtype=np.int64).reshape(-1, 4).T
+                    testFolds = [folds == fold for fold in range(state["testFolds"])]
+                else:
+                    matrices = np.asarray(state["testMatrices"], dtype=np.int64)
+                    folds, predicted, actual = np.nonzero(matrices)
+                    counts = matrices[folds, predicted, actual]
+                    testFolds = [folds == fold for fold in range(len(matrices))]
+                for inFold in testFolds:
+                    self.__testResults.addFoldPairs(classIds[predicted[inFold]], classIds[actual[inFold]], counts[inFold])
+                if "scoreValues" in state:
+                    self.__testScores.addScores(
+                        classIds[np.asarray(state["scoreClasses"], dtype=np.int64)],
+                        state["scoreValues"],
+                        state["scoreCounts"],
+                    )
+                for counts in state["trainingCounts"]:
+                    fold = np.zeros(numberOfClasses, dtype=np.int64)
+                    fold[classIds] = counts
+                    self.__trainingSet.addFoldCounts(fold)
+                self.__trainingResults += [[int(correct), int(total)] for correct, total in state["trainingResults"]]
+                self.__trainingMetaData += list(state["trainingMetaData"])
+            self.__metrics = None
+        self.__updateLiveReport()
+        return self
+
+    def startLiveReport(self, fileName="LiveReport", interval=30.0, renderProfile="draft"):
+        """
+        Writes a lightweight html snapshot of the report while the folds are added: the pooled metrics,
+        tables per class and per fold, the F1-Score by split and the confusion matrices. After an add call
+        the snapshot is rewritten if interval seconds have passed, charts whose data did not change are not
+        rendered again. The page reloads itself, so it can be watched in a browser during a long run.
 
-                    if not sample[1] in dictOfDataSets.keys():
-                        dictOfDataSets[sample[1]] = 1
-                    else:
-                        dictOfDataSets[sample[1]] += 1
+        Parameters
+        ----------
+        fileName : str
+            the name of the snapshot, '.html' is appended. The charts are written to fileName_files.
+        interval : float
+            minimum number of seconds between two snapshots.
+        renderProfile : str or dict
+            the render profile of the charts, see createRaport.
+
+        Returns
+        -------
+        LiveReport.LiveReport
+            the live report, e.g. to read the number of snapshots written.
+        """
+        self.__live = LiveReport(fileName, interval, renderProfile)
+        self.__updateLiveReport()
+        return self.__live
 
-                for key in labels:
-                    if key in dictOfDataSets.keys():
-                        fullDataSet[key].append(dictOfDataSets[key])
-                    else:
-                        fullDataSet[key].append(0)
-                dictOfDataSets = {}
+    def updateLiveReport(self):
+        """
+        Writes the live snapshot now, also if the interval has not passed yet.
 
+        Returns
+        -------
+        bool
+            whether a snapshot was written, False without startLiveReport or before the first test results.
+        """
+        if self.__live is None:
+            return False
+        return self.__live.update(self.__liveSnapshot, force=True)
 
+    def stopLiveReport(self):
+        """
+        Writes a last snapshot with all folds and stops updating it.
+        """
+        self.updateLiveReport()
+        self.__live = None
 
-        for key in fullDataSet.keys():
-            sum = 0
+    def __updateLiveReport(self):
+        live = self.__live
+        if live is not None and live.due():
+            live.update(self.__liveSnapshot)
 
-            for num in fullDataSet[key]:
-                sum += num
-            dictOfDataSets[key] = sum / numberOfElements
+    def __liveSnapshot(self):
+        metrics = self.__reportView(self.__computeMetrics())
+        if len(metrics["foldAccuracy"]) == 0:
+            return None
+        return self.__modelName, metrics, self.__createCharts(metrics)
 
-        listOfSortedData = []
-        for key in dictOfDataSets.keys():
+    def computeMetrics(self):
+        """
+        Computes all numbers shown in the report without rendering anything. The result is cached
+        until new data is added and must not be modified.
+
+        Returns
+        -------
+        dict
+            'labels' : the class names in report order, this is the order of all per class arrays.
+            The declared classes first, then the training classes by their average number of samples,
+            then the classes only contained in the test results, then the classes that are only predicted
+            by their number of predictions.
+            'confusionMatrix' : the confusion matrix pooled over the folds, rows are the predicted classes.
+            All entries of Metrics.computeClassificationMetricsFromCounts for the test results.
+            'confusionLabels' : the classes of the rows and columns of 'confusionMatrix'. With topClasses
+            the matrix only contains the classes with the most test samples and an 'Other' bucket.
+            'topConfusions' : only with topClasses, dict with the 'predicted' and 'actual' class and the 'count'
+            of the most frequent confusions.
+            'scoreCurves' : only with addTestScores, dict with the one-vs-rest curves of the classes with scores,
+                'labels' the classes in report order, 'rocAuc' and 'averagePrecision' (classes,) the areas,
+                'macroAverage' dict with the mean of both areas over the classes where they are defined,
+                'falsePositiveRate', 'truePositiveRate', 'recall', 'precision' (classes, points) the curves,
+                see Metrics.scoreCurves.
+            'trainingAccuracy' : accuracy over all training results.
+            'trainingSet', 'testSet' : dicts describing the datasets:
+                'labels' the classes contained in the dataset sorted by their average number of samples,
+                'averageSamples' the average number of samples per fold of these classes,
+                'samplesPerFold' (folds, classes) number of samples of these classes in each fold.
+        """
+        return self.__computeMetrics()
+
+    def __computeMetrics(self, profile=None):
+        with self.__lock:
+            self.__collect()
+            return self.__computeCachedMetrics(profile)
+
+    def __computeCachedMetrics(self, profile):
+        if self.__metrics is None:
+            with profileStage(profile, "training set"):
+                trainingSet = self.__summariseDataset("Training")
+            with profileStage(profile, "test set"):
+                testSet = self.__summariseDataset("Test")
+            labels = trainingSet["labels"] + [key for key in testSet["labels"] if key not in trainingSet["labels"]]
+            # classes that are only ever predicted, so the confusion matrix holds all test results
+            predictedPerClass = self.__testResults.foldSummaries()[1].sum(axis=0)
+            encoderLabels, known = self.__labelEncoder.labels, set(labels)
+            labels += [
+                encoderLabels[i] for i in np.argsort(-predictedPerClass, kind="stable")
+                if predictedPerClass[i] and encoderLabels[i] not in known
+            ]
+            if self.__classes:
+                declared = set(self.__classes)
+                labels = self.__classes + [key for key in labels if key not in declared]
+
+            classIds = self.__labelEncoder.encode(np.asarray(labels, dtype=object))
+            with profileStage(profile, "confusion matrices"):
+                if self.__topClasses is None:
+                    # the per class counts of each fold are kept up to date while folds are added,
+                    # so the metrics do not go over the (folds, classes, classes) matrices
+                    truePositives, predictedPerClass, actualPerClass = self.__testResults.foldSummaries()
+                    testMetrics = {
+                        "confusionMatrix": self.__testResults.total()[classIds[:, None], classIds],
+                        **computeClassificationMetricsFromCounts(
+                            truePositives[:, classIds], predictedPerClass[:, classIds], actualPerClass[:, classIds]
+                        ),
+                        "confusionLabels": labels,
+                    }
+                else:
+                    testMetrics = self.__computeTopClassMetrics(labels, classIds)
+            if len(self.__testScores):
+                with profileStage(profile, "score curves"):
+                    testMetrics["scoreCurves"] = self.__computeScoreCurves(labels, classIds)
+
+            totalCorrectTrainingCases = sum(correct for correct, _ in self.__trainingResults)
+            totalTrainingCases = max(sum(total for _, total in self.__trainingResults), 1)
+
+            self.__metrics = {
+                "labels": labels,
+                **testMetrics,
+                "trainingAccuracy": totalCorrectTrainingCases / totalTrainingCases,
+                "trainingSet": trainingSet,
+                "testSet": testSet,
+            }
+        return self.__metrics
 
-            listOfSortedData.append([dictOfDataSets[key], key])
-        listOfSortedData = sorted(
-            listOfSortedData, key=lambda x: x[0], reverse=True
+    def __computeTopClassMetrics(self, labels, classIds):
+        truePositives, predictedPerClass, actualPerClass = self.__testResults.foldSummaries()
+        metrics = computeClassificationMetricsFromCounts(
+            truePositives[:, classIds], predictedPerClass[:, classIds], actualPerClass[:, classIds]
         )
-        labels = []
-        sizes = []
-        explode = []
-        color = [
-            "#F06060",
-            "#F2DD64",
-            "#F3B562",
-            "#F2EBBF",
-            "#8CBEB2",
-            "#586473",
-            "#5C4B51",
-            "#4A89AA",
+        # the labels contain every actual and predicted class of the test results
+        reportIndex = np.full(len(self.__labelEncoder), -1, dtype=np.int64)
+        reportIndex[classIds] = np.arange(len(labels))
+        predicted, actual, counts = self.__testResults.pairs()
+        predicted, actual = reportIndex[predicted], reportIndex[actual]
+
+        shownClasses = topClassIndices(metrics["support"], self.__topClasses)
+        confusionLabels = [labels[i] for i in shownClasses]
+        if len(shownClasses) < len(labels):
+            confusionLabels.append("Other")
+        pairPredicted, pairActual, pairCounts = topConfusions(predicted, actual, counts, self.__topClasses)
+        return {
+            "confusionMatrix": topConfusionMatrix(predicted, actual, counts, shownClasses, len(labels)),
+            **metrics,
+            "confusionLabels": confusionLabels,
+            "topConfusions": {
+                "predicted": [labels[i] for i in pairPredicted],
+                "actual": [labels[i] for i in pairActual],
+                "count": pairCounts,
+            },
+        }
+
+    def __computeScoreCurves(self, labels, classIds, points=200):
+        scored = set(self.__testScores.classIds())
+        curves = [
+            (label, scoreCurves(*self.__testScores.classScores(int(classId)), points))
+            for label, classId in zip(labels, classIds)
+            if classId in scored
         ]
-        colorData = []
-        for data, i in zip(
-                listOfSortedData, range(len(listOfSortedData))
-        ):
-            classesInData += f"""<tr>
-                        <th class="TrainingDataClasses">{data[1]}</th>
-                        <th>{int(data[0])}</th> 
-                    </tr>\n"""
-            sizes.append(data[0])
-            labels.append(data[1])
-            explode.append(0)
-            if MetricsName == "Training":
-                self.__classToColor[data[1]] = color[i % len(color)]
-            colorData.append(self.__classToColor[data[1]])
-        plt.pie(
-            sizes,
-            explode=explode,
-            labels=labels,
-            autopct="%1.1f%%",
-            shadow=False,
-            startangle=0,
-            colors=colorData,
-        )
-        plt.savefig(
-            filepath.replace("file://", '') + f"/PieChart{MetricsName}Data.svg",
-            format="svg")
-        plt.close()
-
-        for key in labels:
-            boxPlotData.append(fullDataSet[key])
-        labels.insert(0,"")
-        y_pos = np.arange(len(labels))
-        for data,i in zip(boxPlotData, range(len(boxPlotData))):
-            plt.boxplot(data,positions=[i+1], patch_artist=True,boxprops=dict(facecolor=self.__classToColor[labels[i+1]]))
-        plt.xticks(y_pos, labels, rotation=90)
-        plt.subplots_adjust(bottom=0.3, top=0.99)
-        plt.ylabel("Sampels")
-        plt.savefig(filepath.replace("file://",'') + f"/BarChart{MetricsName}Data.png",dpi=600, format="png")
-        plt.close()
-        labels = labels[1:]
 
-        if MetricsName == "Test":
-            folds = list(range(len(fullDataSet[list(fullDataSet.keys())[0]])))
-            plt.figure(figsize=(17, 5))
-            listOfKeys = list(fullDataSet.keys())
-            plt.bar(folds, fullDataSet[listOfKeys[0]], color=self.__classToColor[listOfKeys[0]])
-            for i in range(len(listOfKeys)-1):
+        def macroAverage(areas):
+            defined = areas[~np.isnan(areas)]
+            return float(defined.mean()) if len(defined) else np.nan
+
+        areas = {
+            key: np.array([curve[key] for _, curve in curves], dtype=np.float64)
+            for key in ["rocAuc", "averagePrecision"]
+        }
+        return {
+            "labels": [label for label, _ in curves],
+            **areas,
+            "macroAverage": {key: macroAverage(values) for key, values in areas.items()},
+            **{
+                key: np.array([curve[key] for _, curve in curves], dtype=np.float64).reshape(len(curves), points)
+                for key in ["falsePositiveRate", "truePositiveRate", "recall", "precision"]
+            },
+        }
+
+    def computeConfidenceIntervals(self, replicates=1000, confidence=0.95, resample="samples", seed=None):
+        """
+        Computes bootstrap confidence intervals of the test metrics. The replicates are drawn from the
+        counts of the confusion matrices, all of them at once with numpy.
 
-                bottom = np.array(fullDataSet[listOfKeys[0]])
-                for m in range(i):
-                    bottom += np.array(fullDataSet[listOfKeys[m+1]])
-                plt.bar(folds, fullDataSet[listOfKeys[i+1]], bottom=bottom,color=self.__classToColor[listOfKeys[i+1]])
-            plt.legend(listOfKeys)
-            plt.savefig(filepath.replace("file://",'') + f"/BarChartOverviewData.svg",format="svg")
-            plt.close()
-        return (classesInData,labels)
+        Parameters
+        ----------
+        replicates : int
+            number of bootstrap replicates.
+        confidence : float
+            the confidence level of the intervals.
+        resample : str
+            'samples' draws the pooled test results with replacement, a multinomial draw over the cells
+            of the confusion matrix per replicate. 'folds' draws whole folds with replacement, which also
+            covers the variation between the folds but needs enough folds.
+        seed : int
+            seed of the random draws, None for a different result on every call.
+
+        Returns
+        -------
+        dict
+            'labels' : the classes in the order of computeMetrics.
+            'precision', 'recall', 'fScore' : (2, classes) lower and upper bound of each class.
+            'accuracy' : (2,) lower and upper bound.
+            'macroAverage', 'weightedAverage' : dicts with the (2,) bounds of 'precision', 'recall' and 'fScore'.
+            'replicates', 'confidence', 'resample' : the arguments.
+        """
+        with self.__lock:
+            labels = self.__computeMetrics()["labels"]
+            classIds = self.__labelEncoder.encode(np.asarray(labels, dtype=object))
+            if resample == "samples":
+                # the labels contain every actual and predicted class, so no result is left out of the draws
+                reportIndex = np.full(len(self.__labelEncoder), -1, dtype=np.int64)
+                reportIndex[classIds] = np.arange(len(labels))
+                predicted, actual, counts = self.__testResults.pairs()
+                counts = bootstrapSamples(
+                    reportIndex[predicted], reportIndex[actual], counts, len(labels), replicates, seed
+                )
+            elif resample == "folds":
+                counts = bootstrapFolds(
+                    *(perClass[:, classIds] for perClass in self.__testResults.foldSummaries()), replicates, seed
+                )
+            else:
+                raise ValueError(f"Unknown resampling '{resample}', use 'samples' or 'folds'")
+        return {
+            "labels": labels,
+            **bootstrapConfidenceIntervals(*counts, confidence),
+            "replicates": replicates,
+            "confidence": confidence,
+            "resample": resample,
+        }
 
+    def __reportMetrics(self, profile, confidenceIntervals, view=True):
+        # the metrics of a report with the optional confidence intervals, reduced to the shown classes by view
+        metrics = self.__computeMetrics(profile)
+        if confidenceIntervals:
+            arguments = confidenceIntervals if isinstance(confidenceIntervals, dict) else {}
+            with profileStage(profile, "confidence intervals"):
+                metrics = {**metrics, "confidenceIntervals": self.computeConfidenceIntervals(**arguments)}
+        return self.__reportView(metrics) if view else metrics
+
+    def __reportView(self, metrics):
+        # the numbers shown in the report, with topClasses reduced to the classes with the most test samples
+        if self.__topClasses is None:
+            return metrics
+        shownClasses = topClassIndices(metrics["support"], self.__topClasses)
+        view = dict(metrics)
+        view["labels"] = [metrics["labels"][i] for i in shownClasses]
+        for key in ["precision", "recall", "fScore", "support"]:
+            view[key] = metrics[key][shownClasses]
+        for key in ["foldPrecision", "foldRecall", "foldFScore"]:
+            view[key] = metrics[key][:, shownClasses]
+        if "confidenceIntervals" in metrics:
+            intervals = dict(metrics["confidenceIntervals"])
+            intervals["labels"] = view["labels"]
+            for key in ["precision", "recall", "fScore"]:
+                intervals[key] = intervals[key][:, shownClasses]
+            view["confidenceIntervals"] = intervals
+        if "scoreCurves" in metrics:
+            curves = metrics["scoreCurves"]
+            shownLabels = set(view["labels"])
+            shown = [i for i, key in enumerate(curves["labels"]) if key in shownLabels]
+            view["scoreCurves"] = {
+                **curves,
+                "labels": [curves["labels"][i] for i in shown],
+                **{
+                    key: curves[key][shown]
+                    for key in ["rocAuc", "averagePrecision", "falsePositiveRate", "truePositiveRate", "recall", "precision"]
+                },
+            }
+        for key in ["trainingSet", "testSet"]:
+            dataset = metrics[key]
+            if len(dataset["labels"]) > self.__topClasses:
+                shown, other = slice(None, self.__topClasses), slice(self.__topClasses, None)
+                view[key] = {
+                    "labels": dataset["labels"][shown] + ["Other"],
+                    "averageSamples": np.append(
+                        dataset["averageSamples"][shown], dataset["averageSamples"][other].sum()
+                    ),
+                    "samplesPerFold": np.column_stack(
+                        [dataset["samplesPerFold"][:, shown], dataset["samplesPerFold"][:, other].sum(axis=1)]
+                    ),
+                }
+        return view
+
+    def __summariseDataset(self, MetricsName):
+        if MetricsName == "Test":
+            samplesPerFold = self.__testResults.foldSummaries()[2]
+        else:
+            samplesPerFold = self.__trainingSet.foldCounts()
+        averageSamples = samplesPerFold.mean(axis=0) if len(samplesPerFold) else np.zeros(samplesPerFold.shape[1])
+        present = np.flatnonzero(samplesPerFold.sum(axis=0))
+        order = present[np.argsort(-averageSamples[present], kind="stable")]
+        labels = self.__labelEncoder.labels
+        return {
+            "labels": [labels[i] for i in order],
+            "averageSamples": averageSamples[order],
+            "samplesPerFold": samplesPerFold[:, order],
+        }
 
-    def createRaport(self, fileName="ModelRaport",htmlDebug = False):
+    def __createMetrics(self, dataset):
+        classesInData = """"""
+        for key, averageSamples in zip(dataset["labels"], dataset["averageSamples"]):
+            classesInData += f"""<tr>
+                        <th class="TrainingDataClasses">{key}</th>
+                        <th>{int(averageSamples)}</th> 
+                    </tr>\n"""
+        return classesInData
+
+    def __createDatasetCharts(self, MetricsName, dataset):
+        labels = dataset["labels"]
+        samplesPerFold = list(dataset["samplesPerFold"].T)
+        charts = [
+            Chart(
+                f"PieChart{MetricsName}Data",
+                drawPieChart,
+                vector=True,
+                sizes=list(dataset["averageSamples"]),
+                labels=labels,
+                colors=[self.__classToColor[key] for key in labels],
+            ),
+            Chart(
+                f"BarChart{MetricsName}Data",
+                drawBoxPlot,
+                data=samplesPerFold,
+                labels=labels,
+                colors=[self.__classToColor[key] for key in labels],
+                yLabel="Sampels",
+            ),
+        ]
+        if MetricsName == "Test" and labels:
+            charts.append(
+                Chart(
+                    "BarChartOverviewData",
+                    drawStackedFoldBarChart,
+                    vector=True,
+                    figureSize=(17, 5),
+                    samplesPerFold=samplesPerFold,
+                    labels=labels,
+                    colors=[self.__classToColor[key] for key in labels],
+                )
+            )
+        return charts
+
+
+    def __createCharts(self, metrics):
+        labels = metrics["labels"]
+        colorLabels = list(dict.fromkeys(labels + metrics["trainingSet"]["labels"] + metrics["testSet"]["labels"]))
+        self.__classToColor = {key: classColors[i % len(classColors)] for i, key in enumerate(colorLabels)}
+        if self.__topClasses is not None:
+            self.__classToColor["Other"] = otherColor
+
+        confMatrix = metrics["confusionMatrix"]
+        regConfMatrix = safeDivide(confMatrix, confMatrix.sum(axis=0)) * 100
+        colors = [self.__classToColor[key] for key in labels]
+
+        charts = self.__createDatasetCharts("Training", metrics["trainingSet"])
+        charts += self.__createDatasetCharts("Test", metrics["testSet"])
+        charts += [
+            Chart(
+                "ConfusionMatrixPerformanceData",
+                drawConfusionMatrix,
+                figureSize=(10, 7),
+                matrix=confMatrix,
+                labels=metrics["confusionLabels"],
+            ),
+            Chart(
+                "RegConfusionMatrixPerformanceData",
+                drawConfusionMatrix,
+                figureSize=(10, 7),
+                matrix=regConfMatrix,
+                labels=metrics["confusionLabels"],
+            ),
+            Chart(
+                "BoxPlotPerformance",
+                drawBoxPlot,
+                data=list(metrics["foldFScore"].T),
+                labels=labels,
+                colors=colors,
+                yLabel="F1-Score",
+            ),
+            Chart(
+                "PlotFScore",
+                drawFScoreBySplit,
+                figureSize=(17, 5),
+                foldFScore=list(metrics["foldFScore"].T),
+                labels=labels,
+                colors=colors,
+            ),
+        ]
+        if "scoreCurves" in metrics:
+            curves = metrics["scoreCurves"]
+            curveColors = [self.__classToColor[key] for key in curves["labels"]]
+            charts += [
+                Chart(
+                    "RocCurves",
+                    drawCurves,
+                    x=curves["falsePositiveRate"],
+                    y=curves["truePositiveRate"],
+                    labels=[f"{key} ({formatArea(area)})" for key, area in zip(curves["labels"], curves["rocAuc"])],
+                    colors=curveColors,
+                    xLabel="False positive rate",
+                    yLabel="True positive rate",
+                    diagonal=True,
+                ),
+                Chart(
+                    "PrecisionRecallCurves",
+                    drawCurves,
+                    x=curves["recall"],
+                    y=curves["precision"],
+                    labels=[
+                        f"{key} ({formatArea(area)})" for key, area in zip(curves["labels"], curves["averagePrecision"])
+                    ],
+                    colors=curveColors,
+                    xLabel="Recall",
+                    yLabel="Precision",
+                ),
+            ]
+        return charts
+
+
+    def createRaport(
+        self,
+        fileName="ModelRaport",
+        htmlDebug = False,
+        renderWorkers = None,
+        renderProfile = "print",
+        embedFigures = False,
+        workingDirectory = None,
+        outputFormat = "pdf",
+        pdfBackend = "wkhtmltopdf",
+        chartCache = None,
+        profile = False,
+        profileHook = None,
+        profileTable = False,
+        confidenceIntervals = False
+    ):
         """
         Created the pdf report of the model
 
@@ -246,37 +999,287 @@ class ModelReport:
         ----------
         fileName : str
             the name of the pdf raport.
+        htmlDebug : bool
+            also writes the html of the report to fileName_debug.html and converts that file.
+        renderWorkers : int
+            number of processes used to render the charts concurrently, None renders them one after another.
+        renderProfile : str or dict
+            'draft', 'screen' or 'print' (full quality), or a dict with 'dpi', 'vector' and 'figureScale'.
+            See Charts.renderProfiles.
+        embedFigures : bool
+            renders the charts in memory and embeds them into the html as data URIs instead of
+            writing them to the working directory.
+        workingDirectory : str
+            folder for the chart files. By default every call uses its own temporary folder that is
+            removed afterwards, so several reports can be created concurrently from the same cwd.
+            A folder passed here is created if needed and kept.
+        outputFormat : str
+            'pdf' the report as pdf, 'html' the report as self-contained html file without running wkhtmltopdf,
+            'json' or 'npz' only the numbers of computeMetrics together with the report information,
+            nothing is rendered. The extension is appended to fileName.
+        pdfBackend : str
+            'wkhtmltopdf' converts the html of the report with pdfkit, 'matplotlib' lays the report out
+            in process with the pdf backend of matplotlib, which needs no wkhtmltopdf and keeps all charts vector.
+        chartCache : str or Charts.ChartCache
+            folder or cache the rendered charts are stored in, charts whose data did not change since an earlier
+            report are taken from there instead of being rendered again. Not used by the matplotlib pdf backend,
+            which draws the charts onto the pages.
+        profile : bool or str
+            True measures the wall and cpu time of every stage: the ingestion calls, the dataset summaries,
+            the confusion matrices, each chart, the html and the pdf conversion. 'memory' also measures the
+            peak memory allocation of each stage with tracemalloc, which makes rendering several times slower.
+        profileHook : function
+            called with a dict {'stage', 'wall', 'cpu', 'peakMemory', 'depth'} for every finished stage,
+            turns on profile.
+        profileTable : bool
+            adds a table with the stages finished before the report is laid out to the report, turns on profile.
+        confidenceIntervals : bool or dict
+            adds bootstrap confidence intervals to the precision, recall and F1-Score of the classes, the
+            accuracy and the averages. True uses the defaults of computeConfidenceIntervals, a dict is passed
+            to it as arguments. The exports get them as 'confidenceIntervals'.
+
+        Returns
+        -------
+        Profiler.Profile
+            the measured stages if profile is turned on, otherwise None.
         """
+        profile = self.__createProfile(profile, profileHook, profileTable)
+        if outputFormat in ("json", "npz"):
+            fileName += "." + outputFormat
+            save = saveJson if outputFormat == "json" else saveNpz
+            with profileStage(profile, "export"):
+                save(fileName, self.__reportMetrics(profile, confidenceIntervals, view=False), self.__reportInfo())
+        elif outputFormat == "html":
+            fileName += ".html"
+            with profileStage(profile, "html"):
+                htmlTemplate = self.createHtml(
+                    None, renderWorkers, renderProfile, chartCache, profile, profileTable, confidenceIntervals
+                )
+                with open(fileName, "w") as out:
+                    out.write(htmlTemplate)
+        elif not outputFormat == "pdf":
+            raise ValueError(f"Unknown output format '{outputFormat}', use 'pdf', 'html', 'json' or 'npz'")
+        elif pdfBackend == "matplotlib":
+            fileName += ".pdf"
+            with profileStage(profile, "pdf"):
+                metrics = self.__reportMetrics(profile, confidenceIntervals)
+                timings = profile.rows() if profileTable else None
+                writeReportPdf(fileName, self.__reportInfo(), metrics, self.__createCharts(metrics), timings)
+        elif not pdfBackend == "wkhtmltopdf":
+            raise ValueError(f"Unknown pdf backend '{pdfBackend}', use 'wkhtmltopdf' or 'matplotlib'")
+        else:
+            fileName += ".pdf"
+            self.__createPdf(
+                fileName, htmlDebug, renderWorkers, renderProfile, embedFigures, workingDirectory, chartCache,
+                profile, profileTable, confidenceIntervals
+            )
+        print(f"File created ->{os.path.abspath(fileName)}")
+        return profile
 
-        fileName += ".pdf"
+    async def createRaportAsync(
+        self,
+        fileName="ModelRaport",
+        htmlDebug = False,
+        renderWorkers = None,
+        renderProfile = "print",
+        embedFigures = False,
+        workingDirectory = None,
+        outputFormat = "pdf",
+        pdfBackend = "wkhtmltopdf",
+        chartCache = None,
+        profile = False,
+        profileHook = None,
+        profileTable = False,
+        confidenceIntervals = False,
+        executor = None,
+        limiter = None
+    ):
+        """
+        Creates the report like createRaport without blocking the event loop. The metrics, the charts and
+        the html are created in an executor, wkhtmltopdf runs as asyncio subprocess.
 
+        Cancelling the task kills a running wkhtmltopdf and removes the temporary chart folder. Work that
+        already runs in the executor cannot be interrupted, it finishes in the background and its result is
+        discarded; for the other output formats and the matplotlib backend the file may still be written.
 
-        config = None
-        if platform.system() == "Windows":
-            config = pdfkit.configuration(wkhtmltopdf="C:\\Program Files\\wkhtmltopdf\\bin\\wkhtmltopdf.exe")
-            file_path = "file://" + os.path.join(os.getcwd(), "temp").replace('C:','').replace('\\','/')
-        else:
-            file_path = os.path.join(os.getcwd(), "temp")
+        Parameters
+        ----------
+        fileName, htmlDebug, renderWorkers, renderProfile, embedFigures, workingDirectory, outputFormat,
+        pdfBackend, chartCache, profile, profileHook, profileTable, confidenceIntervals :
+            see createRaport.
+        executor : concurrent.futures.Executor
+            the executor the rendering runs in, None uses the default executor of the event loop.
+            It has to be a thread pool since it works on this report, use renderWorkers to render
+            the charts in processes.
+        limiter : asyncio.Semaphore
+            shared by the reports of a service to bound how many are created at the same time,
+            None does not limit them.
+
+        Returns
+        -------
+        Profiler.Profile
+            the measured stages if profile is turned on, otherwise None.
+        """
+        if limiter is None:
+            return await self.__createRaportAsync(
+                fileName, htmlDebug, renderWorkers, renderProfile, embedFigures, workingDirectory, outputFormat,
+                pdfBackend, chartCache, profile, profileHook, profileTable, confidenceIntervals, executor
+            )
+        async with limiter:
+            return await self.__createRaportAsync(
+                fileName, htmlDebug, renderWorkers, renderProfile, embedFigures, workingDirectory, outputFormat,
+                pdfBackend, chartCache, profile, profileHook, profileTable, confidenceIntervals, executor
+            )
 
+    async def __createRaportAsync(
+        self, fileName, htmlDebug, renderWorkers, renderProfile, embedFigures, workingDirectory, outputFormat,
+        pdfBackend, chartCache, profile, profileHook, profileTable, confidenceIntervals, executor
+    ):
+        import asyncio
+
+        loop = asyncio.get_running_loop()
+        if not (outputFormat == "pdf" and pdfBackend == "wkhtmltopdf"):
+            # nothing to convert, the whole report is created in the executor
+            return await loop.run_in_executor(
+                executor,
+                functools.partial(
+                    self.createRaport, fileName, htmlDebug, renderWorkers, renderProfile, embedFigures,
+                    workingDirectory, outputFormat, pdfBackend, chartCache, profile, profileHook, profileTable,
+                    confidenceIntervals
+                ),
+            )
+
+        profile = self.__createProfile(profile, profileHook, profileTable)
+        fileName += ".pdf"
+        directory = self.__chartDirectory(embedFigures, workingDirectory)
+        rendering = loop.run_in_executor(
+            executor,
+            functools.partial(
+                self.__writeHtml, fileName, htmlDebug, directory, renderWorkers, renderProfile, chartCache,
+                profile, profileTable, confidenceIntervals
+            ),
+        )
         try:
-            if platform.system() == "Windows":
-                if not os.path.exists(file_path.replace("file://", "C:")):
-                    os.mkdir(file_path.replace("file://", "C:"))
-            else:
-                if not os.path.exists(file_path):
-                    os.mkdir(file_path)
-        except:
-            print("Could not create folder!")
-
-        options = {
-            "page-size": "A4",
-            "margin-top": "5mm",
-            "margin-right": "5mm",
-            "margin-bottom": "5mm",
-            "margin-left": "5mm",
-            "encoding": "UTF-8",
-            "enable-local-file-access": True,
+            # shielded so that a cancelled report still waits for the rendering before removing its folder
+            htmlTemplate, debugFileName = await asyncio.shield(rendering)
+            with profileStage(profile, "pdf"):
+                if htmlDebug:
+                    await htmlFileToPdfAsync(debugFileName, fileName)
+                else:
+                    await htmlToPdfAsync(htmlTemplate, fileName)
+        finally:
+            if workingDirectory is None and directory is not None:
+                rendering.add_done_callback(functools.partial(removeRenderingDirectory, directory))
+        print(f"File created ->{os.path.abspath(fileName)}")
+        return profile
+
+    def __createProfile(self, profile, profileHook, profileTable):
+        if profile or profileHook is not None or profileTable:
+            profile = Profile(profileHook, traceMemory=profile == "memory")
+            profile.record("ingestion", self.__ingestion.wall, self.__ingestion.cpu)
+            return profile
+        return None
+
+    def __chartDirectory(self, embedFigures, workingDirectory):
+        if embedFigures:
+            return None
+        if workingDirectory is not None:
+            os.makedirs(workingDirectory, exist_ok=True)
+            return workingDirectory
+        return tempfile.mkdtemp(prefix="ModelReport")
+
+    def __writeHtml(
+        self, fileName, htmlDebug, directory, renderWorkers, renderProfile, chartCache, profile, profileTable,
+        confidenceIntervals
+    ):
+        with profileStage(profile, "html"):
+            htmlTemplate = self.createHtml(
+                directory, renderWorkers, renderProfile, chartCache, profile, profileTable, confidenceIntervals
+            )
+        if not htmlDebug:
+            return htmlTemplate, None
+        print(htmlTemplate)
+        debugFileName = fileName[: -len(".pdf")] + "_debug.html"
+        with open(debugFileName,'w') as out:
+            out.write(htmlTemplate)
+        return htmlTemplate, debugFileName
+
+    def __createPdf(
+        self, fileName, htmlDebug, renderWorkers, renderProfile, embedFigures, workingDirectory, chartCache,
+        profile, profileTable, confidenceIntervals
+    ):
+        directory = self.__chartDirectory(embedFigures, workingDirectory)
+        try:
+            htmlTemplate, debugFileName = self.__writeHtml(
+                fileName, htmlDebug, directory, renderWorkers, renderProfile, chartCache, profile, profileTable,
+                confidenceIntervals
+            )
+            with profileStage(profile, "pdf"):
+                if htmlDebug:
+                    htmlFileToPdf(debugFileName, fileName)
+                else:
+                    htmlToPdf(htmlTemplate, fileName)
+        finally:
+            if workingDirectory is None and directory is not None:
+                shutil.rmtree(directory, ignore_errors=True)
+
+    def __reportInfo(self):
+        return {
+            "modelName": self.__modelName,
+            "creatorName": self.__creatorName,
+            "date": self.__date,
+            "MLPrinciple": self.__MLPrinciple,
+            "references": self.__dictOfReferences,
+            "algoDescription": self.__algoDescription,
+            "descriptionGraphicPath": self.__descriptionGraphicPath,
+            "graphicDescription": self.__graphicDescription,
+            "datafile": self.__datafile,
+            "randomSplitSeed": self.__randomSplitSeed,
+            "trainingMetaData": self.__trainingMetaData,
         }
+
+    def createHtml(
+        self,
+        workingDirectory=None,
+        renderWorkers=None,
+        renderProfile="print",
+        chartCache=None,
+        profile=None,
+        profileTable=False,
+        confidenceIntervals=False
+    ):
+        """
+        Creates the html of the report without converting it to pdf.
+
+        Parameters
+        ----------
+        workingDirectory : str
+            existing folder the charts are written to and referenced from, None embeds the
+            charts into the html as data URIs.
+        renderWorkers : int
+            number of processes used to render the charts concurrently, None renders them one after another.
+        renderProfile : str or dict
+            the render profile of the charts, see createRaport.
+        chartCache : str or Charts.ChartCache
+            the cache of rendered charts, see createRaport.
+        profile : Profiler.Profile
+            records the stages of the html.
+        profileTable : bool
+            adds a table with the finished stages of profile to the report.
+        confidenceIntervals : bool or dict
+            adds bootstrap confidence intervals to the performance table, see createRaport.
+
+        Returns
+        -------
+        str
+            the html document.
+        """
+        file_path = None
+        if workingDirectory is not None:
+            file_path = os.path.abspath(workingDirectory)
+            if platform.system() == "Windows":
+                file_path = "file://" + file_path.replace('C:','').replace('\\','/')
+
         referencesInHTML = ""
         for name in self.__dictOfReferences.keys():
             referencesInHTML += (
@@ -285,188 +1288,141 @@ class ModelReport:
 
 
 
-        classesInTrainingData, labels = self.__createMetrics(file_path,"Training")
-        classesInTestData, labelsTest = self.__createMetrics(file_path,"Test")
-
-
-
-        totalConfusionMatrix = {key: {subkey: 0 for subkey in labels} for key in labels}
-        listOfIndivitualConfusionsMatrixes = []
-        performanceData = {key: {"precision": 0, "recall": 0, "fScore": 0,"N":0} for key in labels}
-        totalCorrectClassified = 0
-        alltestCases = 0
-        for testFrame in self.__testResults:
-            individConfMatrix = {key: {subkey: 0 for subkey in labels} for key in labels}
-            for sample in testFrame:
-                if sample[1] == sample[0]:
-                    totalCorrectClassified += 1
-                alltestCases += 1
-                performanceData[sample[0]]["N"] += 1
-                totalConfusionMatrix[sample[1]][sample[0]] += 1
-                individConfMatrix[sample[1]][sample[0]] += 1
-            listOfIndivitualConfusionsMatrixes.append(individConfMatrix)
-
-        confMatrix = []
-        regConfMatrix = []
-        numberOfElementsInMatrix = {key : 0 for key in totalConfusionMatrix.keys()}
-        for key in totalConfusionMatrix.keys():
-            for subkey in totalConfusionMatrix[key].keys():
-                numberOfElementsInMatrix[key] += totalConfusionMatrix[subkey][key]
-        for key in totalConfusionMatrix.keys():
-            line = []
-            line2 = []
-            for subkey in totalConfusionMatrix[key].keys():
-                line.append(totalConfusionMatrix[key][subkey])
-                if not numberOfElementsInMatrix[subkey] == 0:
-                    line2.append((totalConfusionMatrix[key][subkey]/numberOfElementsInMatrix[subkey])*100)
-                else:
-                    line2.append(0)
-            confMatrix.append(line)
-            regConfMatrix.append(line2)
-        df_cm = pd.DataFrame(
-            confMatrix,
-            index=[i + " (pre)" for i in totalConfusionMatrix.keys()],
-            columns=[i + " (act)" for i in totalConfusionMatrix.keys()],
-        )
+        metrics = self.__reportMetrics(profile, confidenceIntervals)
+        intervals = metrics.get("confidenceIntervals")
+        labels = metrics["labels"]
+        classesInTrainingData = self.__createMetrics(metrics["trainingSet"])
+        classesInTestData = self.__createMetrics(metrics["testSet"])
+        charts = self.__createCharts(metrics)
+        if isinstance(chartCache, str):
+            chartCache = ChartCache(chartCache)
+        with profileStage(profile, "charts"):
+            if workingDirectory is None:
+                renderedCharts = renderCharts(charts, None, renderWorkers, renderProfile, chartCache, profile)
+                images = {chart.name: toDataUri(chart, content) for chart, content in zip(charts, renderedCharts)}
+                descriptionGraphic = fileToDataUri(self.__descriptionGraphicPath)
+            else:
+                renderCharts(charts, workingDirectory, renderWorkers, renderProfile, chartCache, profile)
+                images = {chart.name: f"{file_path}/{chart.fileName}" for chart in charts}
+                descriptionGraphic = self.__descriptionGraphicPath
 
-        df_refcm =pd.DataFrame(
-            regConfMatrix,
-            index=[i + " (pre)" for i in totalConfusionMatrix.keys()],
-            columns=[i + " (act)" for i in totalConfusionMatrix.keys()],
-        )
-        plt.figure(figsize=(10, 7))
-        sn.heatmap(df_cm, annot=True)
-        plt.subplots_adjust(bottom=0.3, top=0.99, left=0.2, right=0.99)
-        plt.savefig(file_path.replace("file://",'') + "/ConfusionMatrixPerformanceData.png",dpi=600, format="png")
-        plt.close()
-
-        plt.figure(figsize=(10, 7))
-        sn.heatmap(df_refcm, annot=True)
-        plt.subplots_adjust(bottom=0.3, top=0.99, left=0.2, right=0.99)
-        plt.savefig(file_path.replace("file://",
-                                      '') + "/RegConfusionMatrixPerformanceData.png",
-                    dpi=600, format="png")
-        plt.close()
-
-        for key in totalConfusionMatrix.keys():
-            totalInRow = 0
-            totalInColumn = 0
-            for subkey in totalConfusionMatrix.keys():
-                totalInRow += totalConfusionMatrix[key][subkey]
-                totalInColumn += totalConfusionMatrix[subkey][key]
-            if totalInRow == 0:
-                totalInRow = 1
-            if totalInColumn == 0:
-                totalInColumn = 1
-            performanceData[key]["precision"] = totalConfusionMatrix[key][key] / totalInRow
-            performanceData[key]["recall"] = totalConfusionMatrix[key][key] / totalInColumn
-            try:
-                performanceData[key]["fScore"] = (
-                    2
-                    * performanceData[key]["precision"]
-                    * performanceData[key]["recall"]
-                ) / (performanceData[key]["precision"] + performanceData[key]["recall"])
-            except:
-                performanceData[key]["fScore"] = 0
-
-
-        fStatByKatAnSample = {key: [] for key in labels}
-        for frame in listOfIndivitualConfusionsMatrixes:
-            for key in frame.keys():
-                totalInRow = 0
-                totalInColumn = 0
-                for subkey in frame.keys():
-                    totalInRow += frame[key][subkey]
-                    totalInColumn += frame[subkey][key]
-                if totalInRow == 0:
-                    totalInRow = 1
-                if totalInColumn == 0:
-                    totalInColumn = 1
-                precision = frame[key][key] / totalInRow
-                recall= frame[key][key] /totalInColumn
-                try:
-                    fStatByKatAnSample[key].append((2*precision * recall) / (precision + recall))
-                except:
-                    fStatByKatAnSample[key].append(0)
-
-        listOfKeys = [""]
-        for key, i in zip(fStatByKatAnSample.keys(),range(len(list(fStatByKatAnSample.keys())))):
-            plt.boxplot(fStatByKatAnSample[key], positions=[i + 1], patch_artist=True,boxprops=dict(facecolor=self.__classToColor[key]))
-            listOfKeys.append(key)
-        plt.xticks(np.arange(len(listOfKeys)), listOfKeys, rotation=90)
-        plt.subplots_adjust(bottom=0.3, top=0.99)
-        plt.ylabel("F1-Score")
-        plt.savefig(file_path.replace("file://",'') + f"/BoxPlotPerformance.png",dpi=600, format="png")
-        plt.close()
-
-        plt.figure(figsize=(17, 5))
-        for key, i in zip(fStatByKatAnSample.keys(),range(len(list(fStatByKatAnSample.keys())))):
-            plt.plot(list(range(len(fStatByKatAnSample[key]))),np.array(fStatByKatAnSample[key])*100,color= self.__classToColor[key])
-        plt.ylabel("F1Score (%)")
-        plt.xlabel("Splits")
-        plt.grid(which='minor', color='#EEEEEE', linestyle=':', linewidth=1)
-        plt.grid(which='major', color='#DDDDDD', linewidth=1.2)
-        plt.minorticks_on()
-        plt.legend(listOfKeys[1:])
-        plt.savefig(file_path.replace("file://",'') + f"/PlotFScore.png",dpi=600, format="png")
-        plt.close()
-
-
-        accuracy = totalCorrectClassified/alltestCases
-        macroAverage = {"precision": 0,"recall":0, "fScore":0}
-        weightedAverage = {"precision": 0, "recall": 0, "fScore": 0}
-        for scoreType in list(performanceData[list(performanceData.keys())[0]].keys())[:-1]:
-            sumMacroAverage = 0
-            divMacroAverage = 0
-            sumWeightedAverage = 0
-            divWeightedAverage = 0
-            for key in performanceData.keys():
-                sumMacroAverage += performanceData[key][scoreType]
-                divMacroAverage += 1
-                sumWeightedAverage += performanceData[key][scoreType] * performanceData[key]["N"]
-                divWeightedAverage += performanceData[key]["N"]
-            macroAverage[scoreType] = sumMacroAverage/divMacroAverage
-            weightedAverage[scoreType] = sumWeightedAverage/divWeightedAverage
+        accuracy = metrics["accuracy"]
 
         classificationPerformanceTable = """"""
-        for key in performanceData.keys():
+        for i, key in enumerate(labels):
+            precision, recall, fScore = (
+                formatPercentage(metrics[name][i], None if intervals is None else intervals[name][:, i])
+                for name in ["precision", "recall", "fScore"]
+            )
             classificationPerformanceTable += f"""<tr>
                 <th class="TrainingDataClasses">{key}</th>
-                <th class="ImgCell">{performanceData[key]['precision']*100:.2f}%</th>
-                <th class="ImgCell">{performanceData[key]['recall']*100:.2f}%</th>
-                <th class="ImgCell">{performanceData[key]['fScore']*100:.2f}%</th>
+                <th class="ImgCell">{precision}</th>
+                <th class="ImgCell">{recall}</th>
+                <th class="ImgCell">{fScore}</th>
                 </tr>\n"""
 
         classificationPerformanceTable += f"""<tr>
                 <th class="HorizontalBar TrainingDataClasses Bold">Accuracy</th>
                 <th class="HorizontalBar ImgCell"></th>
                 <th class="HorizontalBar ImgCell"></th>
-                <th class="HorizontalBar ImgCell">{accuracy*100:.2f}%</th>
+                <th class="HorizontalBar ImgCell">{formatPercentage(accuracy, intervals and intervals["accuracy"])}</th>
                 </tr>\n"""
 
-        classificationPerformanceTable += f"""<tr>
-                <th class="TrainingDataClasses Bold">Macro Average</th>
-                <th class="ImgCell">{macroAverage['precision']*100:.2f}%</th>
-                <th class="ImgCell">{macroAverage['recall']*100:.2f}%</th>
-                <th class="ImgCell">{macroAverage['fScore']*100:.2f}%</th>
+        for name, average in [("Macro Average", "macroAverage"), ("Weighted Average", "weightedAverage")]:
+            precision, recall, fScore = (
+                formatPercentage(metrics[average][key], intervals and intervals[average][key])
+                for key in ["precision", "recall", "fScore"]
+            )
+            classificationPerformanceTable += f"""<tr>
+                <th class="TrainingDataClasses Bold">{name}</th>
+                <th class="ImgCell">{precision}</th>
+                <th class="ImgCell">{recall}</th>
+                <th class="ImgCell">{fScore}</th>
                 </tr>\n"""
 
-        classificationPerformanceTable += f"""<tr>
-                <th class="TrainingDataClasses Bold">Weighted Average</th>
-                <th class="ImgCell">{weightedAverage['precision']*100:.2f}%</th>
-                <th class="ImgCell">{weightedAverage['recall']*100:.2f}%</th>
-                <th class="ImgCell">{weightedAverage['fScore']*100:.2f}%</th>
+        topConfusionsTable = ""
+        if "topConfusions" in metrics:
+            topConfusions = metrics["topConfusions"]
+            for actual, predicted, count in zip(
+                topConfusions["actual"], topConfusions["predicted"], topConfusions["count"]
+            ):
+                topConfusionsTable += f"""<tr>
+                <th class="TrainingDataClasses">{actual}</th>
+                <th class="TrainingDataClasses">{predicted}</th>
+                <th class="ImgCell">{count}</th>
                 </tr>\n"""
+            topConfusionsTable = f"""<div class="ModelParametersDiv">
+                <h4>Most frequent confusions:</h4>
+                <table class="ClassificationPerformanceTable">
+                    <tr>
+                        <th class="tableHeader TrainingDataClasses">Actual</th>
+                        <th class="tableHeader TrainingDataClasses">Predicted</th>
+                        <th class="tableHeader">Count</th>
+                    </tr>
+                    {topConfusionsTable}
+                </table>
+            </div>"""
 
-        totalTrainingCases = 0
-        totalCorrectTrainingCases = 0
-        for case in self.__trainingResults:
-            totalTrainingCases += 1
-            if case[0] == case[1]:
-                totalCorrectTrainingCases += 1
-        if totalTrainingCases == 0:
-            totalTrainingCases = 1
-        trainingAccuracy = totalCorrectTrainingCases/totalTrainingCases
+        scoreCurvesHtml = ""
+        if "scoreCurves" in metrics:
+            curves = metrics["scoreCurves"]
+            for key, rocAuc, averagePrecision in zip(curves["labels"], curves["rocAuc"], curves["averagePrecision"]):
+                scoreCurvesHtml += f"""<tr>
+                <th class="TrainingDataClasses">{key}</th>
+                <th class="ImgCell">{formatArea(rocAuc)}</th>
+                <th class="ImgCell">{formatArea(averagePrecision)}</th>
+                </tr>\n"""
+            macroAverage = curves["macroAverage"]
+            scoreCurvesHtml += f"""<tr>
+                <th class="HorizontalBar TrainingDataClasses Bold">Macro Average</th>
+                <th class="HorizontalBar ImgCell">{formatArea(macroAverage["rocAuc"])}</th>
+                <th class="HorizontalBar ImgCell">{formatArea(macroAverage["averagePrecision"])}</th>
+                </tr>\n"""
+            scoreCurvesHtml = f"""<div class="PerformancePlots">
+                <div class="ROC">
+                    <h4 class="h4PerformacePlots">ROC:</h4>
+                    <img class=" svgImage" src="{images['RocCurves']}" alt="PlotSample">
+                </div>
+                <div class="ROC">
+                    <h4 class="h4PerformacePlots">Precision-Recall:</h4>
+                    <img class=" svgImage" src="{images['PrecisionRecallCurves']}" alt="PlotSample">
+                </div>
+            </div>
+            <div class="ModelParametersDiv">
+                <h4>Area under the curves:</h4>
+                <table class="ClassificationPerformanceTable">
+                    <tr>
+                        <th class="tableHeader TrainingDataClasses">Classes</th>
+                        <th class="tableHeader">ROC AUC</th>
+                        <th class="tableHeader">Average Precision</th>
+                    </tr>
+                    {scoreCurvesHtml}
+                </table>
+            </div>"""
+
+        profileHtml = ""
+        if profileTable and profile is not None:
+            for row in profile.rows():
+                profileHtml += f"""<tr>
+                <th class="SplitInfoTable">{row[0].replace("  ", "&nbsp;&nbsp;")}</th>
+                <th class="ImgCell">{row[1]}</th>
+                <th class="ImgCell">{row[2]}</th>
+                <th class="ImgCell">{row[3]}</th>
+                </tr>\n"""
+            profileHtml = f"""<div class="ModelParametersDiv">
+                <h4>Report timings:</h4>
+                <table class="ClassificationPerformanceTable">
+                    <tr>
+                        <th class="tableHeader TrainingDataClasses">Stage</th>
+                        <th class="tableHeader">Wall (ms)</th>
+                        <th class="tableHeader">CPU (ms)</th>
+                        <th class="tableHeader">Peak (MB)</th>
+                    </tr>
+                    {profileHtml}
+                </table>
+            </div>"""
+
+        trainingAccuracy = metrics["trainingAccuracy"]
 
         modelparams = ""
         if not self.__trainingMetaData == None:
@@ -483,7 +1439,7 @@ class ModelReport:
                             </tr>"""
 
 
-        self.__dataModelOverview = f"""
+        dataModelOverview = f"""
                 <table>
                     <tr>
                         <th class="SplitInfoTable Bold">Data:</th>
@@ -797,7 +1753,7 @@ class ModelReport:
         </div>
     
         <div class="RightOverview">
-            <img class="OverviewImg" src="{self.__descriptionGraphicPath}" alt="Overview Image">
+            <img class="OverviewImg" src="{descriptionGraphic}" alt="Overview Image">
             <h6>{self.__graphicDescription}</h6>
         </div>
     </div>
@@ -805,7 +1761,7 @@ class ModelReport:
     </hr>
     
     <h2>Metrics</h2>
-    <label>{self.__dataModelOverview}</label>
+    <label>{dataModelOverview}</label>
     <div class="TrainingDataset">
         <h4>Training Dataset</h4>
         <label class="infoLabel">(average)</label>
@@ -819,12 +1775,12 @@ class ModelReport:
             </table>
     
             <div class="PiChartTrainingData">
-                <img class="svgImage" src="{file_path}/PieChartTrainingData.svg" alt="PlotSample">
+                <img class="svgImage" src="{images['PieChartTrainingData']}" alt="PlotSample">
                 <label class="infoLabel">Average distribution of the samples</label>
             </div>
     
             <div class="BarChartTrainingData">
-                <img class="svgImage" src="{file_path}/BarChartTrainingData.png" alt="PlotSample">
+                <img class="svgImage" src="{images['BarChartTrainingData']}" alt="PlotSample">
                 <label class="infoLabel">Distribution of the samples contained in each test split</label>
             </div>
         </div>
@@ -843,19 +1799,19 @@ class ModelReport:
             </table>
     
             <div class="PiChartTrainingData">
-                <img class="svgImage" src="{file_path}/PieChartTestData.svg" alt="PlotSample">
+                <img class="svgImage" src="{images['PieChartTestData']}" alt="PlotSample">
                 <label class="infoLabel">Average distribution of the samples</label>
             </div>
     
             <div class="BarChartTrainingData">
-                <img class="svgImage" src="{file_path}/BarChartTestData.png" alt="PlotSample">
+                <img class="svgImage" src="{images['BarChartTestData']}" alt="PlotSample">
                 <label class="infoLabel">Distribution of the samples contained in each test split</label>
             </div>
         </div>
     </div>
     
     <div class="StackedGroupedBarChartDataSet">
-        <img class="svgImage" src="{file_path}/BarChartOverviewData.svg" alt="PlotSample">
+        <img class="svgImage" src="{images['BarChartOverviewData']}" alt="PlotSample">
         <label class="infoLabel">Detailed training split composition</label>
     </div>
 
@@ -874,23 +1830,25 @@ class ModelReport:
                     </table>
                 </div>
                 <div class="BarChartTrainingData">
-                    <img class="svgImage" src="{file_path}/BoxPlotPerformance.png" alt="PlotSample">
+                    <img class="svgImage" src="{images['BoxPlotPerformance']}" alt="PlotSample">
                     <label class="infoLabel">Distribution of the F1-Score</label>
                 </div>
             </div>
             <div class="PerformancePlots">
                 <div class="ConfusionMatrix">
                     <h4 class="h4PerformacePlots">ConfusionMatrix:</h4>
-                    <img class=" svgImage" src="{file_path}/ConfusionMatrixPerformanceData.png" alt="PlotSample">
+                    <img class=" svgImage" src="{images['ConfusionMatrixPerformanceData']}" alt="PlotSample">
                 </div>
                 <div class="ConfusionMatrix">
                     <h4 class="h4PerformacePlots">Normalised ConfusionMatrix:</h4>
-                    <img class=" svgImage" src="{file_path}/RegConfusionMatrixPerformanceData.png" alt="PlotSample">
+                    <img class=" svgImage" src="{images['RegConfusionMatrixPerformanceData']}" alt="PlotSample">
                 </div>
             </div>
+            {scoreCurvesHtml}
+            {topConfusionsTable}
             <div class="F1ScoreBySplit">
                 <h4>F1 Socre by split:</h4>
-                <img class="svgImage" src="{file_path}/PlotFScore.png" alt="PlotSample">
+                <img class="svgImage" src="{images['PlotFScore']}" alt="PlotSample">
                 <label class="infoLabel">F1-Score per split</label>
             </div>
             <div class ="ModelParametersDiv">
@@ -898,23 +1856,30 @@ class ModelReport:
                     {modelparams}
                 </table>
             </div>
+            {profileHtml}
             
             
         </div>
     </div>
     </html>"""
         )
-
-        if htmlDebug:
-            print(htmlTemplate)
-            with open("debugFile.html",'w') as out:
-                out.write(htmlTemplate)
-
-            pdfkit.from_file("debugFile.html",fileName, options=options, configuration=config)
-        else:
-            pdfkit.from_string(
-                htmlTemplate, fileName, options=options, configuration=config
-            )
-        self.__trainingSet = None
-        self.__testResults = None
-        print(f"File created ->{file_path.replace('/temp','/')+fileName}")
\ No newline at end of file
+        return htmlTemplate
+
+def checkClassCodes(codes, labels):
+    """
+    Returns the integer class codes as array, raises ValueError if a code has no name in labels.
+    """
+    codes = np.asarray(codes)
+    if codes.size and (codes.min() < 0 or codes.max() >= len(labels)):
+        raise ValueError(f"class codes must be between 0 and {len(labels) - 1}, the number of labels minus one")
+    return codes
+
+
+def removeRenderingDirectory(directory, rendering):
+    """
+    Removes the chart folder of an async report once its rendering finished.
+    """
+    if not rendering.cancelled():
+        # retrieves the exception of a cancelled report so asyncio does not log it as unhandled
+        rendering.exception()
+    shutil.rmtree(directory, ignore_errors=True)
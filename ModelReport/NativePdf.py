@@ -0,0 +1,244 @@
+import os
+import textwrap
+from .Metrics import formatArea, formatPercentage
+
+
+pageSize = (8.27, 11.69)
+
+
+def drawText(figure, lines, fontSize=8):
+    """
+    Writes lines of (text, bold) from the top of a (sub)figure downwards.
+    """
+    lineHeight = fontSize * 1.6 / 72 * figure.dpi / figure.bbox.height
+    y = 1
+    for text, bold in lines:
+        figure.text(0.02, y, text, fontsize=fontSize, fontweight="bold" if bold else "normal", va="top")
+        y -= lineHeight * (text.count("\n") + 1)
+
+
+def drawTable(figure, header, rows, fontSize=7):
+    """
+    Draws a table without vertical lines at the top of a (sub)figure.
+    """
+    axes = figure.add_axes([0.02, 0, 0.96, 1])
+    axes.axis("off")
+    if not rows:
+        return
+    # rows are 1.8 font sizes high, long tables are squeezed into the figure with a smaller font
+    rowHeight = fontSize * 1.8 / 72 * figure.dpi / figure.bbox.height
+    scale = min(1, 1 / (rowHeight * (len(rows) + 1)))
+    # and wide cells, e.g. with confidence intervals, with a font that fits the widest one (about 0.55 em per char)
+    columnWidth = 0.96 * figure.bbox.width / figure.dpi / len(header)
+    widestCell = max(len(str(cell)) for row in [header] + rows for cell in row)
+    scale = min(scale, columnWidth * 72 / (0.55 * fontSize * (widestCell + 2)))
+    height = rowHeight * scale * (len(rows) + 1)
+    table = axes.table(
+        cellText=rows, colLabels=header, cellLoc="left", edges="horizontal", bbox=[0, 1 - height, 1, height]
+    )
+    table.auto_set_font_size(False)
+    table.set_fontsize(fontSize * scale)
+    for (row, _), cell in table.get_celld().items():
+        if row == 0:
+            cell.set_text_props(fontweight="bold")
+
+
+def drawChart(figure, chart, title=None, **layout):
+    """
+    Draws a chart into a (sub)figure, layout overrides the margins set by the draw function.
+    """
+    chart.drawFunction(figure.add_subplot(), **chart.data)
+    if title is not None:
+        figure.suptitle(title, fontsize=9, fontweight="bold")
+        layout.setdefault("top", 0.9)
+    if layout:
+        figure.subplots_adjust(**layout)
+
+
+def drawHeader(figure, reportInfo):
+    figure.text(0.02, 0.95, "Model Performance", fontsize=18, fontweight="bold", va="top")
+    figure.text(
+        0.02,
+        0.35,
+        f"Model Name: {reportInfo['modelName']}     Test Date: {reportInfo['date']}     "
+        f"Creator: {reportInfo['creatorName']}",
+        fontsize=8,
+    )
+
+
+def drawOverview(figure, reportInfo):
+    textFigure, imageFigure = figure.subfigures(1, 2, width_ratios=[3, 1])
+    references = [(f"  {name}: {link}", False) for name, link in reportInfo["references"].items()]
+    drawText(
+        textFigure,
+        [("Overview", True), ("ML Principle:", True), (reportInfo["MLPrinciple"], False), ("References:", True)]
+        + references
+        + [("Algorithm Description:", True), (textwrap.fill(reportInfo["algoDescription"], 110), False)],
+    )
+    imagePath = reportInfo["descriptionGraphicPath"]
+    if imagePath and os.path.exists(imagePath):
+        from matplotlib.image import imread
+
+        axes = imageFigure.add_axes([0, 0.15, 1, 0.8])
+        axes.imshow(imread(imagePath))
+        axes.axis("off")
+        imageFigure.text(0.5, 0.05, reportInfo["graphicDescription"], fontsize=6, ha="center")
+
+
+def drawDataset(figure, title, dataset, pieChart, boxPlot):
+    tableFigure, pieFigure, boxFigure = figure.subfigures(1, 3, width_ratios=[1, 1, 1.2])
+    drawText(tableFigure, [(title, True)])
+    tableArea = tableFigure.add_subfigure(tableFigure.add_gridspec(10, 1)[1:, 0])
+    drawTable(
+        tableArea,
+        ["Classes", "Number of samples"],
+        [[key, int(samples)] for key, samples in zip(dataset["labels"], dataset["averageSamples"])],
+    )
+    drawChart(pieFigure, pieChart)
+    drawChart(boxFigure, boxPlot)
+
+
+def drawPerformanceTable(figure, metrics):
+    intervals = metrics.get("confidenceIntervals")
+    rows = [
+        [key]
+        + [
+            formatPercentage(metrics[name][i], None if intervals is None else intervals[name][:, i])
+            for name in ["precision", "recall", "fScore"]
+        ]
+        for i, key in enumerate(metrics["labels"])
+    ]
+    rows.append(["Accuracy", "", "", formatPercentage(metrics["accuracy"], intervals and intervals["accuracy"])])
+    for name, average in [("Macro Average", "macroAverage"), ("Weighted Average", "weightedAverage")]:
+        rows.append(
+            [name]
+            + [
+                formatPercentage(metrics[average][key], intervals and intervals[average][key])
+                for key in ["precision", "recall", "fScore"]
+            ]
+        )
+    drawTable(figure, ["Classes", "Precision", "Recall", "F1 Score"], rows)
+
+
+def drawTopConfusions(figure, topConfusions):
+    drawText(figure, [("Most frequent confusions", True)])
+    tableArea = figure.add_subfigure(figure.add_gridspec(10, 1)[1:, 0])
+    drawTable(
+        tableArea,
+        ["Actual", "Predicted", "Count"],
+        [list(row) for row in zip(topConfusions["actual"], topConfusions["predicted"], topConfusions["count"])],
+    )
+
+
+def drawScoreCurves(figure, scoreCurves, rocChart, precisionRecallChart):
+    title, charts, table = figure.subfigures(3, 1, height_ratios=[0.3, 4, 6])
+    drawText(title, [("Score Curves", True)], fontSize=12)
+    rocFigure, precisionRecallFigure = charts.subfigures(1, 2)
+    drawChart(rocFigure, rocChart, "ROC", bottom=0.15)
+    drawChart(precisionRecallFigure, precisionRecallChart, "Precision-Recall", bottom=0.15)
+    rows = [
+        [key, formatArea(rocAuc), formatArea(averagePrecision)]
+        for key, rocAuc, averagePrecision in zip(
+            scoreCurves["labels"], scoreCurves["rocAuc"], scoreCurves["averagePrecision"]
+        )
+    ]
+    macroAverage = scoreCurves["macroAverage"]
+    rows.append(["Macro Average", formatArea(macroAverage["rocAuc"]), formatArea(macroAverage["averagePrecision"])])
+    drawTable(table, ["Classes", "ROC AUC", "Average Precision"], rows)
+
+
+def drawFoldParameters(figure, trainingMetaData):
+    lines = []
+    for i, modelData in enumerate(trainingMetaData[:10]):
+        params = "     ".join(f"{key}: {value}" for key, value in (modelData or {}).items())
+        lines.append((f"Fold:{i+1}     {params}", False))
+    drawText(figure, lines)
+
+
+def writeReportPdf(fileName, reportInfo, metrics, charts, timings=None):
+    """
+    Lays out the report in process into a multipage pdf using the pdf backend of matplotlib.
+    The charts are drawn straight onto the pages and stay vector graphics.
+
+    Parameters
+    ----------
+    fileName : str
+        path of the pdf.
+    reportInfo : dict
+        the descriptive fields of the report.
+    metrics : dict
+        the result of ModelReport.computeMetrics.
+    charts : list
+        the Chart objects of the report, looked up by name.
+    timings : list
+        rows [stage, wall ms, cpu ms, peak MB] of a timing table added on the last page, see Profiler.Profile.rows.
+    """
+    from matplotlib.backends.backend_pdf import PdfPages
+    from matplotlib.figure import Figure
+
+    charts = {chart.name: chart for chart in charts}
+    with PdfPages(fileName) as pdf:
+        page = Figure(figsize=pageSize)
+        header, overview, info, training, test, composition = page.subfigures(
+            6, 1, height_ratios=[0.7, 2.2, 0.3, 2.2, 2.2, 2.2]
+        )
+        drawHeader(header, reportInfo)
+        drawOverview(overview, reportInfo)
+        drawText(
+            info,
+            [
+                ("Metrics", True),
+                (
+                    f"Data: {reportInfo['datafile']}     Split seed: {reportInfo['randomSplitSeed']}     "
+                    f"Training accuracy: {metrics['trainingAccuracy']*100:.2f}%",
+                    False,
+                ),
+            ],
+        )
+        drawDataset(
+            training,
+            "Training Dataset (average)",
+            metrics["trainingSet"],
+            charts["PieChartTrainingData"],
+            charts["BarChartTrainingData"],
+        )
+        drawDataset(
+            test, "Test Dataset (average)", metrics["testSet"], charts["PieChartTestData"], charts["BarChartTestData"]
+        )
+        if "BarChartOverviewData" in charts:
+            drawChart(composition, charts["BarChartOverviewData"])
+        pdf.savefig(page)
+
+        page = Figure(figsize=pageSize)
+        title, overview, matrices, fScore, parameters = page.subfigures(
+            5, 1, height_ratios=[0.3, 2.5, 3.2, 2.2, 1.2]
+        )
+        drawText(title, [("Classification Performance", True)], fontSize=12)
+        tableFigure, boxFigure = overview.subfigures(1, 2)
+        drawPerformanceTable(tableFigure, metrics)
+        drawChart(boxFigure, charts["BoxPlotPerformance"])
+        for matrixFigure, name, chartTitle in zip(
+            matrices.subfigures(1, 2),
+            ["ConfusionMatrixPerformanceData", "RegConfusionMatrixPerformanceData"],
+            ["ConfusionMatrix", "Normalised ConfusionMatrix"],
+        ):
+            drawChart(matrixFigure, charts[name], chartTitle, left=0.3, right=0.95)
+        drawChart(fScore, charts["PlotFScore"], "F1 Score by split", bottom=0.2)
+        drawFoldParameters(parameters, reportInfo["trainingMetaData"])
+        pdf.savefig(page)
+
+        if "scoreCurves" in metrics:
+            page = Figure(figsize=pageSize)
+            drawScoreCurves(page, metrics["scoreCurves"], charts["RocCurves"], charts["PrecisionRecallCurves"])
+            pdf.savefig(page)
+
+        if "topConfusions" in metrics or timings:
+            page = Figure(figsize=pageSize)
+            confusions, timingTable = page.subfigures(2, 1)
+            if "topConfusions" in metrics:
+                drawTopConfusions(confusions, metrics["topConfusions"])
+            if timings:
+                drawText(timingTable, [("Report timings", True)])
+                tableArea = timingTable.add_subfigure(timingTable.add_gridspec(10, 1)[1:, 0])
+                drawTable(tableArea, ["Stage", "Wall (ms)", "CPU (ms)", "Peak (MB)"], timings)
+            pdf.savefig(page)
@@ -0,0 +1,102 @@
+import os
+import platform
+
+
+pdfOptions = {
+    "page-size": "A4",
+    "margin-top": "5mm",
+    "margin-right": "5mm",
+    "margin-bottom": "5mm",
+    "margin-left": "5mm",
+    "encoding": "UTF-8",
+    "enable-local-file-access": True,
+}
+
+
+def pdfConfiguration():
+    """
+    Returns the pdfkit configuration for the wkhtmltopdf binary of this platform, None for the default.
+    """
+    import pdfkit
+
+    if platform.system() == "Windows":
+        return pdfkit.configuration(wkhtmltopdf="C:\\Program Files\\wkhtmltopdf\\bin\\wkhtmltopdf.exe")
+    return None
+
+
+def htmlFileToPdf(htmlFiles, fileName):
+    """
+    Converts one or several html files into a single pdf with one wkhtmltopdf run.
+
+    Parameters
+    ----------
+    htmlFiles : str or list
+        path of the html file, or a list of paths that are appended one after another.
+    fileName : str
+        path of the pdf.
+    """
+    import pdfkit
+
+    pdfkit.from_file(htmlFiles, fileName, options=pdfOptions, configuration=pdfConfiguration())
+
+
+def htmlToPdf(html, fileName):
+    """
+    Converts a html string into a pdf.
+
+    Parameters
+    ----------
+    html : str
+        the html document.
+    fileName : str
+        path of the pdf.
+    """
+    import pdfkit
+
+    pdfkit.from_string(html, fileName, options=pdfOptions, configuration=pdfConfiguration())
+
+
+async def htmlFileToPdfAsync(htmlFiles, fileName):
+    """
+    Like htmlFileToPdf, but runs wkhtmltopdf as asyncio subprocess without blocking the event loop.
+    """
+    import pdfkit
+
+    kit = pdfkit.PDFKit(htmlFiles, "file", options=pdfOptions, configuration=pdfConfiguration())
+    await runWkhtmltopdf(kit, fileName)
+
+
+async def htmlToPdfAsync(html, fileName):
+    """
+    Like htmlToPdf, but runs wkhtmltopdf as asyncio subprocess without blocking the event loop.
+    """
+    import pdfkit
+
+    kit = pdfkit.PDFKit(html, "string", options=pdfOptions, configuration=pdfConfiguration())
+    await runWkhtmltopdf(kit, fileName, html.encode("utf-8"))
+
+
+async def runWkhtmltopdf(kit, fileName, input=None):
+    """
+    Runs the command of a pdfkit.PDFKit. If the calling task is cancelled, wkhtmltopdf is killed and
+    the partial pdf removed.
+    """
+    import asyncio
+
+    process = await asyncio.create_subprocess_exec(
+        *kit.command(fileName),
+        stdin=asyncio.subprocess.PIPE,
+        stdout=asyncio.subprocess.PIPE,
+        stderr=asyncio.subprocess.PIPE,
+        env=kit.environ,
+    )
+    try:
+        _, stderr = await process.communicate(input)
+    except asyncio.CancelledError:
+        if process.returncode is None:
+            process.kill()
+        await asyncio.shield(process.wait())
+        if os.path.exists(fileName):
+            os.remove(fileName)
+        raise
+    kit.handle_error(process.returncode, stderr.decode("utf-8", errors="replace"))
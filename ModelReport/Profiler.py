@@ -0,0 +1,163 @@
+import threading
+import time
+import tracemalloc
+from contextlib import contextmanager
+
+
+class CumulativeTimer:
+    def __init__(self):
+        """
+        Adds up the wall and cpu time of all with blocks, used for the ingestion calls of a report.
+        The blocks may run in several threads at once, their times are added up. The cpu time is
+        the time of the whole process.
+        """
+        self.wall = 0.0
+        self.cpu = 0.0
+        self.calls = 0
+        self.__local = threading.local()
+        self.__lock = threading.Lock()
+
+    def __enter__(self):
+        self.__local.start = (time.perf_counter(), time.process_time())
+        return self
+
+    def __exit__(self, *exception):
+        wall, cpu = time.perf_counter(), time.process_time()
+        start = self.__local.start
+        with self.__lock:
+            self.wall += wall - start[0]
+            self.cpu += cpu - start[1]
+            self.calls += 1
+
+    def __getstate__(self):
+        return {"wall": self.wall, "cpu": self.cpu, "calls": self.calls}
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self.__local = threading.local()
+        self.__lock = threading.Lock()
+
+
+class Profile:
+    def __init__(self, hook=None, traceMemory=False):
+        """
+        Records the wall time, cpu time and peak memory allocation of the stages of a report.
+
+        Parameters
+        ----------
+        hook : function
+            called with the dict of every finished stage, e.g. to forward it to a metrics system.
+        traceMemory : bool
+            measures the peak allocation with tracemalloc, which slows down python allocations.
+        """
+        self.hook = hook
+        self.traceMemory = traceMemory
+        self.stages = []
+        self.__open = []
+        self.__startedTracing = False
+
+    @contextmanager
+    def stage(self, name):
+        """
+        Measures the with block as stage name. Stages can be nested, the peak of a stage includes its children.
+        """
+        stage = {"stage": name, "wall": None, "cpu": None, "peakMemory": None, "depth": len(self.__open)}
+        self.stages.append(stage)
+        if self.traceMemory and not self.__open:
+            self.__startedTracing = not tracemalloc.is_tracing()
+            if self.__startedTracing:
+                tracemalloc.start()
+        entry = {"peak": 0, "memory": 0}
+        if self.traceMemory:
+            # tracemalloc has a single peak, the peak of the enclosing stage is saved before resetting it
+            entry["memory"], peak = tracemalloc.get_traced_memory()
+            if self.__open:
+                self.__open[-1]["peak"] = max(self.__open[-1]["peak"], peak)
+            tracemalloc.reset_peak()
+        self.__open.append(entry)
+        wall, cpu = time.perf_counter(), time.process_time()
+        try:
+            yield
+        finally:
+            stage["wall"], stage["cpu"] = time.perf_counter() - wall, time.process_time() - cpu
+            self.__open.pop()
+            if self.traceMemory:
+                peak = max(entry["peak"], tracemalloc.get_traced_memory()[1])
+                stage["peakMemory"] = peak - entry["memory"]
+                if self.__open:
+                    self.__open[-1]["peak"] = max(self.__open[-1]["peak"], peak)
+                elif self.__startedTracing:
+                    tracemalloc.stop()
+            if self.hook is not None:
+                self.hook(stage)
+
+    def record(self, name, wall, cpu, peakMemory=None):
+        """
+        Adds a stage measured elsewhere, e.g. in a worker process, as child of the currently open stage.
+
+        Parameters
+        ----------
+        name : str
+            the name of the stage.
+        wall, cpu : float
+            seconds spent.
+        peakMemory : int
+            peak allocation in bytes, None if unknown.
+        """
+        stage = {"stage": name, "wall": wall, "cpu": cpu, "peakMemory": peakMemory, "depth": len(self.__open)}
+        self.stages.append(stage)
+        if self.hook is not None:
+            self.hook(stage)
+
+    def finishedStages(self):
+        """
+        Returns the stages that are not running anymore.
+        """
+        return [stage for stage in self.stages if stage["wall"] is not None]
+
+    @property
+    def total(self):
+        """
+        wall time of all top level stages in seconds.
+        """
+        return sum(stage["wall"] for stage in self.finishedStages() if stage["depth"] == 0)
+
+    def toDict(self):
+        """
+        Returns the finished stages and the total as plain dict.
+        """
+        return {"stages": [dict(stage) for stage in self.finishedStages()], "total": self.total}
+
+    def rows(self):
+        """
+        Returns the finished stages as table rows [stage, wall ms, cpu ms, peak MB], children are indented.
+        """
+        return [
+            [
+                "  " * stage["depth"] + stage["stage"],
+                f"{stage['wall'] * 1000:.1f}",
+                f"{stage['cpu'] * 1000:.1f}",
+                "" if stage["peakMemory"] is None else f"{stage['peakMemory'] / 2**20:.2f}",
+            ]
+            for stage in self.finishedStages()
+        ]
+
+    def __str__(self):
+        rows = [["Stage", "Wall (ms)", "CPU (ms)", "Peak (MB)"]] + self.rows()
+        widths = [max(len(row[i]) for row in rows) for i in range(4)]
+        return "\n".join(
+            row[0].ljust(widths[0]) + "".join(cell.rjust(width + 2) for cell, width in zip(row[1:], widths[1:]))
+            for row in rows
+        )
+
+
+@contextmanager
+def profileStage(profile, name):
+    """
+    profile.stage(name) if a profile is given, otherwise does nothing.
+    """
+    if profile is None:
+        yield
+    else:
+        with profile.stage(name):
+            yield
@@ -0,0 +1,102 @@
+import itertools
+import threading
+import numpy as np
+from .LabelEncoder import LabelEncoder
+
+
+class Shard:
+    def __init__(self, classes):
+        """
+        The results added by one thread. It has its own label encoder, so encoding and counting
+        needs no lock shared between threads, and a list of records that are merged by ShardedIngestion.pending and remove.
+        """
+        self.labelEncoder = LabelEncoder(classes)
+        self.records = []
+        self.lock = threading.Lock()
+
+
+class ShardedIngestion:
+    def __init__(self, classes=None):
+        """
+        Collects the results that the threads add to a report in one shard per thread.
+
+        Parameters
+        ----------
+        classes : list
+            the declared classes of the report, every shard encoder starts with them.
+        """
+        self.__classes = list(classes or [])
+        self.__local = threading.local()
+        self.__shards = []
+        self.__lock = threading.Lock()
+        self.__sequence = itertools.count()
+
+    def shard(self):
+        """
+        Returns the shard of the calling thread, created on its first call.
+        """
+        shard = getattr(self.__local, "shard", None)
+        if shard is None:
+            shard = Shard(self.__classes)
+            with self.__lock:
+                self.__shards.append(shard)
+            self.__local.shard = shard
+        return shard
+
+    def add(self, shard, kind, fold, data):
+        """
+        Adds the already counted results of one call.
+
+        Parameters
+        ----------
+        shard : Shard
+            the shard of the calling thread, data is encoded with its label encoder.
+        kind : str
+            'test', 'scores', 'trainingSet' or 'trainingResults'.
+        fold : int or str
+            the fold id given by the caller, None for a new fold.
+        data : tuple
+            the counts, see ModelReport.
+        """
+        if fold is not None:
+            if isinstance(fold, (bool, np.bool_)) or not isinstance(fold, (int, np.integer, str)):
+                raise TypeError(f"fold ids must be int or str, not {type(fold).__name__}")
+            fold = fold if isinstance(fold, str) else int(fold)
+        record = (kind, fold, next(self.__sequence), shard.labelEncoder, data)
+        with shard.lock:
+            shard.records.append(record)
+
+    def pending(self):
+        """
+        Returns the records of all shards without taking them, so they are not lost if merging them fails.
+
+        Returns
+        -------
+        tuple
+            (records, taken). records is a list of (kind, fold, labelEncoder, data) tuples. Records with a fold id
+            come first, sorted by the id with the int ids before the str ids, records without one follow thread
+            by thread, in the order each thread added them. taken is passed to remove once they are merged.
+        """
+        with self.__lock:
+            shards = list(self.__shards)
+        records, taken = [], []
+        for index, shard in enumerate(shards):
+            with shard.lock:
+                records += [(index, record) for record in shard.records]
+                taken.append((shard, len(shard.records)))
+
+        def order(entry):
+            index, (_, fold, sequence, _, _) = entry
+            # without fold ids only the calls of one thread are known to belong together
+            return (1, False, index, sequence) if fold is None else (0, isinstance(fold, str), fold, sequence)
+
+        records.sort(key=order)
+        return [(kind, fold, labelEncoder, data) for _, (kind, fold, _, labelEncoder, data) in records], taken
+
+    def remove(self, taken):
+        """
+        Removes the records returned by pending, records added since then are kept.
+        """
+        for shard, count in taken:
+            with shard.lock:
+                del shard.records[:count]
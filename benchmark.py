@@ -0,0 +1,194 @@
+"""
+Benchmarks ModelReport on synthetic cross validation results.
+
+Generates the results of a grid of folds x samples per fold x classes, times the ingestion, the metrics,
+every render stage and the creation of the whole report, and writes the results as json:
+
+    python benchmark.py --folds 5 20 --samples 1000 100000 --classes 8 200 --output benchmark.json
+"""
+import argparse
+import itertools
+import json
+import os
+import platform
+import sys
+import tempfile
+import time
+import tracemalloc
+import numpy as np
+from ModelReport.ModelReport import ModelReport
+
+
+def generateFolds(folds, samples, classes, accuracy=0.8, seed=0):
+    """
+    Generates synthetic cross validation results with a skewed class distribution.
+
+    Parameters
+    ----------
+    folds : int
+        number of folds.
+    samples : int
+        number of test results per fold, the training sets are four times larger.
+    classes : int
+        number of classes.
+    accuracy : float
+        probability that a prediction is correct, wrong predictions are uniformly distributed.
+    seed : int
+        seed of the random generator.
+
+    Returns
+    -------
+    tuple
+        (labels, list with one dict per fold: 'actual', 'predicted' and 'training' integer class codes)
+    """
+    random = np.random.default_rng(seed)
+    frequencies = 1 / np.arange(1, classes + 1)
+    frequencies /= frequencies.sum()
+    labels = [f"Class{i}" for i in range(classes)]
+    generated = []
+    for _ in range(folds):
+        actual = random.choice(classes, samples, p=frequencies)
+        predicted = np.where(random.random(samples) < accuracy, actual, random.integers(0, classes, samples))
+        generated.append(
+            {"actual": actual, "predicted": predicted, "training": random.choice(classes, 4 * samples, p=frequencies)}
+        )
+    return labels, generated
+
+
+def measure(function, traceMemory=False):
+    """
+    Calls function and returns its result with the wall time, cpu time and, if traceMemory is set,
+    the tracemalloc peak in bytes. Tracing slows down python code, so the times are only comparable
+    between runs with the same setting.
+    """
+    if traceMemory:
+        tracemalloc.start()
+    wall, cpu = time.perf_counter(), time.process_time()
+    try:
+        result = function()
+        wall, cpu = time.perf_counter() - wall, time.process_time() - cpu
+        peak = tracemalloc.get_traced_memory()[1] if traceMemory else None
+    finally:
+        if traceMemory:
+            tracemalloc.stop()
+    return result, {"wall": wall, "cpu": cpu, "peakMemory": peak}
+
+
+def benchmarkCase(
+    folds, samples, classes, outputDirectory, render=True, renderProfile="draft", topClasses=None, traceMemory=False
+):
+    """
+    Benchmarks one point of the grid.
+
+    Parameters
+    ----------
+    folds, samples, classes : int
+        the size of the synthetic results, see generateFolds.
+    outputDirectory : str
+        folder the reports are written to.
+    render : bool
+        also creates the html report and the pdf with the matplotlib backend.
+    renderProfile : str
+        the render profile of the charts.
+    topClasses : int
+        the topClasses mode of the report, None for the dense mode.
+    traceMemory : bool
+        measures the peak allocation of every step with tracemalloc.
+
+    Returns
+    -------
+    dict
+        the parameters and a dict per measured step with 'wall', 'cpu' and 'peakMemory'.
+        'html' and 'pdf' also contain the stages measured by createRaport.
+        'maxRss' is the maximum resident memory of the process in bytes after the case, not on Windows.
+    """
+    labels, generated = generateFolds(folds, samples, classes)
+    report = ModelReport("Benchmark", "benchmark.py", "Synthetic", {}, "", topClasses=topClasses)
+
+    def ingest():
+        for fold in generated:
+            report.addTestResults(fold["actual"], fold["predicted"], labels=labels)
+            report.addTrainingSet(np.zeros(len(fold["training"])), fold["training"], labels=labels)
+            report.addTrainingResults(fold["actual"], {}, predicted=fold["predicted"])
+
+    result = {"folds": folds, "samples": samples, "classes": classes, "topClasses": topClasses}
+    _, result["ingestion"] = measure(ingest, traceMemory)
+    _, result["metrics"] = measure(report.computeMetrics, traceMemory)
+    if render:
+        fileName = os.path.join(outputDirectory, f"Benchmark_{folds}_{samples}_{classes}")
+        for outputFormat, arguments in [
+            ("html", {"outputFormat": "html"}),
+            ("pdf", {"pdfBackend": "matplotlib"}),
+        ]:
+            profile, result[outputFormat] = measure(
+                lambda: report.createRaport(fileName, renderProfile=renderProfile, profile=True, **arguments),
+                traceMemory,
+            )
+            result[outputFormat]["stages"] = profile.toDict()["stages"]
+    rss = maxRss()
+    if rss is not None:
+        result["maxRss"] = rss
+    return result
+
+
+def maxRss():
+    """
+    Returns the maximum resident memory of the process in bytes, None where the resource module is missing.
+    """
+    try:
+        import resource
+    except ImportError:
+        return None
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * (1 if sys.platform == "darwin" else 1024)
+
+
+def environment():
+    import matplotlib
+
+    return {
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "numpy": np.__version__,
+        "matplotlib": matplotlib.__version__,
+    }
+
+
+def main(arguments=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--folds", type=int, nargs="+", default=[5, 20])
+    parser.add_argument("--samples", type=int, nargs="+", default=[1000, 100000])
+    parser.add_argument("--classes", type=int, nargs="+", default=[8, 100])
+    parser.add_argument("--topClasses", type=int, default=None, help="topClasses mode of the reports")
+    parser.add_argument("--renderProfile", default="draft")
+    parser.add_argument("--noRender", action="store_true", help="only measure ingestion and metrics")
+    parser.add_argument("--memory", action="store_true", help="measure the peak allocations with tracemalloc")
+    parser.add_argument("--output", default="benchmark.json")
+    arguments = parser.parse_args(arguments)
+
+    results = []
+    with tempfile.TemporaryDirectory() as outputDirectory:
+        for folds, samples, classes in itertools.product(arguments.folds, arguments.samples, arguments.classes):
+            result = benchmarkCase(
+                folds,
+                samples,
+                classes,
+                outputDirectory,
+                render=not arguments.noRender,
+                renderProfile=arguments.renderProfile,
+                topClasses=arguments.topClasses,
+                traceMemory=arguments.memory,
+            )
+            results.append(result)
+            steps = [step for step in ["ingestion", "metrics", "html", "pdf"] if step in result]
+            print(
+                f"folds={folds:<4} samples={samples:<8} classes={classes:<5} "
+                + "  ".join(f"{step}={result[step]['wall'] * 1000:.1f}ms" for step in steps)
+            )
+
+    with open(arguments.output, "w") as out:
+        json.dump({"environment": environment(), "results": results}, out, indent=1)
+    print(f"File created ->{os.path.abspath(arguments.output)}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,104 @@
+import asyncio
+import os
+import stat
+import sys
+import tempfile
+import time
+import unittest
+from unittest import mock
+from ModelReport.ModelReport import ModelReport
+
+
+fakeWkhtmltopdf = """#!{python}
+import os, re, sys, time
+images = re.findall(r'src="([^"]+)"', sys.stdin.read())
+with open(os.environ["FAKE_WKHTMLTOPDF_LOG"], "a") as log:
+    log.write(str(os.getpid()) + " " + " ".join(images) + "\\n")
+with open(sys.argv[-1], "w") as pdf:
+    pdf.write("%PDF-1.4")
+time.sleep(float(os.environ.get("FAKE_WKHTMLTOPDF_SLEEP", "0")))
+"""
+
+
+def createReport(index):
+    report = ModelReport(f"Model{index}", "Creator", "Principle", {}, "Description")
+    report.addTrainingSet([["sen", "A"], ["sen", "B"], ["sen", "C"]])
+    report.addTestResults([["A", "A"], ["B", "A"], ["B", "B"], ["C", "C"]])
+    report.addTrainingResults([["A", "A"]], {})
+    return report
+
+
+@unittest.skipIf(sys.platform == "win32", "uses a fake wkhtmltopdf script")
+class Test_AsyncReport(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        binary = os.path.join(self.directory.name, "wkhtmltopdf")
+        with open(binary, "w") as file:
+            file.write(fakeWkhtmltopdf.format(python=sys.executable))
+        os.chmod(binary, os.stat(binary).st_mode | stat.S_IEXEC)
+        self.log = os.path.join(self.directory.name, "log")
+        self.environment = mock.patch.dict(
+            os.environ,
+            {"PATH": self.directory.name + os.pathsep + os.environ["PATH"], "FAKE_WKHTMLTOPDF_LOG": self.log},
+        )
+        self.environment.start()
+
+    def tearDown(self):
+        self.environment.stop()
+        self.directory.cleanup()
+
+    def test_ConcurrentReports(self):
+        async def createReports():
+            limiter = asyncio.Semaphore(2)
+            return await asyncio.gather(
+                *[
+                    createReport(i).createRaportAsync(
+                        os.path.join(self.directory.name, f"Model{i}"), renderProfile="draft", limiter=limiter,
+                        profile=True
+                    )
+                    for i in range(3)
+                ]
+            )
+
+        profiles = asyncio.run(createReports())
+        for i, profile in enumerate(profiles):
+            with open(os.path.join(self.directory.name, f"Model{i}.pdf")) as pdf:
+                self.assertEqual(pdf.read(), "%PDF-1.4")
+            self.assertEqual([stage["stage"] for stage in profile.stages if stage["depth"] == 0][-2:], ["html", "pdf"])
+        with open(self.log) as log:
+            images = " ".join(line.split(" ", 1)[1] for line in log).split()
+        chartDirectories = {os.path.dirname(image) for image in images if image.endswith((".png", ".svg"))}
+        self.assertEqual(len(chartDirectories), 3)
+        self.assertTrue(all(not os.path.exists(directory) for directory in chartDirectories))
+
+    def test_OtherFormatsInExecutor(self):
+        fileName = os.path.join(self.directory.name, "Model")
+        asyncio.run(createReport(0).createRaportAsync(fileName, outputFormat="json"))
+        self.assertTrue(os.path.exists(fileName + ".json"))
+
+    def test_CancelKillsConversion(self):
+        os.environ["FAKE_WKHTMLTOPDF_SLEEP"] = "30"
+        fileName = os.path.join(self.directory.name, "Model")
+
+        async def cancelReport():
+            task = asyncio.create_task(createReport(0).createRaportAsync(fileName, renderProfile="draft"))
+            while not os.path.exists(fileName + ".pdf") and not task.done():
+                await asyncio.sleep(0.05)
+            task.cancel()
+            with self.assertRaises(asyncio.CancelledError):
+                await task
+
+        start = time.perf_counter()
+        asyncio.run(cancelReport())
+        self.assertLess(time.perf_counter() - start, 20)
+        self.assertFalse(os.path.exists(fileName + ".pdf"))
+        with open(self.log) as log:
+            pid, images = log.read().split(" ", 1)
+        with self.assertRaises(ProcessLookupError):
+            os.kill(int(pid), 0)
+        charts = [image for image in images.split() if image.endswith((".png", ".svg"))]
+        self.assertFalse(os.path.exists(os.path.dirname(charts[0])))
+
+
+if __name__ == "__main__":
+    unittest.main()
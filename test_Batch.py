@@ -0,0 +1,31 @@
+import unittest
+from unittest import mock
+from ModelReport.ModelReport import ModelReport
+from ModelReport.Batch import createRaports
+
+
+class Test_Batch(unittest.TestCase):
+    def test_CreateRaportsWithOneConversion(self):
+        reports = []
+        for index in range(3):
+            report = ModelReport(f"Model{index}", "Creator", "Principle", {}, "Description")
+            report.addTestResults([["A", "A"], ["B", "A"], ["B", "B"]])
+            report.addTrainingSet([["sen", "A"], ["sen", "B"]])
+            report.addTrainingResults([["A", "A"]], {"Fold": index})
+            reports.append(report)
+
+        # workers=2 sends the pickled reports to a process pool
+        for workers in [1, 2]:
+            with self.subTest(workers=workers), mock.patch("pdfkit.from_file") as fromFile:
+                timings = createRaports(reports, "Combined", workers=workers, renderProfile="draft")
+
+                self.assertEqual(fromFile.call_count, 1)
+                htmlFiles, fileName = fromFile.call_args.args
+                self.assertEqual(len(htmlFiles), 3)
+                self.assertEqual(fileName, "Combined.pdf")
+                self.assertEqual(len(timings["reports"]), 3)
+                self.assertIsNone(timings["reports"][0]["pdf"])
+
+
+if __name__ == "__main__":
+    unittest.main()
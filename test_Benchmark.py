@@ -0,0 +1,32 @@
+import sys
+import tempfile
+import unittest
+from unittest import mock
+from benchmark import benchmarkCase, generateFolds
+
+
+class Test_Benchmark(unittest.TestCase):
+    def test_GenerateFolds(self):
+        labels, folds = generateFolds(3, 100, 5)
+        self.assertEqual(len(labels), 5)
+        self.assertEqual(len(folds), 3)
+        self.assertEqual(len(folds[0]["training"]), 400)
+        self.assertLess(folds[0]["actual"].max(), 5)
+
+    def test_BenchmarkCase(self):
+        with tempfile.TemporaryDirectory() as directory:
+            result = benchmarkCase(2, 100, 4, directory, render=False, traceMemory=True)
+        self.assertEqual(result["classes"], 4)
+        self.assertGreater(result["ingestion"]["peakMemory"], 0)
+        self.assertIn("wall", result["metrics"])
+        self.assertNotIn("html", result)
+
+    def test_WithoutResourceModule(self):
+        # the resource module does not exist on Windows
+        with mock.patch.dict(sys.modules, {"resource": None}), tempfile.TemporaryDirectory() as directory:
+            result = benchmarkCase(1, 50, 3, directory, render=False)
+        self.assertNotIn("maxRss", result)
+
+
+if __name__ == "__main__":
+    unittest.main()
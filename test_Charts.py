@@ -0,0 +1,90 @@
+import os
+import tempfile
+import unittest
+from unittest import mock
+from ModelReport.Charts import (
+    Chart,
+    ChartCache,
+    drawBoxPlot,
+    drawPieChart,
+    renderCharts,
+    resolveRenderProfile,
+    toDataUri,
+)
+
+
+class Test_Charts(unittest.TestCase):
+    def test_RenderChartsInProcessPool(self):
+        charts = [
+            Chart("Pie", drawPieChart, sizes=[3, 1], labels=["A", "B"], colors=["#F06060", "#F2DD64"]),
+            Chart(
+                "VectorPie", drawPieChart, vector=True, sizes=[3, 1], labels=["A", "B"], colors=["#F06060", "#F2DD64"]
+            ),
+            Chart(
+                "Box",
+                drawBoxPlot,
+                data=[[1, 2, 3], [2, 3, 4]],
+                labels=["A", "B"],
+                colors=["#F06060", "#F2DD64"],
+                yLabel="Sampels",
+            ),
+        ]
+        with tempfile.TemporaryDirectory() as sequential, tempfile.TemporaryDirectory() as parallel:
+            renderCharts(charts, sequential)
+            renderCharts(charts, parallel, workers=2)
+            for chart in charts:
+                with open(os.path.join(sequential, chart.fileName), "rb") as first, open(
+                    os.path.join(parallel, chart.fileName), "rb"
+                ) as second:
+                    self.assertEqual(first.read(), second.read())
+
+    def test_RenderChartsInMemory(self):
+        chart = Chart("Pie", drawPieChart, vector=True, sizes=[1], labels=["A"], colors=["#F06060"])
+        content = renderCharts([chart], None)[0]
+        self.assertTrue(content.lstrip().startswith(b"<?xml"))
+        self.assertTrue(toDataUri(chart, content).startswith("data:image/svg+xml;base64,"))
+
+    def test_RenderProfiles(self):
+        chart = Chart("Pie", drawPieChart, vector=True, sizes=[1], labels=["A"], colors=["#F06060"])
+        chart.applyRenderProfile(resolveRenderProfile("print"))
+        self.assertEqual((chart.fileName, chart.dpi, chart.figureSize), ("Pie.svg", "figure", None))
+
+        chart.applyRenderProfile(resolveRenderProfile("draft"))
+        self.assertEqual((chart.fileName, chart.dpi), ("Pie.png", 72))
+        self.assertAlmostEqual(chart.figureSize[0], 6.4 * 0.8)
+        chart.applyRenderProfile(resolveRenderProfile("draft"))
+        self.assertAlmostEqual(chart.figureSize[0], 6.4 * 0.8)
+
+        self.assertEqual(resolveRenderProfile({"dpi": 300})["dpi"], 300)
+        with self.assertRaises(ValueError):
+            resolveRenderProfile("poster")
+
+    def test_ChartCache(self):
+        def pieChart(name, sizes):
+            return Chart(name, drawPieChart, sizes=sizes, labels=["A", "B"], colors=["#F06060", "#F2DD64"])
+
+        with tempfile.TemporaryDirectory() as directory, tempfile.TemporaryDirectory() as output:
+            cache = ChartCache(directory)
+            first = renderCharts([pieChart("Pie", [3, 1])], None, renderProfile="draft", cache=cache)
+            with mock.patch("ModelReport.Charts.renderChart") as renderChart:
+                second = renderCharts([pieChart("Other", [3, 1])], output, renderProfile="draft", cache=cache)
+            renderChart.assert_not_called()
+            with open(os.path.join(output, "Other.png"), "rb") as file:
+                self.assertEqual(file.read(), first[0])
+            self.assertEqual(second, [None])
+
+            renderCharts([pieChart("Pie", [1, 3])], None, renderProfile="draft", cache=cache)
+            renderCharts([pieChart("Pie", [3, 1])], None, renderProfile="screen", cache=cache)
+            self.assertEqual(len(os.listdir(directory)), 3)
+
+            recent = pieChart("Pie", [3, 1])
+            recent.applyRenderProfile(resolveRenderProfile("draft"))
+            os.utime(os.path.join(directory, recent.cacheKey), (0, 0))
+            self.assertEqual(cache.get(recent.cacheKey), first[0])
+            cache.maxBytes = len(first[0])
+            cache.evict()
+            self.assertEqual(os.listdir(directory), [recent.cacheKey])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,45 @@
+import os
+import re
+import tempfile
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+from unittest import mock
+from ModelReport.ModelReport import ModelReport
+
+
+def createReport(index, outputDirectory):
+    classes = [f"Class{i}" for i in range(3 + index)]
+    report = ModelReport(f"Model{index}", "Creator", "Principle", {}, "Description")
+    for fold in range(3):
+        report.addTestResults(
+            [[classes[i % len(classes)], classes[(i * fold) % len(classes)]] for i in range(50)]
+        )
+        report.addTrainingSet([["sen", classes[i % len(classes)]] for i in range(50)])
+        report.addTrainingResults([["A", "A"]], {})
+    report.createRaport(os.path.join(outputDirectory, f"Model{index}"), renderProfile="draft")
+
+
+class Test_ConcurrentReports(unittest.TestCase):
+    def test_ThreadsUseSeparateWorkingDirectories(self):
+        missingImages = []
+        workingDirectories = set()
+
+        def fromString(html, fileName, **kwargs):
+            images = re.findall(r'src="([^"]+\.(?:png|svg))"', html)
+            missingImages.extend(image for image in images if not os.path.exists(image))
+            workingDirectories.update(os.path.dirname(image) for image in images)
+
+        with tempfile.TemporaryDirectory() as outputDirectory, mock.patch(
+            "pdfkit.from_string", side_effect=fromString
+        ):
+            with ThreadPoolExecutor(4) as executor:
+                list(executor.map(createReport, range(4), [outputDirectory] * 4))
+
+        self.assertEqual(missingImages, [])
+        self.assertEqual(len(workingDirectories), 4)
+        for directory in workingDirectories:
+            self.assertFalse(os.path.exists(directory))
+
+
+if __name__ == "__main__":
+    unittest.main()
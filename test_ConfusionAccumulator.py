@@ -0,0 +1,94 @@
+import unittest
+import numpy as np
+from ModelReport.LabelEncoder import LabelEncoder
+from ModelReport.ConfusionAccumulator import (
+    ConfusionAccumulator,
+    ClassCountAccumulator,
+    ScoreAccumulator,
+    SparseConfusionAccumulator,
+    countFoldPairs,
+    countScores,
+)
+
+
+class Test_ConfusionAccumulator(unittest.TestCase):
+    def test_FoldMatrices(self):
+        labelEncoder = LabelEncoder()
+        accumulator = ConfusionAccumulator(labelEncoder)
+
+        results = labelEncoder.encode([["A", "A"], ["A", "B"], ["B", "B"]])
+        accumulator.addFold(results[:, 0], results[:, 1])
+        results = labelEncoder.encode([["C", "A"], ["C", "C"]])
+        accumulator.addFold(results[:, 0], results[:, 1])
+
+        self.assertEqual(labelEncoder.labels, ["A", "B", "C"])
+        foldMatrices = accumulator.foldMatrices()
+        self.assertEqual(foldMatrices.shape, (2, 3, 3))
+        np.testing.assert_array_equal(
+            foldMatrices[0], [[1, 0, 0], [1, 1, 0], [0, 0, 0]]
+        )
+        np.testing.assert_array_equal(
+            foldMatrices[1], [[0, 0, 1], [0, 0, 0], [0, 0, 1]]
+        )
+
+    def test_FoldCounts(self):
+        labelEncoder = LabelEncoder()
+        accumulator = ClassCountAccumulator(labelEncoder)
+
+        labelEncoder.encode(["A", "B"])
+        accumulator.addFoldCounts([2, 1])
+        labelEncoder.encode(["C"])
+        accumulator.addFoldCounts([0, 0, 1])
+        accumulator.addCountsToFold(0, [1])
+
+        np.testing.assert_array_equal(accumulator.foldCounts(), [[3, 1, 0], [0, 0, 1]])
+
+    def test_SparseMatchesDense(self):
+        labelEncoder = LabelEncoder()
+        dense, sparse = ConfusionAccumulator(labelEncoder), SparseConfusionAccumulator(labelEncoder)
+        random = np.random.default_rng(0)
+        for size in [50, 0, 80]:
+            results = labelEncoder.encode(random.choice(list("ABCDEFG"[: 3 + size // 20]), (size, 2)))
+            for accumulator in [dense, sparse]:
+                accumulator.addFold(results[:, 0], results[:, 1])
+                accumulator.addToFold(0, results[:, 0], results[:, 1])
+
+        np.testing.assert_array_equal(sparse.foldMatrices(), dense.foldMatrices())
+        for sparseCounts, denseCounts in zip(sparse.foldSummaries(), dense.foldSummaries()):
+            np.testing.assert_array_equal(sparseCounts, denseCounts)
+        matrix = np.zeros((len(labelEncoder),) * 2, dtype=np.int64)
+        predicted, actual, counts = sparse.pairs()
+        matrix[predicted, actual] = counts
+        np.testing.assert_array_equal(matrix, dense.foldMatrices().sum(axis=0))
+
+    def test_CountFoldPairs(self):
+        random = np.random.default_rng(0)
+        folds, predicted, actual = random.integers(0, 5, 2000), random.integers(0, 7, 2000), random.integers(0, 7, 2000)
+        expected = np.zeros((5, 7, 7), dtype=np.int64)
+        np.add.at(expected, (folds, predicted, actual), 1)
+        # a table of all cells, a key per cell and a sort of the rows when the key does not fit into int64
+        for numberOfClasses in [7, 10**5, 2**31]:
+            cellFolds, cellPredicted, cellActual, counts = countFoldPairs(folds, predicted, actual, numberOfClasses)
+            self.assertTrue(np.all(np.diff(cellFolds) >= 0))
+            matrices = np.zeros((5, 7, 7), dtype=np.int64)
+            matrices[cellFolds, cellPredicted, cellActual] = counts
+            np.testing.assert_array_equal(matrices, expected)
+
+    def test_ScoreAccumulator(self):
+        random = np.random.default_rng(0)
+        scores, positive = random.integers(0, 50, 3000) / 10, random.random(3000) < 0.5
+        accumulator = ScoreAccumulator()
+        for start in range(0, 3000, 100):
+            values, counts = countScores(scores[start : start + 100], positive[start : start + 100])
+            accumulator.addScores(np.full(len(values), 2), values, counts)
+
+        values, counts = accumulator.classScores(2)
+        expectedValues, expectedCounts = countScores(scores, positive)
+        np.testing.assert_array_equal(values, expectedValues)
+        np.testing.assert_array_equal(counts, expectedCounts)
+        self.assertEqual(accumulator.classIds(), [2])
+        np.testing.assert_array_equal(accumulator.scorePairs()[2], expectedCounts)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,82 @@
+import json
+import os
+import tempfile
+import unittest
+from unittest import mock
+import numpy as np
+from ModelReport.ModelReport import ModelReport
+
+
+class Test_Export(unittest.TestCase):
+    def setUp(self):
+        self.report = ModelReport("Model", "Creator", "Principle", {}, "Description", datafile="Data.csv")
+        self.report.addTrainingSet([["sen", "A"], ["sen", "B"]])
+        self.report.addTestResults([["A", "A"], ["B", "A"], ["B", "B"]])
+        self.report.addTrainingResults([["A", "A"]], {"Epochs": 3})
+
+    def test_JsonAndNpz(self):
+        with tempfile.TemporaryDirectory() as directory:
+            fileName = os.path.join(directory, "Report")
+            self.report.createRaport(fileName, outputFormat="json")
+            self.report.createRaport(fileName, outputFormat="npz")
+
+            with open(fileName + ".json") as file:
+                bundle = json.load(file)
+            self.assertEqual(bundle["report"]["datafile"], "Data.csv")
+            self.assertEqual(bundle["metrics"]["confusionMatrix"], [[1, 1], [0, 1]])
+
+            with np.load(fileName + ".npz") as npz:
+                np.testing.assert_array_equal(npz["labels"], ["A", "B"])
+                np.testing.assert_array_equal(npz["testSet.samplesPerFold"], [[2, 1]])
+                self.assertAlmostEqual(json.loads(str(npz["report"]))["metrics"]["accuracy"], 2 / 3)
+
+    def test_SelfContainedHtml(self):
+        with tempfile.TemporaryDirectory() as directory:
+            fileName = os.path.join(directory, "Report")
+            self.report.createRaport(fileName, outputFormat="html", renderProfile="draft")
+            with open(fileName + ".html") as file:
+                html = file.read()
+            self.assertEqual(html.count('src="data:image/'), 9)
+            self.assertEqual(os.listdir(directory), ["Report.html"])
+
+    def test_SelfContainedHtmlWithDescriptionGraphic(self):
+        with tempfile.TemporaryDirectory() as directory:
+            imagePath = os.path.join(directory, "Overview.png")
+            with open(imagePath, "wb") as image:
+                image.write(b"\x89PNG\r\n\x1a\n")
+            report = ModelReport("Model", "Creator", "Principle", {}, "Description", descriptionGraphicPath=imagePath)
+            report.addTrainingSet([["sen", "A"], ["sen", "B"]])
+            report.addTestResults([["A", "A"], ["B", "A"], ["B", "B"]])
+            report.addTrainingResults([["A", "A"]], {})
+            html = report.createHtml(renderProfile="draft")
+            self.assertIn('src="data:image/png;base64,iVBORw0KGgo=" alt="Overview Image"', html)
+            self.assertNotIn(imagePath, html)
+
+    def test_JsonWithUndefinedAreas(self):
+        report = ModelReport("Model", "Creator", "Principle", {}, "Description")
+        # all samples are of class A, so there are no negatives of A and no positives of B
+        report.addTestScores(["A", "A", "A"], [[0.7, 0.3], [0.6, 0.4], [0.4, 0.6]], labels=["A", "B"])
+        with tempfile.TemporaryDirectory() as directory:
+            fileName = os.path.join(directory, "Report")
+            report.createRaport(fileName, outputFormat="json")
+            with open(fileName + ".json") as file:
+                text = file.read()
+        self.assertNotIn("NaN", text)
+        curves = json.loads(text)["metrics"]["scoreCurves"]
+        self.assertEqual(curves["labels"], ["A", "B"])
+        self.assertEqual(curves["rocAuc"], [None, None])
+
+    def test_MatplotlibPdfBackend(self):
+        with tempfile.TemporaryDirectory() as directory, mock.patch("pdfkit.from_string") as fromString:
+            fileName = os.path.join(directory, "Report")
+            self.report.createRaport(fileName, pdfBackend="matplotlib")
+            with open(fileName + ".pdf", "rb") as file:
+                pdf = file.read()
+            self.assertTrue(pdf.startswith(b"%PDF"))
+            self.assertIn(b"/Count 2", pdf)
+            self.assertEqual(os.listdir(directory), ["Report.pdf"])
+        fromString.assert_not_called()
+
+
+if __name__ == "__main__":
+    unittest.main()
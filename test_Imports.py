@@ -0,0 +1,32 @@
+import os
+import subprocess
+import sys
+import unittest
+
+
+class Test_Imports(unittest.TestCase):
+    def test_ImportDoesNotLoadRenderingLibraries(self):
+        # Runs in a fresh interpreter, other tests may already have imported matplotlib.
+        code = (
+            "import sys\n"
+            "from ModelReport.ModelReport import ModelReport\n"
+            "report = ModelReport('Model', 'Creator', 'Principle', {}, 'Description')\n"
+            "report.addTestResults([['A', 'A'], ['A', 'B']])\n"
+            "report.addTrainingResults([['A', 'A']], {})\n"
+            "report.addTrainingSet([['sen', 'A']])\n"
+            "report.computeMetrics()\n"
+            "print(' '.join(sorted({name.split('.')[0] for name in sys.modules})))\n"
+        )
+        output = subprocess.run(
+            [sys.executable, "-c", code],
+            cwd=os.path.dirname(os.path.abspath(__file__)),
+            capture_output=True,
+            text=True,
+            check=True,
+        ).stdout.split()
+        for module in ["matplotlib", "seaborn", "pandas", "pdfkit", "asyncio"]:
+            self.assertNotIn(module, output)
+
+
+if __name__ == "__main__":
+    unittest.main()
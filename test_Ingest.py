@@ -0,0 +1,76 @@
+import importlib.util
+import os
+import tempfile
+import unittest
+import numpy as np
+from ModelReport.Ingest import groupFolds
+from ModelReport.ModelReport import ModelReport
+
+
+class Test_Ingest(unittest.TestCase):
+    def setUp(self):
+        random = np.random.default_rng(0)
+        self.actual = random.integers(0, 4, 1000)
+        self.predicted = random.integers(0, 4, 1000)
+        self.folds = np.repeat([2, 0, 1], [300, 300, 400])
+        self.labels = ["A", "B", "C", "D"]
+
+        self.expected = ModelReport("Model", "Creator", "Principle", {}, "Description")
+        for fold in [2, 0, 1]:
+            inFold = self.folds == fold
+            self.expected.addTestResults(self.actual[inFold], self.predicted[inFold], labels=self.labels)
+
+    def assertSameTestResults(self, report):
+        np.testing.assert_array_equal(report.getState()["testMatrices"], self.expected.getState()["testMatrices"])
+
+    def test_NpyInChunks(self):
+        with tempfile.TemporaryDirectory() as directory:
+            fileName = os.path.join(directory, "results.npy")
+            np.save(fileName, np.stack([self.actual, self.predicted, self.folds], axis=1))
+            report = ModelReport("Model", "Creator", "Principle", {}, "Description")
+            report.addTestResultsFromFile(fileName, foldColumn=2, labels=self.labels, chunkSize=128)
+        self.assertSameTestResults(report)
+
+    def test_InterleavedFolds(self):
+        rows = np.stack([self.actual, self.predicted, self.folds], axis=1)[np.random.default_rng(1).permutation(1000)]
+        report = ModelReport("Model", "Creator", "Principle", {}, "Description")
+        report.addTestResultsFromFile(rows, foldColumn=2, labels=self.labels, chunkSize=128)
+        # the folds are numbered in order of their first row
+        order = [[2, 0, 1].index(fold) for fold in dict.fromkeys(rows[:, 2].tolist())]
+        np.testing.assert_array_equal(report.getState()["testMatrices"], self.expected.getState()["testMatrices"][order])
+
+    def test_GroupFolds(self):
+        for values in [np.array([5, 3, 5, 9]), np.array([5, 3, 5, 10**12]), np.array(["b", "a", "b", "c"])]:
+            foldValues, firstRows, foldIds = groupFolds(values)
+            self.assertEqual([foldValues[i] for i in foldIds], values.tolist())
+            np.testing.assert_array_equal(np.asarray(foldValues)[np.argsort(firstRows)], values[[0, 1, 3]])
+
+    def test_CsvWithClassNames(self):
+        with tempfile.TemporaryDirectory() as directory:
+            fileName = os.path.join(directory, "results.csv")
+            with open(fileName, "w") as file:
+                file.write("fold,actual,predicted\n")
+                for fold, actual, predicted in zip(self.folds, self.actual, self.predicted):
+                    file.write(f"{fold},{self.labels[actual]},{self.labels[predicted]}\n")
+            report = ModelReport("Model", "Creator", "Principle", {}, "Description")
+            report.addTestResultsFromFile(fileName, "actual", "predicted", "fold", chunkSize=128)
+        self.assertEqual(sorted(report.getState()["labels"]), self.labels)
+        self.assertEqual(report.computeMetrics()["support"].sum(), 1000)
+        self.assertEqual(len(report.getState()["testMatrices"]), 3)
+
+    @unittest.skipUnless(importlib.util.find_spec("pyarrow"), "needs pyarrow")
+    def test_Parquet(self):
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+
+        with tempfile.TemporaryDirectory() as directory:
+            fileName = os.path.join(directory, "results.parquet")
+            table = pa.table({"actual": self.actual, "predicted": self.predicted, "fold": self.folds})
+            pq.write_table(table, fileName, row_group_size=100)
+            report = ModelReport("Model", "Creator", "Principle", {}, "Description")
+            report.addTestResultsFromFile(fileName, 0, "predicted", "fold", labels=self.labels, chunkSize=128)
+        self.assertSameTestResults(report)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,36 @@
+import unittest
+import numpy as np
+from ModelReport.LabelEncoder import LabelEncoder
+from ModelReport.ModelReport import ModelReport
+
+
+class Test_LabelEncoder(unittest.TestCase):
+    def test_Encode(self):
+        labelEncoder = LabelEncoder()
+        np.testing.assert_array_equal(labelEncoder.encode(["B", "A", "B"]), [1, 0, 1])
+        np.testing.assert_array_equal(labelEncoder.encode(np.array([7, 3, 7])), [3, 2, 3])
+        np.testing.assert_array_equal(
+            labelEncoder.encode(np.array([10**9, 3])), [4, 2]
+        )
+        self.assertEqual(labelEncoder.labels, ["A", "B", 3, 7, 10**9])
+        self.assertEqual(labelEncoder.encode([]).shape, (0,))
+
+    def test_DeclaredLabels(self):
+        labelEncoder = LabelEncoder(["C", "A"])
+        np.testing.assert_array_equal(labelEncoder.encode(["A", "B", "C"]), [1, 2, 0])
+        self.assertEqual(labelEncoder.labels, ["C", "A", "B"])
+
+    def test_CodesOutOfRange(self):
+        report = ModelReport("Model", "Creator", "Principle", {}, "Description")
+        report.addTestResults([["A", "A"], ["B", "B"], ["C", "C"]])
+        # the labels map to the ids 0 and 1 of the report, code 2 must not be counted as 'C'
+        for actual, predicted in [([0, 2], [0, 1]), ([0, 1], [-1, 1])]:
+            with self.assertRaises(ValueError):
+                report.addTestResults(np.array(actual), np.array(predicted), labels=["A", "B"])
+        with self.assertRaises(ValueError):
+            report.addTrainingSet(["sen", "sen"], np.array([0, 2]), labels=["A", "B"])
+        self.assertEqual(len(report.computeMetrics()["foldAccuracy"]), 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,50 @@
+import os
+import tempfile
+import unittest
+import numpy as np
+from ModelReport.ModelReport import ModelReport
+
+
+class Test_LiveReport(unittest.TestCase):
+    def test_SnapshotPerFold(self):
+        random = np.random.default_rng(0)
+        labels = ["A", "B", "C"]
+        report = ModelReport("Model", "Creator", "Principle", {}, "Description")
+        with tempfile.TemporaryDirectory() as directory:
+            fileName = os.path.join(directory, "Live")
+            live = report.startLiveReport(fileName, interval=0)
+            report.addTrainingSet(["sen"] * 30, random.integers(0, 3, 30), labels=labels)
+            self.assertEqual(live.snapshots, 0)
+
+            for fold in range(3):
+                report.addTestResults(random.integers(0, 3, 100), random.integers(0, 3, 100), labels=labels)
+                self.assertEqual(live.snapshots, 2 * fold + 1)
+                renderedCharts = live.renderedCharts
+                # the training results change none of the charts
+                report.addTrainingResults(["A", "B"], {"fold": fold}, predicted=["A", "A"])
+                self.assertEqual(live.renderedCharts, renderedCharts)
+
+            with open(fileName + ".html") as file:
+                html = file.read()
+            self.assertIn("Fold:3", html)
+            self.assertIn("Training accuracy</th><td>50.00%", html)
+            self.assertTrue(os.path.exists(os.path.join(fileName + "_files", "PlotFScore.png")))
+            # the live report does not change the final report
+            self.assertEqual(len(report.computeMetrics()["foldAccuracy"]), 3)
+            report.stopLiveReport()
+            report.addTestResults(["A"], ["A"])
+            self.assertEqual(live.snapshots, 7)
+
+    def test_Interval(self):
+        report = ModelReport("Model", "Creator", "Principle", {}, "Description")
+        with tempfile.TemporaryDirectory() as directory:
+            live = report.startLiveReport(os.path.join(directory, "Live"), interval=3600)
+            for _ in range(5):
+                report.addTestResults([["A", "A"], ["B", "A"]])
+            self.assertEqual(live.snapshots, 1)
+            self.assertTrue(report.updateLiveReport())
+            self.assertEqual(live.snapshots, 2)
+
+
+if __name__ == "__main__":
+    unittest.main()
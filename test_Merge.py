@@ -0,0 +1,67 @@
+import io
+import pickle
+import unittest
+import numpy as np
+from ModelReport.ModelReport import ModelReport
+
+
+def createReport():
+    return ModelReport("Model", "Creator", "Principle", {}, "Description")
+
+
+class Test_Merge(unittest.TestCase):
+    def setUp(self):
+        self.folds = [
+            ([["A", "A"], ["B", "A"], ["B", "B"]], [["sen", "A"], ["sen", "B"]], {"Fold": 1}),
+            ([["C", "C"], ["A", "C"]], [["sen", "C"]], {"Fold": 2}),
+            ([["B", "B"], ["C", "A"]], [["sen", "B"], ["sen", "C"]], {"Fold": 3}),
+        ]
+
+    def addFold(self, report, fold):
+        testResults, trainingSet, metaData = self.folds[fold]
+        report.addTestResults(testResults)
+        report.addTrainingSet(trainingSet)
+        report.addTrainingResults(testResults, metaData)
+
+    def test_MergeEqualsSingleReport(self):
+        single = createReport()
+        for fold in range(3):
+            self.addFold(single, fold)
+
+        workers = [createReport() for _ in range(3)]
+        for fold, worker in enumerate(workers):
+            self.addFold(worker, fold)
+        stateFile = io.BytesIO()
+        workers[0].saveState(stateFile)
+        stateFile.seek(0)
+
+        merged = createReport().merge(workers[2], pickle.loads(pickle.dumps(workers[1].getState())), stateFile)
+        expected, actual = single.computeMetrics(), merged.computeMetrics()
+
+        self.assertEqual(sorted(actual["labels"]), sorted(expected["labels"]))
+        order = [actual["labels"].index(key) for key in expected["labels"]]
+        np.testing.assert_array_equal(actual["confusionMatrix"][np.ix_(order, order)], expected["confusionMatrix"])
+        np.testing.assert_allclose(actual["fScore"][order], expected["fScore"])
+        self.assertAlmostEqual(actual["accuracy"], expected["accuracy"])
+        self.assertAlmostEqual(actual["trainingAccuracy"], expected["trainingAccuracy"])
+        np.testing.assert_allclose(
+            sorted(actual["trainingSet"]["averageSamples"]), sorted(expected["trainingSet"]["averageSamples"])
+        )
+        self.assertEqual(merged.getState()["trainingMetaData"], [{"Fold": 3}, {"Fold": 2}, {"Fold": 1}])
+
+    def test_IntegerLabelsKeepTheirType(self):
+        worker = createReport()
+        worker.addTestResults([1, 2], predicted=[1, 1])
+        stateFile = io.BytesIO()
+        worker.saveState(stateFile)
+        stateFile.seek(0)
+
+        merged = createReport()
+        merged.addTestResults([2], predicted=[2])
+        merged.merge(stateFile)
+        self.assertEqual(merged.getState()["labels"], [2, 1])
+        np.testing.assert_array_equal(merged.computeMetrics()["support"], [2, 1])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,203 @@
+import io
+import unittest
+import numpy as np
+from ModelReport.ConfusionAccumulator import countScores
+from ModelReport.Metrics import (
+    bootstrapConfidenceIntervals,
+    bootstrapSamples,
+    computeClassificationMetricsFromCounts,
+    scoreCurves,
+)
+from ModelReport.ModelReport import ModelReport
+
+
+class Test_Metrics(unittest.TestCase):
+    def test_ComputeClassificationMetricsFromCounts(self):
+        # rows are the predicted classes, columns the actual classes
+        foldMatrices = np.array(
+            [
+                [[3, 1, 0], [0, 2, 0], [1, 0, 0]],
+                [[2, 0, 0], [1, 1, 0], [0, 0, 0]],
+            ]
+        )
+        metrics = computeClassificationMetricsFromCounts(
+            np.diagonal(foldMatrices, axis1=1, axis2=2), foldMatrices.sum(axis=2), foldMatrices.sum(axis=1)
+        )
+
+        np.testing.assert_array_equal(metrics["support"], [7, 4, 0])
+        np.testing.assert_allclose(metrics["precision"], [5 / 6, 3 / 4, 0])
+        np.testing.assert_allclose(metrics["recall"], [5 / 7, 3 / 4, 0])
+        np.testing.assert_allclose(metrics["fScore"][0], 2 * (5 / 6) * (5 / 7) / (5 / 6 + 5 / 7))
+        self.assertAlmostEqual(metrics["accuracy"], 8 / 11)
+        self.assertAlmostEqual(metrics["macroAverage"]["recall"], (5 / 7 + 3 / 4) / 3)
+        self.assertAlmostEqual(metrics["weightedAverage"]["recall"], 8 / 11)
+
+        self.assertEqual(metrics["foldFScore"].shape, (2, 3))
+        np.testing.assert_allclose(metrics["foldRecall"][1], [2 / 3, 1, 0])
+        np.testing.assert_allclose(metrics["foldAccuracy"], [5 / 7, 3 / 4])
+
+    def test_ComputeMetrics(self):
+        report = ModelReport("Model", "Creator", "Principle", {}, "Description")
+        report.addTrainingSet([["sen", "B"], ["sen", "B"], ["sen", "A"]])
+        report.addTestResults([["A", "A"], ["B", "A"], ["B", "B"]])
+        report.addTrainingResults([["A", "A"], ["A", "B"]], {})
+        metrics = report.computeMetrics()
+
+        self.assertEqual(metrics["labels"], ["B", "A"])
+        self.assertEqual(metrics["trainingSet"]["labels"], ["B", "A"])
+        np.testing.assert_array_equal(metrics["testSet"]["samplesPerFold"], [[2, 1]])
+        np.testing.assert_allclose(metrics["recall"], [0.5, 1])
+        self.assertAlmostEqual(metrics["trainingAccuracy"], 0.5)
+        self.assertIs(report.computeMetrics(), metrics)
+
+        report.addTestResults([["C", "C"]])
+        self.assertEqual(report.computeMetrics()["labels"], ["B", "A", "C"])
+
+    def test_DeclaredClasses(self):
+        report = ModelReport("Model", "Creator", "Principle", {}, "Description", classes=["C", "A", "B"])
+        report.addTrainingSet([["sen", "B"], ["sen", "B"], ["sen", "A"]])
+        report.addTestResults([["A", "A"], ["B", "A"]])
+        report.addTestResults([["B", "B"], ["D", "B"]])
+        metrics = report.computeMetrics()
+
+        self.assertEqual(metrics["labels"], ["C", "A", "B", "D"])
+        np.testing.assert_array_equal(metrics["support"], [0, 1, 2, 1])
+        self.assertEqual(metrics["foldFScore"].shape, (2, 4))
+
+    def test_PredictedOnlyClasses(self):
+        for topClasses in [None, 1]:
+            report = ModelReport("Model", "Creator", "Principle", {}, "Description", topClasses=topClasses)
+            report.addTestResults([["A", "A"]] * 50 + [["A", "E"]] * 50 + [["B", "B"]] * 100)
+            metrics = report.computeMetrics()
+            self.assertEqual(metrics["labels"], ["A", "B", "E"])
+            self.assertEqual(metrics["confusionMatrix"].sum(), 200)
+            np.testing.assert_array_equal(metrics["support"], [100, 100, 0])
+            self.assertAlmostEqual(metrics["macroAverage"]["recall"], 0.5)
+
+    def test_TopClasses(self):
+        reports = [
+            ModelReport("Model", "Creator", "Principle", {}, "Description", topClasses=topClasses)
+            for topClasses in [None, 2]
+        ]
+        for report in reports:
+            report.addTestResults([["A", "A"], ["A", "A"], ["A", "B"], ["B", "B"], ["B", "C"], ["C", "D"]])
+            report.addTestResults([["A", "B"], ["D", "D"]])
+        full, top = (report.computeMetrics() for report in reports)
+
+        for key in ["precision", "recall", "fScore", "support", "foldFScore"]:
+            np.testing.assert_array_equal(top[key], full[key])
+        self.assertEqual(top["labels"], ["A", "B", "C", "D"])
+        self.assertEqual(top["confusionLabels"], ["A", "B", "Other"])
+        np.testing.assert_array_equal(top["confusionMatrix"], [[2, 0, 0], [2, 1, 0], [0, 1, 2]])
+        self.assertEqual(top["topConfusions"]["actual"], ["A", "B"])
+        self.assertEqual(top["topConfusions"]["predicted"], ["B", "C"])
+        np.testing.assert_array_equal(top["topConfusions"]["count"], [2, 1])
+
+    def test_BootstrapSamples(self):
+        matrix = np.array([[50, 5, 0], [10, 80, 2], [0, 5, 30]])
+        predicted, actual = np.nonzero(matrix)
+        counts = bootstrapSamples(predicted, actual, matrix[predicted, actual], 3, replicates=2000, random=0)
+        # every replicate draws all results again
+        np.testing.assert_array_equal(counts[2].sum(axis=1), matrix.sum())
+        self.assertAlmostEqual(counts[0].mean(axis=0)[1] / 80, 1, places=1)
+        # small blocks of replicates give the same kind of draws
+        blocks = bootstrapSamples(predicted, actual, matrix[predicted, actual], 3, replicates=25, random=0, blockSize=20)
+        self.assertEqual(blocks[1].shape, (25, 3))
+        np.testing.assert_array_equal(blocks[1].sum(axis=1), matrix.sum())
+        self.assertTrue(np.all(blocks[0] <= blocks[2]))
+
+        intervals = bootstrapConfidenceIntervals(*counts)
+        metrics = computeClassificationMetricsFromCounts(
+            np.diag(matrix)[None], matrix.sum(axis=1)[None], matrix.sum(axis=0)[None]
+        )
+        self.assertTrue(np.all(intervals["fScore"][0] <= metrics["fScore"]))
+        self.assertTrue(np.all(metrics["fScore"] <= intervals["fScore"][1]))
+        lower, upper = intervals["accuracy"]
+        self.assertTrue(lower < metrics["accuracy"] < upper)
+        self.assertLess(upper - lower, 0.15)
+        lower, upper = intervals["macroAverage"]["recall"]
+        self.assertTrue(lower < metrics["macroAverage"]["recall"] < upper)
+
+    def test_ConfidenceIntervalsOfReport(self):
+        report = ModelReport("Model", "Creator", "Principle", {}, "Description", topClasses=2)
+        for _ in range(4):
+            report.addTestResults([["A", "A"]] * 20 + [["B", "A"]] * 5 + [["B", "B"]] * 10 + [["C", "C"]] * 3)
+            report.addTrainingSet([["sen", "A"], ["sen", "B"]])
+            report.addTrainingResults([["A", "A"]], {})
+
+        intervals = report.computeConfidenceIntervals(seed=1)
+        self.assertEqual(intervals["labels"], report.computeMetrics()["labels"])
+        self.assertEqual(intervals["precision"].shape, (2, 3))
+        np.testing.assert_array_equal(intervals["recall"][:, 2], [1, 1])
+        self.assertEqual(report.computeConfidenceIntervals(seed=1)["fScore"].tolist(), intervals["fScore"].tolist())
+        # all folds are equal, so drawing folds does not change anything
+        folds = report.computeConfidenceIntervals(resample="folds")
+        np.testing.assert_allclose(folds["accuracy"], [33 / 38, 33 / 38])
+
+        html = report.createHtml(confidenceIntervals={"replicates": 200, "seed": 0})
+        self.assertRegex(html, r"\d+\.\d\d% \(\d+\.\d-\d+\.\d\)")
+
+        # the results predicted as a class that is only predicted are drawn as well
+        report = ModelReport("Model", "Creator", "Principle", {}, "Description")
+        report.addTestResults([["A", "A"]] * 50 + [["A", "E"]] * 50 + [["B", "B"]] * 100)
+        lower, upper = report.computeConfidenceIntervals(seed=0)["accuracy"]
+        self.assertTrue(lower < 0.75 < upper)
+        self.assertLess(upper, 1)
+
+    def test_ScoreCurves(self):
+        random = np.random.default_rng(0)
+        positive = random.random(400) < 0.3
+        # rounded scores, so there are ties between positive and negative samples
+        scores = (random.random(400) + 0.3 * positive).round(1)
+        curves = scoreCurves(*countScores(scores, positive), points=50)
+
+        positives, negatives = scores[positive], scores[~positive]
+        pairs = (positives[:, None] > negatives).sum() + 0.5 * (positives[:, None] == negatives).sum()
+        self.assertAlmostEqual(curves["rocAuc"], pairs / (len(positives) * len(negatives)))
+        averagePrecision, previousRecall = 0, 0
+        for threshold in np.unique(scores)[::-1]:
+            recall = (positives >= threshold).mean()
+            averagePrecision += (recall - previousRecall) * positive[scores >= threshold].mean()
+            previousRecall = recall
+        self.assertAlmostEqual(curves["averagePrecision"], averagePrecision)
+        self.assertEqual(curves["truePositiveRate"].shape, (50,))
+        self.assertEqual([curves["falsePositiveRate"][-1], curves["truePositiveRate"][-1]], [1, 1])
+        self.assertEqual([curves["recall"][0], curves["precision"][0]], [0, 1])
+        self.assertTrue(np.isnan(scoreCurves(*countScores(scores, np.ones(400, dtype=bool)))["rocAuc"]))
+
+    def test_TestScores(self):
+        random = np.random.default_rng(1)
+        labels = ["A", "B", "C"]
+        actual = random.integers(0, 3, 1000)
+        scores = random.random((1000, 3))
+        scores[np.arange(1000), actual] += 0.2
+        report = ModelReport("Model", "Creator", "Principle", {}, "Description", classes=labels)
+        report.addTrainingSet([["sen", "A"], ["sen", "B"], ["sen", "C"]])
+        report.addTrainingResults([["A", "A"]], {})
+        report.addTestScores(actual[:600], scores[:600], labels=labels, chunkSize=128)
+        report.addTestScores(np.array(labels, dtype=object)[actual[600:]], scores[600:], chunkSize=128)
+        metrics = report.computeMetrics()
+
+        self.assertEqual(len(metrics["foldAccuracy"]), 2)
+        self.assertAlmostEqual(metrics["accuracy"], np.mean(scores.argmax(axis=1) == actual))
+        curves = metrics["scoreCurves"]
+        self.assertEqual(curves["labels"], labels)
+        for i in range(3):
+            expected = scoreCurves(*countScores(scores[:, i], actual == i))
+            self.assertAlmostEqual(curves["rocAuc"][i], expected["rocAuc"])
+            self.assertAlmostEqual(curves["averagePrecision"][i], expected["averagePrecision"])
+        self.assertAlmostEqual(curves["macroAverage"]["rocAuc"], curves["rocAuc"].mean())
+
+        state = io.BytesIO()
+        report.saveState(state)
+        state.seek(0)
+        merged = ModelReport("Model", "Creator", "Principle", {}, "Description").merge(state, report)
+        np.testing.assert_allclose(merged.computeMetrics()["scoreCurves"]["rocAuc"], curves["rocAuc"])
+
+        html = report.createHtml(renderProfile="draft")
+        self.assertEqual(html.count('class="ROC"'), 2)
+        self.assertIn("Average Precision", html)
+
+
+if __name__ == "__main__":
+    unittest.main()
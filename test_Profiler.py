@@ -0,0 +1,53 @@
+import os
+import tempfile
+import unittest
+import numpy as np
+from ModelReport.ModelReport import ModelReport
+from ModelReport.Profiler import Profile
+
+
+class Test_Profiler(unittest.TestCase):
+    def test_NestedStages(self):
+        finished = []
+        profile = Profile(finished.append, traceMemory=True)
+        with profile.stage("outer"):
+            with profile.stage("inner"):
+                data = np.ones(2**20)
+            del data
+            profile.record("worker", 0.5, 0.25)
+
+        self.assertEqual([stage["stage"] for stage in profile.stages], ["outer", "inner", "worker"])
+        self.assertEqual([stage["depth"] for stage in profile.stages], [0, 1, 1])
+        self.assertEqual([stage["stage"] for stage in finished], ["inner", "worker", "outer"])
+        outer, inner, worker = profile.stages
+        self.assertGreaterEqual(inner["peakMemory"], 8 * 2**20)
+        self.assertGreaterEqual(outer["peakMemory"], inner["peakMemory"])
+        self.assertIsNone(worker["peakMemory"])
+        self.assertEqual(profile.total, outer["wall"])
+
+    def test_CreateRaportReturnsProfile(self):
+        report = ModelReport("Model", "Creator", "Principle", {}, "Description")
+        report.addTrainingSet([["sen", "A"], ["sen", "B"]])
+        report.addTestResults([["A", "A"], ["B", "A"], ["B", "B"]])
+        report.addTrainingResults([["A", "A"]], {})
+
+        stages = []
+        with tempfile.TemporaryDirectory() as directory:
+            fileName = os.path.join(directory, "Report")
+            self.assertIsNone(report.createRaport(fileName, outputFormat="json"))
+            profile = report.createRaport(
+                fileName, outputFormat="html", renderProfile="draft", profileHook=stages.append, profileTable=True
+            )
+            with open(fileName + ".html") as file:
+                html = file.read()
+
+        names = [stage["stage"] for stage in profile.stages]
+        self.assertEqual(names[:2], ["ingestion", "html"])
+        self.assertIn("chart PlotFScore", names)
+        self.assertEqual(len(stages), len(names))
+        self.assertIn("Report timings", html)
+        self.assertIn("chart PieChartTestData", html)
+
+
+if __name__ == "__main__":
+    unittest.main()
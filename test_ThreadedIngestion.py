@@ -0,0 +1,168 @@
+import os
+import pickle
+import random
+import tempfile
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+import numpy as np
+from ModelReport.ModelReport import ModelReport
+
+
+def createReport():
+    return ModelReport("Model", "Creator", "Principle", {}, "Description")
+
+
+class Test_ThreadedIngestion(unittest.TestCase):
+    def setUp(self):
+        generator = np.random.default_rng(0)
+        self.labels = [f"Class{i}" for i in range(6)]
+        self.folds = []
+        for fold in range(12):
+            # every fold only knows some of the classes, so the threads encode them in different orders
+            classes = generator.permutation(6)[: 3 + fold % 4]
+            self.folds.append(
+                {
+                    "actual": np.array(self.labels, dtype=object)[generator.choice(classes, 500)],
+                    "predicted": np.array(self.labels, dtype=object)[generator.choice(classes, 500)],
+                    "training": np.array(self.labels, dtype=object)[generator.choice(classes, 2000)],
+                    "metaData": {"fold": fold},
+                }
+            )
+
+        self.expected = createReport()
+        for fold in self.folds:
+            self.expected.addTestResults(fold["actual"], fold["predicted"])
+            self.expected.addTrainingSet(fold["training"], fold["training"])
+            self.expected.addTrainingResults(fold["actual"], fold["metaData"], predicted=fold["predicted"])
+
+    def assertSameState(self, report):
+        expected, state = self.expected.getState(), report.getState()
+        order = [state["labels"].index(label) for label in expected["labels"]]
+        np.testing.assert_array_equal(state["testMatrices"][:, order][:, :, order], expected["testMatrices"])
+        np.testing.assert_array_equal(state["trainingCounts"][:, order], expected["trainingCounts"])
+        np.testing.assert_array_equal(state["trainingResults"], expected["trainingResults"])
+        self.assertEqual(state["trainingMetaData"], expected["trainingMetaData"])
+
+    def test_FoldIdsKeepFoldsAligned(self):
+        report = createReport()
+        calls = []
+        for index, fold in enumerate(self.folds):
+            calls += [
+                lambda index=index, fold=fold: report.addTestResults(fold["actual"], fold["predicted"], fold=index),
+                lambda index=index, fold=fold: report.addTrainingSet(fold["training"], fold["training"], fold=index),
+                lambda index=index, fold=fold: report.addTrainingResults(
+                    fold["actual"], fold["metaData"], predicted=fold["predicted"], fold=index
+                ),
+            ]
+        random.Random(0).shuffle(calls)
+        with ThreadPoolExecutor(8) as executor:
+            list(executor.map(lambda call: call(), calls))
+
+        self.assertSameState(report)
+        self.assertAlmostEqual(report.computeMetrics()["accuracy"], self.expected.computeMetrics()["accuracy"])
+
+    def test_FoldAddedInParts(self):
+        report = createReport()
+        for index, fold in enumerate(self.folds):
+            report.addTestResults(fold["actual"][:200], fold["predicted"][:200], fold=index)
+            report.addTrainingSet(fold["training"], fold["training"], fold=index)
+            report.addTrainingResults(fold["actual"][:200], None, predicted=fold["predicted"][:200], fold=index)
+        # the report is read in between, the second parts are added to the existing folds
+        report.computeMetrics()
+        for index, fold in enumerate(self.folds):
+            report.addTestResults(fold["actual"][200:], fold["predicted"][200:], fold=index)
+            report.addTrainingResults(fold["actual"][200:], fold["metaData"], predicted=fold["predicted"][200:], fold=index)
+        self.assertSameState(report)
+
+    def test_ThreadsWithoutFoldIds(self):
+        def addFold(fold):
+            report.addTestResults(fold["actual"], fold["predicted"])
+            report.addTrainingSet(fold["training"], fold["training"])
+            report.addTrainingResults(fold["actual"], fold["metaData"], predicted=fold["predicted"])
+
+        report = createReport()
+        with ThreadPoolExecutor(4) as executor:
+            list(executor.map(addFold, self.folds))
+
+        # every thread adds a whole fold, its parts stay together although the order of the folds is open
+        state = report.getState()
+        order = [metaData["fold"] for metaData in state["trainingMetaData"]]
+        self.assertEqual(sorted(order), list(range(12)))
+        expected = self.expected.getState()
+        labels = [state["labels"].index(label) for label in expected["labels"]]
+        np.testing.assert_array_equal(state["trainingResults"], expected["trainingResults"][order])
+        np.testing.assert_array_equal(
+            state["testMatrices"][:, labels][:, :, labels], expected["testMatrices"][order]
+        )
+
+    def test_ReadBetweenParts(self):
+        report = createReport()
+        report.addTestResults([["A", "A"]], fold=1)
+        report.computeMetrics()
+        report.addTestResults([["A", "B"]], fold=0)
+        report.addTrainingResults([["A", "B"]], {"id": 0}, fold=0)
+        report.addTrainingResults([["A", "A"]], {"id": 1}, fold=1)
+        metrics = report.computeMetrics()
+        # fold 1 was read first, so it is the first fold for all kinds
+        np.testing.assert_array_equal(metrics["foldAccuracy"], [1, 0])
+        self.assertEqual(report.getState()["trainingMetaData"], [{"id": 1}, {"id": 0}])
+        np.testing.assert_array_equal(report.getState()["trainingResults"], [[1, 1], [0, 1]])
+
+    def test_ThreadsWithReads(self):
+        def addFold(index):
+            fold = self.folds[index % len(self.folds)]
+            report.addTrainingResults(fold["actual"], {"fold": index}, predicted=fold["predicted"], fold=index)
+            if index % 7 == 0:
+                report.computeMetrics()
+            report.addTestResults(fold["actual"], fold["predicted"], fold=index)
+            report.addTrainingSet(np.zeros(index + 1), np.full(index + 1, "A"), fold=index)
+
+        report = createReport()
+        with ThreadPoolExecutor(8) as executor:
+            list(executor.map(addFold, range(50)))
+
+        state = report.getState()
+        order = [metaData["fold"] for metaData in state["trainingMetaData"]]
+        self.assertEqual(sorted(order), list(range(50)))
+        # every part of a fold has the same index
+        np.testing.assert_array_equal(state["trainingCounts"][:, state["labels"].index("A")], np.array(order) + 1)
+        accuracy = [np.mean(self.folds[fold % 12]["actual"] == self.folds[fold % 12]["predicted"]) for fold in order]
+        np.testing.assert_allclose(report.computeMetrics()["foldAccuracy"], accuracy)
+
+    def test_MixedFoldIdsAndLabelTypes(self):
+        report = createReport()
+        report.addTestResults([["A", "A"]], fold="x")
+        report.addTestResults([["B", "A"]], fold=np.int64(1))
+        report.addTestResults(np.array([2]), np.array([2]))
+        report.addTrainingResults([["A", "A"]], {"fold": 1}, fold=1)
+        with self.assertRaises(TypeError):
+            report.addTestResults([["A", "A"]], fold=1.5)
+        state = report.getState()
+        self.assertEqual(state["labels"], ["A", "B", 2])
+        # int ids first, then str ids, then the folds without id; rows are predicted, columns actual classes
+        matrices = state["testMatrices"]
+        self.assertEqual([matrices[0, 0, 1], matrices[1, 0, 0], matrices[2, 2, 2]], [1, 1, 1])
+        self.assertEqual(matrices.sum(), 3)
+        report.addTestResults([["A", "A"]])
+        self.assertEqual(len(report.computeMetrics()["foldAccuracy"]), 4)
+
+    def test_Pickle(self):
+        report = createReport()
+        for index, fold in enumerate(self.folds[:6]):
+            report.addTestResults(fold["actual"], fold["predicted"], fold=index)
+            report.addTrainingSet(fold["training"], fold["training"], fold=index)
+            report.addTrainingResults(fold["actual"], fold["metaData"], predicted=fold["predicted"], fold=index)
+        with tempfile.TemporaryDirectory() as directory:
+            report.startLiveReport(os.path.join(directory, "Live"), interval=3600)
+            # the results still in the shards are part of the pickle, the live report is not
+            report = pickle.loads(pickle.dumps(report))
+        for index, fold in enumerate(self.folds[6:], 6):
+            report.addTestResults(fold["actual"], fold["predicted"], fold=index)
+            report.addTrainingSet(fold["training"], fold["training"], fold=index)
+            report.addTrainingResults(fold["actual"], fold["metaData"], predicted=fold["predicted"], fold=index)
+        self.assertSameState(report)
+        self.assertFalse(report.updateLiveReport())
+
+
+if __name__ == "__main__":
+    unittest.main()